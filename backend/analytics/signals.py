@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+
+from tasks.versions import bump_data_version, deleting_user
+
+from .models import AIInsight, FocusSession, UserAnalytics, WeeklyReport
+
+
+def analytics_changed(sender, instance, origin=None, **kwargs):
+    if not deleting_user(origin):
+        bump_data_version(instance.user_id)
+
+
+for model in (UserAnalytics, WeeklyReport, AIInsight, FocusSession):
+    post_save.connect(analytics_changed, sender=model, dispatch_uid=f'analytics_changed_save_{model.__name__}')
+    post_delete.connect(analytics_changed, sender=model, dispatch_uid=f'analytics_changed_delete_{model.__name__}')
@@ -1,3 +1,131 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.models import Task
+
+from .models import AIInsight, FocusSession
+
+User = get_user_model()
+
+
+class AnalyticsAPITestCase(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user(email='owner@example.com', username='owner', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_sessions(self, count):
+        now = timezone.now()
+        for i in range(count):
+            task = Task.objects.create(user=self.user, title=f'task {i}')
+            start = now - timedelta(hours=i + 1)
+            FocusSession.objects.create(
+                user=self.user, task=task, duration=25, start_time=start, end_time=start + timedelta(minutes=25),
+            )
+
+    def make_insights(self, count):
+        today = timezone.now().date()
+        for i in range(count):
+            AIInsight.objects.create(
+                user=self.user, insight_type='productivity', title=f'insight {i}', content='...',
+                data_period_start=today - timedelta(days=7), data_period_end=today,
+            )
+
+
+class CursorPaginationTests(AnalyticsAPITestCase):
+    def test_focus_sessions_newest_first(self):
+        self.make_sessions(45)
+        starts, url = [], '/api/analytics/focus-sessions/?cursor='
+        while url:
+            response = self.client.get(url)
+            starts += [row['start_time'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(len(starts), 45)
+        self.assertEqual(starts, sorted(starts, reverse=True))
+
+    def test_insights(self):
+        self.make_insights(25)
+        first = self.client.get('/api/analytics/insights/?cursor=')
+        second = self.client.get(first.data['next'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(len(set(ids)), 25)
+        self.assertIsNone(second.data['next'])
+
+    def test_page_number_mode_unchanged(self):
+        self.make_insights(3)
+        self.assertEqual(self.client.get('/api/analytics/insights/').data['count'], 3)
+
+
+class ListQueryCountTests(AnalyticsAPITestCase):
+    """List endpoints run a fixed number of queries, whatever the page holds"""
+
+    def assert_constant_queries(self, path, make, queries):
+        make(2)
+        with self.assertNumQueries(queries):
+            self.assertEqual(self.client.get(path).status_code, 200)
+        make(15)
+        with self.assertNumQueries(queries):
+            self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_focus_sessions(self):
+        self.assert_constant_queries('/api/analytics/focus-sessions/', self.make_sessions, 2)
+
+    def test_insights(self):
+        self.assert_constant_queries('/api/analytics/insights/', self.make_insights, 2)
+
+
+class DashboardTests(AnalyticsAPITestCase):
+    def test_weekly_trends_use_local_weeks(self):
+        la = ZoneInfo('America/Los_Angeles')
+        self.user.timezone = 'America/Los_Angeles'
+        self.user.save()
+        for title, created, completed in [
+            ('this week', datetime(2025, 1, 13, 10, tzinfo=la), datetime(2025, 1, 13, 11, tzinfo=la)),
+            ('still open', datetime(2025, 1, 18, 10, tzinfo=la), None),
+            ('last week', datetime(2025, 1, 6, 10, tzinfo=la), datetime(2025, 1, 8, 10, tzinfo=la)),
+        ]:
+            task = Task.objects.create(user=self.user, title=title)
+            Task.objects.filter(pk=task.pk).update(created_at=created, completed_at=completed)
+
+        # 21:00 on Sunday 19 January in Los Angeles, Monday in UTC
+        now = datetime(2025, 1, 20, 5, tzinfo=dt_timezone.utc)
+        with mock.patch('django.utils.timezone.now', return_value=now), \
+                mock.patch('analytics.views.MistralAnalytics', side_effect=Exception):
+            response = self.client.get('/api/analytics/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        trends = [(week['tasks_completed'], week['total_tasks']) for week in response.data['weekly_trends']]
+        self.assertEqual(trends, [(1, 2), (1, 1), (0, 0), (0, 0)])
+
+
+class OverviewTests(AnalyticsAPITestCase):
+    def test_counts_and_conditional_get(self):
+        Task.objects.create(user=self.user, title='open')
+        Task.objects.create(user=self.user, title='done', status='completed')
+        response = self.client.get('/api/analytics/overview/')
+        self.assertEqual(response.status_code, 200)
+        summary = response.data['monthly_summary']
+        self.assertEqual((summary['tasks_completed'], summary['total_tasks']), (1, 2))
+        self.assertEqual(response.data['completion_rate'], 50.0)
+        with self.assertNumQueries(1):
+            cached = self.client.get('/api/analytics/overview/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        Task.objects.create(user=self.user, title='new')
+        self.assertEqual(self.client.get('/api/analytics/overview/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_async_client(self):
+        Task.objects.create(user=self.user, title='done', status='completed', completed_at=timezone.now())
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        response = async_to_sync(AsyncClient().get)('/api/analytics/overview/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['monthly_summary']['tasks_completed'], 1)
@@ -1,8 +1,9 @@
 from django.urls import path
+from tasks.async_views import server_view
 from .views import (
     UserAnalyticsView, WeeklyReportListView, AIInsightListView, AIInsightDetailView,
     FocusSessionListCreateView, GenerateAIInsightsView, ProductivityDashboardView,
-    analytics_overview, generate_task_suggestions
+    analytics_overview, aanalytics_overview, generate_task_suggestions
 )
 
 urlpatterns = [
@@ -20,7 +21,7 @@ urlpatterns = [
     
     # Dashboard & Overview
     path('dashboard/', ProductivityDashboardView.as_view(), name='productivity_dashboard'),
-    path('overview/', analytics_overview, name='analytics_overview'),
+    path('overview/', server_view(analytics_overview, aanalytics_overview), name='analytics_overview'),
     
     # AI Features
     path('suggestions/', generate_task_suggestions, name='task_suggestions'),
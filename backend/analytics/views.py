@@ -3,6 +3,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.db.models import Avg, Count, Q
 from datetime import datetime, timedelta
 from .models import UserAnalytics, WeeklyReport, AIInsight, TaskPrediction, FocusSession
@@ -13,7 +14,12 @@ from .serializers import (
     FocusSessionCreateSerializer
 )
 from .mistral_ai import MistralAnalytics
+from tasks.async_views import async_api_view
+from tasks.conditional import conditional_get
+from tasks.dates import day_range, in_range, local_today, week_range
 from tasks.models import Task
+from tasks.pagination import KeysetPagination
+from tasks.response_cache import cached_get
 
 class UserAnalyticsView(generics.RetrieveUpdateAPIView):
     serializer_class = UserAnalyticsSerializer
@@ -41,10 +47,10 @@ class UserAnalyticsView(generics.RetrieveUpdateAPIView):
             )['avg_duration'] / 60  # Convert to hours
         
         # Update streak
-        today = timezone.now().date()
+        today = local_today(user)
         if analytics.last_active_date != today:
             # Check if user completed any tasks today
-            if tasks.filter(completed_at__date=today).exists():
+            if tasks.filter(**in_range('completed_at', day_range(user, today))).exists():
                 if analytics.last_active_date == today - timedelta(days=1):
                     analytics.current_streak += 1
                 else:
@@ -66,16 +72,19 @@ class WeeklyReportListView(generics.ListAPIView):
 class AIInsightListView(generics.ListAPIView):
     serializer_class = AIInsightSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['created_at', 'confidence_score']
+    ordering = ['-created_at']
     
     def get_queryset(self):
-        return AIInsight.objects.filter(user=self.request.user, is_dismissed=False).order_by('-created_at')
+        return AIInsight.objects.filter(user=self.request.user, is_dismissed=False).select_related('user').order_by('-created_at')
 
 class AIInsightDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = AIInsightSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return AIInsight.objects.filter(user=self.request.user)
+        return AIInsight.objects.filter(user=self.request.user).select_related('user')
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -91,9 +100,12 @@ class AIInsightDetailView(generics.RetrieveUpdateAPIView):
 
 class FocusSessionListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['start_time', 'created_at', 'duration']
+    ordering = ['-start_time']
     
     def get_queryset(self):
-        return FocusSession.objects.filter(user=self.request.user).order_by('-start_time')
+        return FocusSession.objects.filter(user=self.request.user).select_related('user', 'task').order_by('-start_time')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -186,6 +198,7 @@ class GenerateAIInsightsView(APIView):
 class ProductivityDashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
+    @method_decorator(cached_get('productivity_dashboard'))
     def get(self, request):
         user = request.user
         
@@ -196,14 +209,13 @@ class ProductivityDashboardView(APIView):
         recent_insights = AIInsight.objects.filter(
             user=user, 
             is_dismissed=False
-        ).order_by('-created_at')[:5]
+        ).select_related('user').order_by('-created_at')[:5]
         
         # Get today's focus sessions
-        today = timezone.now().date()
         focus_sessions_today = FocusSession.objects.filter(
             user=user,
-            start_time__date=today
-        )
+            **in_range('start_time', day_range(user, local_today(user)))
+        ).select_related('user', 'task')
         
         # Calculate weekly trends (last 4 weeks)
         weekly_trends = self.calculate_weekly_trends(user)
@@ -237,21 +249,22 @@ class ProductivityDashboardView(APIView):
     def calculate_weekly_trends(self, user):
         """Calculate productivity trends over the last 4 weeks"""
         trends = []
-        today = timezone.now().date()
+        today = local_today(user)
+        weeks = [week_range(user, today - timedelta(weeks=i)) for i in range(4)]
+        window = (weeks[-1][0], weeks[0][1])
+        
+        # One conditional aggregate over the 4-week window instead of 8 COUNTs
+        aggregates = {}
+        for i, bounds in enumerate(weeks):
+            aggregates[f'completed_{i}'] = Count('id', filter=Q(**in_range('completed_at', bounds)))
+            aggregates[f'created_{i}'] = Count('id', filter=Q(**in_range('created_at', bounds)))
+        counts = Task.objects.filter(user=user).filter(
+            Q(**in_range('completed_at', window)) | Q(**in_range('created_at', window))
+        ).aggregate(**aggregates)
         
         for i in range(4):
-            week_start = today - timedelta(days=today.weekday() + (i * 7))
-            week_end = week_start + timedelta(days=6)
-            
-            tasks_completed = Task.objects.filter(
-                user=user,
-                completed_at__date__range=[week_start, week_end]
-            ).count()
-            
-            total_tasks = Task.objects.filter(
-                user=user,
-                created_at__date__range=[week_start, week_end]
-            ).count()
+            tasks_completed = counts[f'completed_{i}']
+            total_tasks = counts[f'created_{i}']
             
             completion_rate = (tasks_completed / total_tasks * 100) if total_tasks > 0 else 0
             
@@ -264,40 +277,22 @@ class ProductivityDashboardView(APIView):
         
         return trends
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def analytics_overview(request):
-    """Get comprehensive analytics overview"""
-    user = request.user
-    
-    # Get insights count
-    total_insights = AIInsight.objects.filter(user=user).count()
-    
-    # Calculate average productivity score
-    avg_productivity = UserAnalytics.objects.filter(user=user).aggregate(
-        avg_score=Avg('productivity_score')
-    )['avg_score'] or 0
-    
-    # Get most productive day and hour
-    analytics = UserAnalytics.objects.filter(user=user).first()
+def overview_response(total_insights, avg_productivity, analytics, counts):
     best_day = analytics.peak_productivity_day if analytics else 'Monday'
     productive_hour = analytics.most_productive_hour if analytics else 9
-    
-    # Calculate completion rate
-    tasks = Task.objects.filter(user=user)
-    completion_rate = (tasks.filter(status='completed').count() / tasks.count() * 100) if tasks.exists() else 0
+    completion_rate = (counts['completed'] / counts['total'] * 100) if counts['total'] else 0
     
     overview_data = {
         'total_insights': total_insights,
-        'avg_productivity_score': round(avg_productivity, 2),
+        'avg_productivity_score': round(avg_productivity or 0, 2),
         'best_day_of_week': best_day,
         'most_productive_hour': productive_hour,
         'current_streak': analytics.current_streak if analytics else 0,
         'completion_rate': round(completion_rate, 2),
         'weekly_goal_progress': 75.0,  # Placeholder
         'monthly_summary': {
-            'tasks_completed': tasks.filter(status='completed').count(),
-            'total_tasks': tasks.count(),
+            'tasks_completed': counts['completed'],
+            'total_tasks': counts['total'],
             'focus_hours': 0,  # Placeholder
             'productivity_trend': 'upward'
         }
@@ -306,6 +301,36 @@ def analytics_overview(request):
     serializer = AnalyticsOverviewSerializer(overview_data)
     return Response(serializer.data)
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get('analytics_overview')
+@cached_get('analytics_overview')
+def analytics_overview(request):
+    """Get comprehensive analytics overview"""
+    user = request.user
+    analytics = UserAnalytics.objects.filter(user=user)
+    return overview_response(
+        AIInsight.objects.filter(user=user).count(),
+        analytics.aggregate(avg_score=Avg('productivity_score'))['avg_score'],
+        analytics.first(),
+        Task.objects.filter(user=user).aggregate(total=Count('id'), completed=Count('id', filter=Q(status='completed'))),
+    )
+
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get('analytics_overview')
+@cached_get('analytics_overview')
+async def aanalytics_overview(request):
+    """analytics_overview for ASGI"""
+    user = request.user
+    analytics = UserAnalytics.objects.filter(user=user)
+    return overview_response(
+        await AIInsight.objects.filter(user=user).acount(),
+        (await analytics.aaggregate(avg_score=Avg('productivity_score')))['avg_score'],
+        await analytics.afirst(),
+        await Task.objects.filter(user=user).aaggregate(total=Count('id'), completed=Count('id', filter=Q(status='completed'))),
+    )
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def generate_task_suggestions(request):
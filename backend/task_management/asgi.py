@@ -15,6 +15,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_management.settings')
+# Serve the endpoints that have async views from them (see tasks.async_views)
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
 
@@ -1,6 +1,7 @@
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+import importlib.util
 import os
 import dj_database_url
 
@@ -36,6 +37,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tasks.middleware.QueryBudgetMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -74,6 +76,35 @@ DATABASES = {
     )
 }
 
+# Caches. "responses" holds rendered-data entries for tasks.response_cache; it
+# is bounded to RESPONSE_CACHE_MAX_ENTRIES and evicts the least recently used
+# entry. RESPONSE_CACHE_BACKEND is "locmem" (per process) or "file" (shared by
+# the processes on one host, stored in RESPONSE_CACHE_LOCATION).
+RESPONSE_CACHE_BACKEND = config('RESPONSE_CACHE_BACKEND', default='locmem')
+RESPONSE_CACHE_MAX_ENTRIES = config('RESPONSE_CACHE_MAX_ENTRIES', default=5000, cast=int)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': (
+            'tasks.cache_backends.LRUFileBasedCache' if RESPONSE_CACHE_BACKEND == 'file'
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': (
+            config('RESPONSE_CACHE_LOCATION', default=os.path.join(BASE_DIR, '.response_cache'))
+            if RESPONSE_CACHE_BACKEND == 'file' else 'responses'
+        ),
+        'TIMEOUT': config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES,
+            # Evict one entry at a time (both backends drop the LRU ones first)
+            'CULL_FREQUENCY': RESPONSE_CACHE_MAX_ENTRIES,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -107,7 +138,16 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework Configuration
+# orjson-backed JSON (falls back to the stdlib encoder without orjson), plus
+# MessagePack for clients that send "Accept: application/msgpack" when the
+# msgpack package is installed.
+DEFAULT_RENDERER_CLASSES = ['tasks.renderers.FastJSONRenderer']
+if importlib.util.find_spec('msgpack') is not None:
+    DEFAULT_RENDERER_CLASSES.append('tasks.renderers.MessagePackRenderer')
+DEFAULT_RENDERER_CLASSES.append('rest_framework.renderers.BrowsableAPIRenderer')
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': DEFAULT_RENDERER_CLASSES,
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
@@ -183,6 +223,29 @@ GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
 # Mistral AI Configuration
 MISTRAL_API_KEY = config('MISTRAL_API_KEY', default='')
 
+# Reminder delivery used by the run_reminders command (see tasks.reminders):
+# tasks.reminders.LogReminderBackend or tasks.reminders.FileReminderBackend
+REMINDER_BACKEND = config('REMINDER_BACKEND', default='tasks.reminders.LogReminderBackend')
+REMINDER_FILE_PATH = config('REMINDER_FILE_PATH', default=os.path.join(BASE_DIR, 'reminders.ndjson'))
+
+# Per-request query instrumentation (tasks.middleware.QueryBudgetMiddleware).
+# QUERY_BUDGETS maps URL names to the most SQL queries one request may run;
+# None turns the budget and N+1 checks off for that view. Overruns are logged,
+# or raised with QUERY_BUDGET_RAISE=True (useful in tests and development).
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', default=15, cast=int)
+QUERY_BUDGETS = {
+    'bulk_task_action': None,
+    'bulk_tasks': None,
+    'export_tasks': None,
+    'import_tasks': None,
+}
+QUERY_REPEAT_THRESHOLD = config('QUERY_REPEAT_THRESHOLD', default=5, cast=int)
+QUERY_BUDGET_RAISE = config('QUERY_BUDGET_RAISE', default=False, cast=bool)
+
+# Route the hot read endpoints to their async views (tasks.async_views).
+# asgi.py turns this on; under WSGI the sync views skip the event loop.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
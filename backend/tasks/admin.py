@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Task, SubTask, TaskComment, DayPlanner
+from .models import Category, Task, SubTask, TaskComment, DayPlanner, Tag, TaskOccurrence
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -21,7 +21,7 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'priority', 'status', 'due_date', 'created_at', 'is_overdue')
     list_filter = ('status', 'priority', 'category', 'is_recurring', 'created_at')
     search_fields = ('title', 'description', 'user__email', 'user__first_name', 'user__last_name')
-    readonly_fields = ('created_at', 'updated_at', 'completed_at')
+    readonly_fields = ('created_at', 'updated_at', 'completed_at', 'reminder_sent_at')
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -32,13 +32,13 @@ class TaskAdmin(admin.ModelAdmin):
             'fields': ('priority', 'status', 'tags')
         }),
         ('Dates', {
-            'fields': ('due_date', 'reminder_date', 'completed_at')
+            'fields': ('due_date', 'reminder_date', 'reminder_sent_at', 'completed_at')
         }),
         ('Duration', {
             'fields': ('estimated_duration', 'actual_duration')
         }),
         ('Recurring', {
-            'fields': ('is_recurring', 'recurring_pattern')
+            'fields': ('is_recurring', 'recurring_pattern', 'recurrence_interval', 'recurrence_weekdays', 'recurrence_end')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -48,10 +48,14 @@ class TaskAdmin(admin.ModelAdmin):
     
     inlines = [SubTaskInline, TaskCommentInline]
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_overdue()
+    
     def is_overdue(self, obj):
         return obj.is_overdue
     is_overdue.boolean = True
     is_overdue.short_description = 'Overdue'
+    is_overdue.admin_order_field = 'overdue'
 
 @admin.register(SubTask)
 class SubTaskAdmin(admin.ModelAdmin):
@@ -65,6 +69,18 @@ class TaskCommentAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('content', 'task__title', 'user__email')
 
+@admin.register(TaskOccurrence)
+class TaskOccurrenceAdmin(admin.ModelAdmin):
+    list_display = ('task', 'original_date', 'status', 'due_date', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('task__title',)
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'user', 'task_count', 'created_at')
+    search_fields = ('name', 'user__email')
+    readonly_fields = ('task_count', 'created_at')
+
 @admin.register(DayPlanner)
 class DayPlannerAdmin(admin.ModelAdmin):
     list_display = ('user', 'date', 'mood', 'productivity_score', 'created_at')
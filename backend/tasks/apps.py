@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def repair_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from . import search
+    search.ensure_sqlite_triggers(connections[using])
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .middleware import install_query_recorder
+        post_migrate.connect(repair_search_index, sender=self)
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,62 @@
+"""
+Coroutine function views on top of DRF.
+
+DRF's APIView.dispatch is synchronous, so under ASGI Django runs each DRF
+view in a worker thread for the whole request. ``async_api_view`` builds the
+same APIView that ``@api_view`` does, but with a coroutine dispatch.
+Authentication, throttling and permission checks use the view's usual
+classes. They may hit the database (loading the JWT's user), so they run in
+one sync_to_async call. The handler then runs on the event loop and reads
+through the async ORM (``aget``, ``acount``, ``async for``).
+
+Under WSGI an async view costs an event loop per request and a thread hop
+per query, so each async view has a sync twin and ``server_view`` routes one
+of them: the async view only when settings.ASYNC_VIEWS is on, which
+asgi.py does.
+"""
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.decorators import api_view
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_api_view(http_method_names=None):
+    """@api_view for ``async def`` views; @permission_classes and friends go below it as usual"""
+    def decorator(func):
+        wrapped = api_view(http_method_names)(func).cls
+        attrs = {'__doc__': wrapped.__doc__, '__module__': wrapped.__module__}
+        return type(wrapped.__name__, (AsyncAPIView, wrapped), attrs).as_view()
+    return decorator
+
+
+def server_view(view, async_view):
+    """The view for urlpatterns: ``async_view`` with settings.ASYNC_VIEWS, else ``view``"""
+    return async_view if settings.ASYNC_VIEWS else view
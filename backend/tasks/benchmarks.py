@@ -0,0 +1,871 @@
+"""
+Benchmark scenarios run by ``python manage.py benchmark <scenario>``.
+
+Each scenario seeds (or reuses) a dedicated benchmark user per requested task
+count and returns a JSON-serialisable dict of timings in milliseconds. Seeding
+1M tasks takes a few minutes the first time; later runs reuse the rows. The
+benchmark and seed_benchmark_data commands refuse to write to a database
+server on another host (see remote_database_host) unless given --force.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Category, Priority, Task, TaskStatus
+from .tagging import sync_task_tags
+
+User = get_user_model()
+
+SCENARIOS = {}
+
+WORDS = [
+    'report', 'review', 'plan', 'design', 'deploy', 'invoice', 'meeting', 'email',
+    'budget', 'draft', 'research', 'refactor', 'interview', 'workout', 'groceries',
+    'presentation', 'roadmap', 'release', 'backup', 'migration', 'newsletter',
+    'doctor', 'dentist', 'taxes', 'travel', 'booking', 'feedback', 'onboarding',
+    'sprint', 'retro', 'launch', 'audit', 'contract', 'proposal', 'call', 'lunch',
+]
+TASK_STAMPS = ['created_at', 'updated_at']
+TAGS = ['work', 'home', 'urgent', 'errand', 'health', 'finance', 'learning', 'team', 'later', 'ideas']
+LOCAL_HOSTS = ('', 'localhost', '127.0.0.1', '::1')
+
+
+def remote_database_host(conn):
+    """Host of ``conn``'s database server if it isn't this machine, else None (always None for SQLite)"""
+    host = conn.settings_dict.get('HOST') or ''
+    if conn.vendor == 'sqlite' or host in LOCAL_HOSTS:
+        return None
+    return host
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def percentiles(samples):
+    """min/p50/p95/p99 of latency samples in ms"""
+    samples = sorted(samples)
+    return {
+        'min_ms': round(samples[0], 3),
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'p99_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+    }
+
+
+def timed(func, repeat):
+    """Run ``func`` ``repeat`` times and summarise wall-clock latency in ms"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def bulk_create_dated(model, objs, field_names, batch_size=None):
+    """
+    bulk_create() keeping the objects' own values in auto_now/auto_now_add fields.
+
+    bulk_create stamps the current time into those fields, so the intended
+    values are written back afterwards by primary key. Nothing touches the
+    fields' flags, which every thread in the process shares, and one
+    executemany() is far cheaper than bulk_update's CASE per batch.
+    """
+    stamps = [[getattr(obj, name) for name in field_names] for obj in objs]
+    created = model.objects.bulk_create(objs, batch_size=batch_size)
+    fields = [model._meta.get_field(name) for name in field_names]
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(model._meta.db_table),
+        ', '.join(f'{quote(field.column)} = %s' for field in fields),
+        quote(model._meta.pk.column),
+    )
+    rows = []
+    for obj, values in zip(created, stamps):
+        for field, value in zip(fields, values):
+            setattr(obj, field.attname, value)
+        rows.append([field.get_db_prep_value(value, connection) for field, value in zip(fields, values)] + [obj.pk])
+    if rows:
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+    return created
+
+
+def build_tasks(user, count, rng, categories=(), start=0):
+    """Yield unsaved, realistically distributed tasks for ``user``"""
+    now = timezone.now()
+    priorities = [Priority.LOW, Priority.MEDIUM, Priority.MEDIUM, Priority.HIGH, Priority.URGENT]
+    statuses = [TaskStatus.TODO, TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED, TaskStatus.COMPLETED]
+    for i in range(start, start + count):
+        status = rng.choice(statuses)
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        due = None if rng.random() < 0.2 else created + timedelta(hours=rng.randint(1, 24 * 60))
+        yield Task(
+            user=user,
+            title=' '.join(rng.sample(WORDS, 3)) + f' #{i}',
+            description=' '.join(rng.choices(WORDS, k=rng.randint(0, 25))) or None,
+            category=rng.choice(categories) if categories and rng.random() < 0.8 else None,
+            priority=rng.choice(priorities),
+            status=status,
+            due_date=due,
+            completed_at=created + timedelta(hours=rng.randint(1, 24 * 30)) if status == TaskStatus.COMPLETED else None,
+            estimated_duration=rng.choice([None, 15, 30, 60, 120]),
+            tags=rng.sample(TAGS, rng.randint(0, 3)),
+            created_at=created,
+            updated_at=created,
+        )
+
+
+def bench_user(task_count, batch_size=5000, seed=0):
+    """Return a benchmark user owning at least ``task_count`` tasks"""
+    user, _ = User.objects.get_or_create(
+        email=f'bench-{task_count}@example.com',
+        defaults={'username': f'bench-{task_count}', 'first_name': 'Bench', 'last_name': str(task_count)},
+    )
+    existing = Task.objects.filter(user=user).count()
+    if existing >= task_count:
+        return user
+    rng = random.Random(seed + existing)
+    categories = list(Category.objects.all()[:10])
+    rows = build_tasks(user, task_count - existing, rng, categories, start=existing)
+    batch = []
+    for task in rows:
+        batch.append(task)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                sync_task_tags(bulk_create_dated(Task, batch, TASK_STAMPS))
+            batch = []
+    if batch:
+        with transaction.atomic():
+            sync_task_tags(bulk_create_dated(Task, batch, TASK_STAMPS))
+    return user
+
+
+SEED_PASSWORD = 'bench-password'
+SEED_CATEGORIES = [('Work', '#3B82F6', '💼'), ('Personal', '#10B981', '🏠'), ('Health', '#EF4444', '💪'), ('Learning', '#F59E0B', '📚')]
+MOODS = ['excellent', 'good', 'good', 'okay', 'okay', 'poor']
+INSIGHT_TYPES = ['productivity', 'time_management', 'goal_setting', 'work_life_balance', 'motivation']
+LOCATIONS = ['home', 'office', 'cafe', 'library', None]
+
+
+def seed_user(email, task_count, rng, password=None, batch_size=5000):
+    """
+    Return (user, created) for ``email``, creating the user with ``task_count``
+    tasks and a realistic spread of the rest of the data: subtasks on about half
+    of the tasks, comments on a quarter, tags, a few recurring series, day plans
+    on most of the last 30 days, focus sessions, AI insights and analytics.
+    Existing users are returned untouched, so seeding is repeatable.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    from analytics.models import AIInsight, FocusSession, UserAnalytics
+
+    from .models import DayPlanner, RecurrencePattern, SubTask, TaskComment
+    from .versions import bump_data_version
+
+    user = User.objects.filter(email=email).first()
+    if user is not None:
+        return user, False
+    name = email.split('@')[0]
+    user = User.objects.create(
+        email=email, username=name, first_name='Seed', last_name=name,
+        password=password or make_password(SEED_PASSWORD),
+    )
+    now = timezone.now()
+    # Categories are shared by every user; a fresh database has none
+    if not Category.objects.exists():
+        Category.objects.bulk_create([Category(name=name, color=color, icon=icon) for name, color, icon in SEED_CATEGORIES])
+    categories = list(Category.objects.all()[:10])
+
+    tasks = list(build_tasks(user, task_count, rng, categories))
+    # Recurring series start in the past so every one has occurrences today onwards
+    patterns = [RecurrencePattern.DAILY, RecurrencePattern.WEEKLY, RecurrencePattern.MONTHLY]
+    for index, task in enumerate(rng.sample(tasks, max(1, task_count * 3 // 100)) if tasks else []):
+        task.is_recurring = True
+        task.recurring_pattern = patterns[0] if index == 0 else rng.choice(patterns)
+        task.status, task.completed_at = TaskStatus.TODO, None
+        task.due_date = now - timedelta(days=rng.randint(1, 60), minutes=rng.randint(0, 600))
+    for start in range(0, len(tasks), batch_size):
+        sync_task_tags(bulk_create_dated(Task, tasks[start:start + batch_size], TASK_STAMPS))
+
+    subtasks, comments = [], []
+    for task in tasks:
+        done = task.status == TaskStatus.COMPLETED
+        for _ in range(rng.choice([0, 0, 0, 1, 2, 3, 4, 5])):
+            created = task.created_at + timedelta(minutes=rng.randint(1, 600))
+            completed = done or rng.random() < 0.3
+            subtasks.append(SubTask(
+                parent_task=task, title=' '.join(rng.sample(WORDS, 2)), is_completed=completed,
+                created_at=created, updated_at=created, completed_at=created if completed else None,
+            ))
+        if rng.random() < 0.25:
+            for _ in range(rng.randint(1, 3)):
+                comments.append(TaskComment(
+                    task=task, user=user, content=' '.join(rng.choices(WORDS, k=rng.randint(3, 20))),
+                    created_at=task.created_at + timedelta(minutes=rng.randint(1, 60 * 24 * 7)),
+                ))
+    bulk_create_dated(SubTask, subtasks, ['created_at', 'updated_at'], batch_size)
+    bulk_create_dated(TaskComment, comments, ['created_at'], batch_size)
+
+    today = now.date()
+    plans = []
+    for days_ago in range(30):
+        if rng.random() < 0.7:
+            stamp = now - timedelta(days=days_ago)
+            plans.append(DayPlanner(
+                user=user, date=today - timedelta(days=days_ago), mood=rng.choice(MOODS),
+                productivity_score=rng.randint(1, 10), created_at=stamp, updated_at=stamp,
+            ))
+    bulk_create_dated(DayPlanner, plans, ['created_at', 'updated_at'])
+    DayPlanner.tasks.through.objects.bulk_create([
+        DayPlanner.tasks.through(dayplanner_id=plan.pk, task_id=task.pk)
+        for plan in plans
+        for task in (rng.sample(tasks, min(len(tasks), rng.randint(2, 6))) if tasks else [])
+    ], batch_size=batch_size)
+
+    sessions = []
+    for _ in range(min(500, max(5, task_count // 10))):
+        start = now - timedelta(days=rng.randint(0, 89), hours=rng.randint(0, 23), minutes=rng.randint(0, 59))
+        duration = rng.choice([15, 25, 25, 45, 50, 90])
+        sessions.append(FocusSession(
+            user=user, task=rng.choice(tasks) if tasks and rng.random() < 0.6 else None,
+            duration=duration, start_time=start, end_time=start + timedelta(minutes=duration),
+            focus_score=rng.randint(1, 10), interruptions=rng.choice([0, 0, 1, 2, 3]),
+            mood_before=rng.choice(MOODS), mood_after=rng.choice(MOODS),
+            time_of_day='morning' if start.hour < 12 else 'afternoon' if start.hour < 18 else 'evening',
+            location=rng.choice(LOCATIONS), created_at=start + timedelta(minutes=duration),
+        ))
+    insights = []
+    for _ in range(rng.randint(3, 8)):
+        created = now - timedelta(days=rng.randint(0, 120))
+        insights.append(AIInsight(
+            user=user, insight_type=rng.choice(INSIGHT_TYPES), title=' '.join(rng.sample(WORDS, 4)).capitalize(),
+            content=' '.join(rng.choices(WORDS, k=60)), confidence_score=round(rng.uniform(0.5, 0.95), 2),
+            data_period_start=(created - timedelta(days=30)).date(), data_period_end=created.date(),
+            tasks_analyzed=task_count, is_helpful=rng.choice([None, None, True, False]),
+            is_dismissed=rng.random() < 0.2, created_at=created,
+        ))
+    bulk_create_dated(FocusSession, sessions, ['created_at'], batch_size)
+    bulk_create_dated(AIInsight, insights, ['created_at'])
+    completed = sum(task.status == TaskStatus.COMPLETED for task in tasks)
+    UserAnalytics.objects.create(
+        user=user, total_tasks_created=task_count, total_tasks_completed=completed,
+        total_time_spent=sum(session.duration for session in sessions),
+        productivity_score=round(completed / task_count * 100, 1) if task_count else 0,
+        consistency_score=round(rng.uniform(40, 90), 1), most_productive_hour=rng.randint(8, 17),
+        peak_productivity_day=rng.choice(['monday', 'tuesday', 'wednesday', 'thursday', 'friday']),
+        current_streak=rng.randint(0, 14), longest_streak=rng.randint(14, 60), last_active_date=today,
+    )
+
+    bump_data_version(user.pk)
+    return user, True
+
+
+def seed_users(user_count, tasks_per_user, seed=0):
+    """
+    Seed ``seed-<n>@example.com`` users with seed_user(). Task counts are
+    log-normal around ``tasks_per_user``, as real accounts are: most are small
+    and a few are heavy. The same arguments always produce the same data.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    rng = random.Random(seed)
+    password = make_password(SEED_PASSWORD)  # Hashing once; PBKDF2 per user would dominate
+    users = []
+    for index in range(user_count):
+        task_count = max(1, round(tasks_per_user * rng.lognormvariate(-0.28, 0.75)))
+        # One transaction per user: a half-seeded user would be kept as is on the next run
+        with transaction.atomic():
+            user, created = seed_user(f'seed-{index}@example.com', task_count, random.Random(f'{seed}-{index}'), password)
+        if not created:
+            task_count = Task.objects.filter(user=user).count()
+        users.append({'email': user.email, 'tasks': task_count, 'created': created})
+    return users
+
+
+@scenario('search')
+def search_scenario(task_counts, repeat, **options):
+    """Ranked full-text search vs. the old SearchFilter icontains scan"""
+    from .search import search_backend, search_tasks
+
+    queries = ['report', 'plan rev', 'deploy budget', 'zzz']
+    results = {'backend': search_backend(), 'sizes': {}}
+    for count in task_counts:
+        user = bench_user(count)
+        tasks = Task.objects.filter(user=user)
+        size = {}
+        for query in queries:
+            def icontains():
+                condition = Q()
+                for term in query.split():
+                    condition &= Q(title__icontains=term) | Q(description__icontains=term) | Q(tags__icontains=term)
+                list(tasks.filter(condition).order_by('-created_at')[:20])
+
+            def full_text():
+                list(search_tasks(tasks, query).order_by('-search_rank', '-id')[:20])
+
+            size[query] = {'icontains': timed(icontains, repeat), 'full_text': timed(full_text, repeat)}
+        results['sizes'][count] = size
+    return results
+
+
+def legacy_task_stats(tasks):
+    """The seven-query task_stats implementation, kept for comparison"""
+    from django.db.models import Count
+
+    total_tasks = tasks.count()
+    completed_tasks = tasks.filter(status='completed').count()
+    pending_tasks = tasks.filter(status__in=['todo', 'in_progress']).count()
+    overdue_tasks = tasks.filter(due_date__lt=timezone.now(), status__in=['todo', 'in_progress']).count()
+    tasks_by_priority = dict(tasks.values('priority').annotate(count=Count('priority')).values_list('priority', 'count'))
+    tasks_by_category = dict(
+        tasks.filter(category__isnull=False)
+        .values('category__name')
+        .annotate(count=Count('category'))
+        .values_list('category__name', 'count')
+    )
+    recent_activity = list(
+        tasks.filter(updated_at__gte=timezone.now() - timedelta(days=7))
+        .order_by('-updated_at')[:10]
+        .values('id', 'title', 'status', 'updated_at')
+    )
+    return total_tasks, completed_tasks, pending_tasks, overdue_tasks, tasks_by_priority, tasks_by_category, recent_activity
+
+
+@scenario('stats')
+def stats_scenario(task_counts, repeat, **options):
+    """Single-pass compute_task_stats vs. the old seven-query task_stats"""
+    from .stats import compute_task_stats
+
+    results = {'sizes': {}}
+    for count in task_counts:
+        tasks = Task.objects.filter(user=bench_user(count))
+        results['sizes'][count] = {
+            'legacy': timed(lambda: legacy_task_stats(tasks), repeat),
+            'single_pass': timed(lambda: compute_task_stats(tasks), repeat),
+        }
+    return results
+
+
+@scenario('recurrence')
+def recurrence_scenario(task_counts, repeat, **options):
+    """Expand a year and a month of occurrences for N in-memory series (no database access)"""
+    from datetime import datetime, timezone as dt_timezone
+    from zoneinfo import ZoneInfo
+
+    from .models import RecurrencePattern
+    from .recurrence import expand
+
+    tz = ZoneInfo('America/New_York')
+    window = (datetime(2025, 1, 1, tzinfo=tz), datetime(2026, 1, 1, tzinfo=tz))
+    month = (datetime(2025, 3, 1, tzinfo=tz), datetime(2025, 4, 1, tzinfo=tz))
+    results = {'sizes': {}}
+    for count in task_counts:
+        rng = random.Random(count)
+        series = [
+            Task(
+                title=f'series {i}',
+                is_recurring=True,
+                recurring_pattern=rng.choice(RecurrencePattern.values),
+                recurrence_interval=rng.choice([1, 1, 1, 2, 3]),
+                recurrence_weekdays=rng.sample(range(7), rng.randint(0, 3)),
+                due_date=datetime(2024, rng.randint(1, 12), rng.randint(1, 28), rng.randint(6, 20), tzinfo=dt_timezone.utc),
+            )
+            for i in range(count)
+        ]
+        occurrences = sum(1 for task in series for _ in expand(task, tz, *window))
+        results['sizes'][count] = {
+            'occurrences_per_year': occurrences,
+            'expand_year': timed(lambda: [list(expand(task, tz, *window)) for task in series], repeat),
+            'expand_month': timed(lambda: [list(expand(task, tz, *month)) for task in series], repeat),
+        }
+    return results
+
+
+
+def reminder_user(count, batch_size=5000):
+    """Return a benchmark user owning ``count`` open tasks with reminders spread over a past day"""
+    user, _ = User.objects.get_or_create(
+        email=f'bench-reminders-{count}@example.com',
+        defaults={'username': f'bench-reminders-{count}', 'first_name': 'Bench', 'last_name': 'Reminders'},
+    )
+    existing = Task.all_objects.filter(user=user).count()
+    now = timezone.now()
+    for offset in range(existing, count, batch_size):
+        Task.objects.bulk_create([
+            Task(user=user, title=f'reminder #{i}', reminder_date=now - timedelta(seconds=i % 86400))
+            for i in range(offset, min(offset + batch_size, count))
+        ])
+    return user
+
+
+@scenario('reminders')
+def reminders_scenario(task_counts, repeat, **options):
+    """Drain N overdue reminders through run_reminders' scheduler; one run per size, ``repeat`` is ignored"""
+    from .reminders import MemoryReminderBackend, ReminderScheduler
+
+    results = {'sizes': {}}
+    for count in task_counts:
+        user = reminder_user(count)
+        now = timezone.now()
+        Task.all_objects.filter(user=user).update(reminder_sent_at=None)  # All pending again
+        pending = Task.objects.pending_reminders().count()
+
+        scheduler = ReminderScheduler(MemoryReminderBackend())
+        start = time.perf_counter()
+        scheduler.refill(now)
+        refill_ms = (time.perf_counter() - start) * 1000
+        scheduler.heap, scheduler.queued = [], set()
+
+        start = time.perf_counter()
+        claimed = scheduler.drain(now)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scheduler.refill(now)  # Nothing left: the partial index is empty
+        idle_ms = (time.perf_counter() - start) * 1000
+        results['sizes'][count] = {
+            'pending': pending,
+            'fired': claimed,
+            'first_refill_ms': round(refill_ms, 3),
+            'idle_refill_ms': round(idle_ms, 3),
+            'drain_ms': round(elapsed * 1000, 3),
+            'reminders_per_second': round(claimed / elapsed) if elapsed else None,
+        }
+    return results
+
+
+@scenario('renderers')
+def renderers_scenario(task_counts, repeat, **options):
+    """Encode a TaskListSerializer payload of N tasks with each renderer (CPU time per response)"""
+    from rest_framework.renderers import JSONRenderer
+
+    from .renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+    from .serializers import TaskListSerializer
+
+    renderers = {'drf_json': JSONRenderer(), 'fast_json': FastJSONRenderer()}
+    if msgpack is not None:
+        renderers['msgpack'] = MessagePackRenderer()
+    results = {'orjson': orjson is not None, 'msgpack': msgpack is not None, 'sizes': {}}
+    for count in task_counts:
+        tasks = Task.objects.filter(user=bench_user(count)).for_list().order_by('-created_at')[:count]
+        data = TaskListSerializer(tasks, many=True).data
+        size = {}
+        for name, renderer in renderers.items():
+            size[name] = {
+                'bytes': len(renderer.render(data, renderer.media_type, {})),
+                **timed(lambda: renderer.render(data, renderer.media_type, {}), repeat),
+            }
+        results['sizes'][count] = size
+    return results
+
+
+@scenario('export')
+def export_scenario(task_counts, repeat, **options):
+    """Stream a full export per format: time, size and Python heap peak; ``repeat`` is ignored"""
+    import tracemalloc
+
+    from . import export
+
+    streams = {
+        'csv': lambda user: export.stream_csv(user),
+        'ndjson': export.stream_ndjson,
+        'json': export.stream_json,
+    }
+    results = {'sizes': {}}
+    for count in task_counts:
+        user = bench_user(count)
+        size = {}
+        for name, stream in streams.items():
+            start = time.perf_counter()
+            written = sum(len(chunk) for chunk in stream(user))
+            elapsed = time.perf_counter() - start
+            # Second pass for memory: tracing slows the stream down several times
+            tracemalloc.start()
+            for _ in stream(user):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size[name] = {'bytes': written, 'ms': round(elapsed * 1000, 3), 'peak_kib': round(peak / 1024)}
+        results['sizes'][count] = size
+    return results
+
+
+@scenario('import')
+def import_scenario(task_counts, repeat, **options):
+    """Import each benchmark user's export into a scratch user, rolled back afterwards; ``repeat`` is ignored"""
+    import io
+
+    from django.test.utils import override_settings
+
+    from . import export, imports
+
+    importer, _ = User.objects.get_or_create(
+        email='bench-import@example.com',
+        defaults={'username': 'bench-import', 'first_name': 'Bench', 'last_name': 'Import'},
+    )
+    results = {'sizes': {}}
+    for count in task_counts:
+        user = bench_user(count)
+        files = {
+            'csv': b''.join(export.stream_csv(user)).decode(),
+            'ndjson': b''.join(export.stream_ndjson(user)).decode(),
+        }
+        size = {}
+        for name, content in files.items():
+            # As in production: the DEBUG cursor formats every parameter into connection.queries
+            with override_settings(DEBUG=False), transaction.atomic():
+                start = time.perf_counter()
+                report = imports.import_tasks(importer, io.StringIO(content, newline=''), name)
+                elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+            size[name] = {
+                'created': report['created'],
+                'failed': report['failed'],
+                'ms': round(elapsed * 1000, 3),
+                'rows_per_second': round(report['created'] / elapsed),
+            }
+        results['sizes'][count] = size
+    return results
+
+
+CONCURRENT_CLIENTS = 500
+SERVER_COMMANDS = {
+    'gunicorn': lambda port, workers: [
+        '-m', 'gunicorn', 'task_management.wsgi:application', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers), '--worker-class', 'gthread', '--threads', '8', '--backlog', '2048',
+    ],
+    'uvicorn': lambda port, workers: [
+        '-m', 'uvicorn', 'task_management.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--log-level', 'warning', '--no-access-log', '--backlog', '2048',
+    ],
+}
+# Runs: (server, extra environment). gunicorn with ASYNC_VIEWS measures what the
+# async views would cost under WSGI, where the sync views are routed instead.
+CONCURRENCY_RUNS = {
+    'gunicorn': ('gunicorn', {}),
+    'gunicorn_async_views': ('gunicorn', {'ASYNC_VIEWS': 'True'}),
+    'uvicorn': ('uvicorn', {}),
+}
+CONCURRENCY_PATHS = [
+    '/api/tasks/today/', '/api/tasks/upcoming/', '/api/tasks/calendar/',
+    '/api/tasks/stats/', '/api/analytics/overview/',
+]
+
+
+@contextmanager
+def serve(server, workers, environ=None):
+    """Run ``server`` against this database on a free local port; yields the port"""
+    import os
+    import socket
+    import subprocess
+    import sys
+
+    from django.conf import settings
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    env = {**os.environ, 'DEBUG': 'False', 'ALLOWED_HOSTS': '127.0.0.1', **(environ or {})}
+    env.setdefault('DATABASE_URL', f"sqlite:///{settings.DATABASES['default']['NAME']}")
+    process = subprocess.Popen(
+        [sys.executable, *SERVER_COMMANDS[server](port, workers)],
+        cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'{server} exited: {process.stderr.read().decode()[-2000:]}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f'{server} did not start listening within 30s')
+                time.sleep(0.2)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+async def http_client(port, token, paths, count, samples, failures):
+    """One keep-alive HTTP/1.1 connection sending ``count`` GETs round-robin over ``paths``"""
+    import asyncio
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        for i in range(count):
+            path = paths[i % len(paths)]
+            start = time.perf_counter()
+            writer.write(
+                f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n'
+                f'Accept: application/json\r\n\r\n'.encode()
+            )
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').lower()
+            status = int(head.split(' ', 2)[1])
+            headers = dict(line.split(': ', 1) for line in head.split('\r\n')[1:] if ': ' in line)
+            if 'content-length' in headers:
+                await reader.readexactly(int(headers['content-length']))
+            elif headers.get('transfer-encoding') == 'chunked':
+                while size := int((await reader.readline()).strip(), 16):
+                    await reader.readexactly(size + 2)
+                await reader.readline()
+            samples.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                failures[status] = failures.get(status, 0) + 1
+            if headers.get('connection') == 'close':
+                writer.close()
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    finally:
+        writer.close()
+
+
+def load_test(port, token, paths, clients, requests_per_client):
+    """Fire ``clients`` concurrent connections at the server; latency percentiles and throughput"""
+    import asyncio
+
+    samples, failures = [], {}
+
+    async def run():
+        # Warm every worker's connection and code paths before timing
+        await asyncio.gather(*(
+            http_client(port, token, paths, len(paths), [], {}) for _ in range(min(clients, 50))
+        ))
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(
+            http_client(port, token, paths[i % len(paths):] + paths[:i % len(paths)], requests_per_client, samples, failures)
+            for i in range(clients)
+        ), return_exceptions=True)
+        return time.perf_counter() - start, [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+
+    elapsed, errors = asyncio.run(run())
+    return {
+        'requests': len(samples),
+        'requests_per_second': round(len(samples) / elapsed),
+        **(percentiles(samples) if samples else {}),
+        'non_200': failures,
+        'connection_errors': len(errors),
+    }
+
+
+@scenario('concurrency')
+def concurrency_scenario(task_counts, repeat, **options):
+    """
+    500 keep-alive clients against gunicorn (WSGI, gthread) and uvicorn (ASGI) on
+    the endpoints with async views, plus gunicorn serving those async views;
+    ``repeat`` is requests per client. Servers get the same worker count and are
+    skipped when not installed.
+    """
+    import importlib.util
+    import os
+
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    workers = min(4, os.cpu_count() or 1)
+    results = {'clients': CONCURRENT_CLIENTS, 'workers': workers, 'paths': CONCURRENCY_PATHS, 'sizes': {}}
+    for count in task_counts:
+        token = str(AccessToken.for_user(bench_user(count)))
+        size = {}
+        for run, (server, environ) in CONCURRENCY_RUNS.items():
+            if importlib.util.find_spec(server) is None:
+                size[run] = 'not installed'
+                continue
+            with serve(server, workers, environ) as port:
+                size[run] = load_test(port, token, CONCURRENCY_PATHS, CONCURRENT_CLIENTS, repeat)
+        results['sizes'][count] = size
+    return results
+
+
+ENDPOINT_APPS = {'/api/tasks/': 'tasks.urls', '/api/analytics/': 'analytics.urls', '/api/auth/': 'accounts.urls'}
+# URL names the endpoint benchmark leaves out, with the reason it reports
+EXTERNAL_ENDPOINTS = {
+    'generate_insights': 'calls the Mistral API',
+    'task_suggestions': 'calls the Mistral API',
+}
+
+
+def endpoint_requests(user):
+    """
+    (URL name, method, URL kwargs, body) for every endpoint, aimed at ``user``'s
+    data. A callable body is called per request (uploads can only be read once).
+    """
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from analytics.models import AIInsight
+
+    from . import export
+    from .dates import local_today
+    from .models import DayPlanner, SubTask
+
+    task = Task.objects.one_off().filter(user=user, subtasks__isnull=False).first()
+    series = Task.objects.series().filter(user=user, recurring_pattern='daily').first()
+    subtask = SubTask.objects.filter(parent_task=task).first()
+    plan = DayPlanner.objects.filter(user=user).order_by('-date').first()
+    insight = AIInsight.objects.filter(user=user).first()
+    category = Category.objects.first()
+    open_ids = list(Task.objects.filter(user=user, status=TaskStatus.TODO).values_list('id', flat=True)[:50])
+    today = local_today(user)
+    lines = []
+    for chunk in export.stream_ndjson(user):
+        lines.extend(chunk.splitlines(keepends=True))
+        if len(lines) >= 200:
+            break
+    ndjson = b''.join(lines[:200])
+    new_task = {'title': 'Benchmark task', 'priority': 'high', 'tags': ['work', 'bench']}
+    password = {'old_password': SEED_PASSWORD, 'new_password': 'Bench-password-2', 'new_password_confirm': 'Bench-password-2'}
+
+    return [
+        ('category_list_create', 'get', {}, None),
+        ('category_list_create', 'post', {}, {'name': 'Benchmark', 'color': '#000000'}),
+        ('category_detail', 'get', {'pk': category.pk}, None),
+        ('category_detail', 'patch', {'pk': category.pk}, {'color': '#111111'}),
+        ('task_list_create', 'get', {}, None),
+        ('task_list_create', 'get', {'query': 'q=report&ordering=-priority'}, None),
+        ('task_list_create', 'post', {}, new_task),
+        ('task_detail', 'get', {'pk': task.pk}, None),
+        ('task_detail', 'patch', {'pk': task.pk}, {'priority': 'low'}),
+        ('task_detail', 'delete', {'pk': task.pk}, None),
+        ('task_complete', 'post', {'pk': task.pk}, None),
+        ('task_occurrence', 'patch', {'pk': series.pk, 'day': today.isoformat()}, {'status': 'completed'}),
+        ('tag_list', 'get', {}, None),
+        ('subtask_list_create', 'get', {'task_id': task.pk}, None),
+        ('subtask_list_create', 'post', {'task_id': task.pk}, {'title': 'Benchmark subtask'}),
+        ('subtask_detail', 'patch', {'pk': subtask.pk}, {'is_completed': True}),
+        ('comment_list_create', 'get', {'task_id': task.pk}, None),
+        ('comment_list_create', 'post', {'task_id': task.pk}, {'content': 'Benchmark comment'}),
+        ('day_planner_list_create', 'get', {}, None),
+        ('day_planner_list_create', 'post', {}, {'date': (today + timedelta(days=400)).isoformat(), 'task_ids': open_ids[:5]}),
+        ('day_planner_detail', 'get', {'pk': plan.pk}, None),
+        ('day_planner_detail', 'patch', {'pk': plan.pk}, {'task_ids': open_ids[:8]}),
+        ('task_stats', 'get', {}, None),
+        ('calendar_tasks', 'get', {}, None),
+        ('today_tasks', 'get', {}, None),
+        ('upcoming_tasks', 'get', {}, None),
+        ('task_changes', 'get', {}, None),
+        ('export_tasks', 'get', {'query': 'format=ndjson'}, None),
+        ('import_tasks', 'post', {}, lambda: {'file': SimpleUploadedFile('tasks.ndjson', ndjson)}),
+        ('bulk_task_action', 'post', {}, {'task_ids': open_ids, 'action': 'mark_completed'}),
+        ('bulk_tasks', 'post', {}, {
+            'create': [dict(new_task, title=f'Bulk {n}') for n in range(20)],
+            'update': [{'id': task_id, 'priority': 'urgent'} for task_id in open_ids[:20]],
+        }),
+        ('user_analytics', 'get', {}, None),
+        ('weekly_reports', 'get', {}, None),
+        ('ai_insights', 'get', {}, None),
+        ('ai_insight_detail', 'get', {'pk': insight.pk}, None),
+        ('ai_insight_detail', 'patch', {'pk': insight.pk}, {'is_helpful': True}),
+        ('focus_sessions', 'get', {}, None),
+        ('focus_sessions', 'post', {}, {
+            'task': task.pk, 'duration': 25, 'start_time': timezone.now() - timedelta(minutes=25),
+            'end_time': timezone.now(), 'focus_score': 8,
+        }),
+        ('productivity_dashboard', 'get', {}, None),
+        ('analytics_overview', 'get', {}, None),
+        ('user_register', 'post', {}, {
+            'email': 'bench-register@example.com', 'username': 'bench-register', 'first_name': 'Bench',
+            'last_name': 'Register', 'password': 'Bench-password-2', 'password_confirm': 'Bench-password-2',
+        }),
+        ('user_login', 'post', {}, {'email': user.email, 'password': SEED_PASSWORD}),
+        ('user_logout', 'post', {}, {}),
+        ('token_refresh', 'post', {}, lambda: {'refresh': str(RefreshToken.for_user(user))}),
+        ('user_profile', 'get', {}, None),
+        ('user_profile', 'patch', {}, {'theme_preference': 'dark'}),
+        ('change_password', 'post', {}, password),
+        ('dashboard_greeting', 'get', {}, None),
+    ]
+
+
+@scenario('endpoints')
+def endpoints_scenario(task_counts, repeat, **options):
+    """
+    Call every URL in the tasks, analytics and accounts apps in-process, through
+    the full middleware stack with a JWT, as a seed_user() owning N tasks. Each
+    request runs in a transaction that is rolled back, so writes repeat against
+    the same data. Reports latency, queries per request and the Python heap
+    allocated by one extra traced call. Cached endpoints serve from the response
+    cache after the first call, as they do for a polling client.
+    """
+    import tracemalloc
+    from importlib import import_module
+
+    from django.test.utils import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    url_names = [
+        pattern.name for module in ENDPOINT_APPS.values() for pattern in import_module(module).urlpatterns
+    ]
+    results = {'skipped': EXTERNAL_ENDPOINTS, 'sizes': {}}
+    for count in task_counts:
+        user, _ = seed_user(f'bench-endpoints-{count}@example.com', count, random.Random(count))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        requests = endpoint_requests(user)
+        endpoints = {}
+
+        def call(method, url, body):
+            queries = []
+
+            def count_query(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            data = body() if callable(body) else body
+            uploads = data and any(hasattr(value, 'read') for value in data.values())
+            with connection.execute_wrapper(count_query), transaction.atomic():
+                start = time.perf_counter()
+                response = getattr(client, method)(url, data, format='multipart' if uploads else 'json')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = (time.perf_counter() - start) * 1000
+                transaction.set_rollback(True)
+            return response.status_code, elapsed, len(queries)
+
+        # As in production: the DEBUG cursor formats every parameter into connection.queries
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver']):
+            for name, method, url_kwargs, body in requests:
+                url_kwargs = dict(url_kwargs)
+                query = url_kwargs.pop('query', '')
+                url = reverse(name, kwargs=url_kwargs) + (f'?{query}' if query else '')
+                call(method, url, body)  # Warm up
+                samples, query_counts = [], []
+                for _ in range(repeat):
+                    status, elapsed, queries = call(method, url, body)
+                    samples.append(elapsed)
+                    query_counts.append(queries)
+                tracemalloc.start()
+                call(method, url, body)
+                allocated = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                endpoints[f'{method.upper()} {url}'] = {
+                    'name': name,
+                    'status': status,
+                    **percentiles(samples),
+                    'queries': round(statistics.median(query_counts)),
+                    'allocated_kib': round(allocated / 1024),
+                }
+        covered = {request[0] for request in requests}
+        results['sizes'][count] = {
+            'endpoints': endpoints,
+            'not_covered': sorted(set(url_names) - covered - set(EXTERNAL_ENDPOINTS)),
+        }
+    return results
@@ -0,0 +1,132 @@
+"""
+Batch task writes for the /api/tasks/bulk/ endpoint.
+
+Items are validated with TaskCreateUpdateSerializer (categories resolved from
+one preloaded map rather than a query per item) and written with
+bulk_create / bulk_update / a single UPDATE. These paths skip model signals,
+so tag links and the user's data version are maintained here explicitly.
+"""
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Category, Task, TaskStatus
+from .serializers import TaskCreateUpdateSerializer
+from .tagging import sync_task_tags
+from .versions import bump_data_version
+
+BULK_TASK_LIMIT = 500
+MOVE_FIELDS = ('category', 'priority', 'due_date')
+
+
+def bulk_context(request):
+    """Serializer context with every category preloaded for FK validation"""
+    return {'request': request, 'category_cache': Category.objects.in_bulk()}
+
+
+def validate_creates(items, context):
+    """Return (validated_data list, per-item errors)"""
+    validated, errors = [], []
+    for index, item in enumerate(items):
+        serializer = TaskCreateUpdateSerializer(data=item, context=context)
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return validated, errors
+
+
+def item_id(item):
+    """The integer ``id`` of an update item, or None for anything else (bools included)"""
+    pk = item.get('id') if isinstance(item, dict) else None
+    return pk if isinstance(pk, int) and not isinstance(pk, bool) else None
+
+
+def validate_updates(user, items, context):
+    """Return ([(task, validated_data)], per-item errors) for partial updates"""
+    ids = [pk for pk in map(item_id, items) if pk is not None]
+    tasks = Task.objects.filter(user=user).in_bulk(ids)
+    validated, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        pk = item_id(item)
+        if pk is None:
+            errors.append({'index': index, 'errors': {'id': ['A valid integer is required.']}})
+            continue
+        task = tasks.get(pk)
+        if task is None:
+            errors.append({'index': index, 'errors': {'id': ['Task not found']}})
+            continue
+        if task.pk in seen:
+            errors.append({'index': index, 'errors': {'id': ['Task listed more than once']}})
+            continue
+        seen.add(task.pk)
+        data = {key: value for key, value in item.items() if key != 'id'}
+        serializer = TaskCreateUpdateSerializer(task, data=data, partial=True, context=context)
+        if serializer.is_valid():
+            validated.append((task, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return validated, errors
+
+
+def validate_move(data, context):
+    """Return ((task ids, validated move fields), errors) for a batch category/priority/due-date move"""
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=BULK_TASK_LIMIT
+    )
+    errors = {}
+    try:
+        ids = task_ids.run_validation(data.get('task_ids', serializers.empty))
+    except serializers.ValidationError as exc:
+        errors['task_ids'] = exc.detail
+    fields = {key: data[key] for key in MOVE_FIELDS if key in data}
+    if not fields:
+        errors['non_field_errors'] = [f'Provide at least one of: {", ".join(MOVE_FIELDS)}']
+    else:
+        serializer = TaskCreateUpdateSerializer(data=fields, partial=True, context=context)
+        if not serializer.is_valid():
+            errors.update(serializer.errors)
+    if errors:
+        return None, errors
+    return (ids, serializer.validated_data), None
+
+
+def create_tasks(user, validated, batch_size=BULK_TASK_LIMIT):
+    tasks = Task.objects.bulk_create(
+        [Task(user=user, **data) for data in validated], batch_size=batch_size
+    )
+    sync_task_tags(tasks)
+    if tasks:
+        bump_data_version(user.id)
+    return tasks
+
+
+def update_tasks(user, validated):
+    now = timezone.now()
+    fields = {'updated_at'}
+    tagged = []
+    for task, data in validated:
+        if 'status' in data and data['status'] != task.status:
+            task.completed_at = now if data['status'] == TaskStatus.COMPLETED else None
+            fields.add('completed_at')
+        if 'reminder_date' in data and data['reminder_date'] != task.reminder_date:
+            task.reminder_sent_at = None
+            fields.add('reminder_sent_at')
+        for attr, value in data.items():
+            setattr(task, attr, value)
+        fields.update(data)
+        task.updated_at = now
+        if 'tags' in data:
+            tagged.append(task)
+    tasks = [task for task, _ in validated]
+    Task.objects.bulk_update(tasks, sorted(fields), batch_size=BULK_TASK_LIMIT)
+    sync_task_tags(tagged)
+    bump_data_version(user.id)
+    return tasks
+
+
+def move_tasks(user, task_ids, fields):
+    """Apply the same category/priority/due date to many tasks in one UPDATE"""
+    moved = Task.objects.filter(user=user, id__in=task_ids).update(updated_at=timezone.now(), **fields)
+    if moved:
+        bump_data_version(user.id)
+    return moved
@@ -0,0 +1,30 @@
+"""
+Per-user cached aggregates used by the task endpoints.
+
+Entries are keyed on the user's data version (see tasks.versions), which every
+write to their tasks bumps, so a worker never reads counts from before a write,
+whichever process made it. Superseded entries are never read again and expire
+from the cache.
+"""
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Task
+
+CATEGORY_COUNTS_KEY = 'tasks:category-counts:{user_id}:{version}'
+CATEGORY_COUNTS_TIMEOUT = 60 * 60
+
+
+def category_counts(user_id, version):
+    """Return {category_id: task count} for a user at data ``version``, from cache when possible"""
+    key = CATEGORY_COUNTS_KEY.format(user_id=user_id, version=version)
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            Task.objects.filter(user_id=user_id, category__isnull=False)
+            .order_by()
+            .values_list('category')
+            .annotate(count=Count('id'))
+        )
+        cache.set(key, counts, CATEGORY_COUNTS_TIMEOUT)
+    return counts
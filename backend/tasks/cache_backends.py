@@ -0,0 +1,44 @@
+"""Cache backends used by tasks.response_cache"""
+import os
+
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache that evicts least-recently-used entries instead of random ones.
+
+    A hit touches the entry's mtime (expiry is stored inside the file, so this
+    doesn't extend it). Once MAX_ENTRIES is reached, the oldest
+    ``num_entries / CULL_FREQUENCY`` files by mtime are removed, or just the
+    oldest one when that works out to less than one.
+    """
+    _missing = object()
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._missing, version)
+        if value is self._missing:
+            return default
+        try:
+            os.utime(self._key_to_file(key, version))
+        except OSError:
+            pass  # Culled or cleared by another process meanwhile
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def last_used(fname):
+            try:
+                return os.stat(fname).st_mtime
+            except OSError:
+                return 0
+
+        filelist.sort(key=last_used)
+        for fname in filelist[:max(1, int(num_entries / self._cull_frequency))]:
+            self._delete(fname)
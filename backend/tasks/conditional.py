@@ -0,0 +1,99 @@
+"""
+Conditional GET for read endpoints.
+
+ETags are derived from the user's data version (see tasks.versions), the query
+parameters, the negotiated media type and the user's timezone, so a matching
+``If-None-Match`` is answered with 304 after a single primary-key lookup,
+before any serializer or aggregate query runs. Responses also depend on the
+clock (``is_overdue``, today's range), so ETags roll over every
+ETAG_TIME_BUCKET seconds even without writes.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .dates import user_timezone
+from .versions import arequest_data_version, request_data_version
+
+ETAG_TIME_BUCKET = 60
+
+
+def data_etag(request, scope):
+    user = request.user
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    parts = [
+        scope,
+        str(user.pk),
+        str(request_data_version(request)),
+        str(int(time.time() // ETAG_TIME_BUCKET)),
+        str(user_timezone(user)),
+        getattr(request, 'accepted_media_type', '') or '',
+        repr(params),
+    ]
+    return quote_etag(hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest())
+
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags
+
+
+def tag_response(response, etag):
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def conditional_response(request, scope, render):
+    """Return 304 when the client's ETag is current, otherwise ``render()`` with an ETag"""
+    if request.method != 'GET':
+        return render()
+    etag = data_etag(request, scope)
+    if etag_matches(request, etag):
+        return tag_response(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    return tag_response(render(), etag)
+
+
+async def aconditional_response(request, scope, render):
+    """conditional_response() for async views; ``render()`` returns an awaitable"""
+    if request.method != 'GET':
+        return await render()
+    await arequest_data_version(request)  # data_etag() then reads it off the request
+    etag = data_etag(request, scope)
+    if etag_matches(request, etag):
+        return tag_response(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    return tag_response(await render(), etag)
+
+
+def conditional_get(scope):
+    """Decorator for function views, sync or async; place it below @api_view/@permission_classes"""
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapped(request, *args, **kwargs):
+                return await aconditional_response(request, scope, lambda: view(request, *args, **kwargs))
+        else:
+            @wraps(view)
+            def wrapped(request, *args, **kwargs):
+                return conditional_response(request, scope, lambda: view(request, *args, **kwargs))
+        return wrapped
+    return decorator
+
+
+class ConditionalGetMixin:
+    """ETag support for generic views; set ``etag_scope``"""
+    etag_scope = None
+
+    def get(self, request, *args, **kwargs):
+        return conditional_response(
+            request, self.etag_scope or type(self).__name__, lambda: super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+        )
@@ -0,0 +1,54 @@
+"""
+Day boundaries in the user's own timezone.
+
+Views filter on half-open ``[start, end)`` UTC datetime ranges produced here
+instead of ``__date`` lookups. ``__date`` wraps the column in a cast, which
+stops index use, and evaluates the date in UTC rather than the user's timezone.
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.utils import timezone
+
+
+def user_timezone(user):
+    try:
+        return ZoneInfo(getattr(user, 'timezone', None) or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo('UTC')
+
+
+def local_today(user, now=None):
+    return (now or timezone.now()).astimezone(user_timezone(user)).date()
+
+
+def local_midnight(user, day):
+    """Aware datetime for the start of ``day`` in the user's timezone"""
+    return datetime.combine(day, time.min, tzinfo=user_timezone(user))
+
+
+def date_span(user, start_date, end_date):
+    """Half-open range covering local days ``start_date`` through ``end_date`` inclusive"""
+    return local_midnight(user, start_date), local_midnight(user, end_date + timedelta(days=1))
+
+
+def day_range(user, day):
+    return date_span(user, day, day)
+
+
+def week_range(user, day):
+    """Monday-to-Sunday week containing ``day``"""
+    monday = day - timedelta(days=day.weekday())
+    return date_span(user, monday, monday + timedelta(days=6))
+
+
+def month_range(user, day):
+    first = day.replace(day=1)
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    return local_midnight(user, first), local_midnight(user, next_first)
+
+
+def in_range(field, bounds):
+    """Filter kwargs for a half-open range on ``field``"""
+    start, end = bounds
+    return {f'{field}__gte': start, f'{field}__lt': end}
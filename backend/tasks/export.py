@@ -0,0 +1,142 @@
+"""
+Streaming export for ``GET /api/tasks/export/``.
+
+Rows are read with ``.values().iterator(chunk_size=EXPORT_CHUNK_SIZE)``, so no
+model instances or serializers are built. On PostgreSQL the iterator uses a
+server-side cursor; other backends fetch the result set in chunks. NDJSON and
+JSON nest each task's subtasks and comments: they are fetched with one query
+each per chunk of tasks, so memory is bounded by the chunk size, not by the
+number of tasks. CSV can't nest, so subtasks and comments are separate
+files (``?part=subtasks`` / ``?part=comments``) keyed by task id.
+
+Under ASGI, Django reads a synchronous streaming body to the end before
+sending any of it. response_body() hands ASGI requests an async iterator
+instead, which runs each step of the generator, queries included, in the
+thread Django uses for sync code.
+"""
+import csv
+from collections import defaultdict
+from datetime import date, datetime
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+from .models import SubTask, Task, TaskComment
+from .renderers import FastJSONRenderer
+
+EXPORT_CHUNK_SIZE = 2000
+
+TASK_FIELDS = [
+    'id', 'title', 'description', 'category_id', 'category__name', 'priority', 'status',
+    'due_date', 'reminder_date', 'completed_at', 'created_at', 'updated_at',
+    'estimated_duration', 'actual_duration', 'tags', 'is_recurring', 'recurring_pattern',
+    'recurrence_interval', 'recurrence_weekdays', 'recurrence_end',
+]
+SUBTASK_FIELDS = ['id', 'parent_task_id', 'title', 'is_completed', 'created_at', 'completed_at']
+COMMENT_FIELDS = ['id', 'task_id', 'user_id', 'content', 'created_at']
+
+# Column headers; category__name is exported as category
+TASK_COLUMNS = [name.replace('category__name', 'category') for name in TASK_FIELDS]
+CSV_PARTS = {
+    'tasks': (TASK_FIELDS, TASK_COLUMNS),
+    'subtasks': (SUBTASK_FIELDS, SUBTASK_FIELDS),
+    'comments': (COMMENT_FIELDS, COMMENT_FIELDS),
+}
+
+_json = FastJSONRenderer()
+
+
+def part_rows(user, part):
+    """Iterator over the ``.values()`` rows of one export part, oldest first"""
+    if part == 'subtasks':
+        queryset = SubTask.objects.filter(parent_task__user=user, parent_task__deleted_at__isnull=True)
+        fields = SUBTASK_FIELDS
+    elif part == 'comments':
+        queryset = TaskComment.objects.filter(task__user=user, task__deleted_at__isnull=True)
+        fields = COMMENT_FIELDS
+    else:
+        queryset = Task.objects.filter(user=user)
+        fields = TASK_FIELDS
+    return queryset.order_by('id').values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def csv_value(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return ','.join(str(item) for item in value)
+    return value
+
+
+class _Buffer:
+    """File-like object that hands back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(user, part='tasks'):
+    fields, columns = CSV_PARTS[part]
+    writer = csv.writer(_Buffer())
+    yield writer.writerow(columns).encode('utf-8')
+    for chunk in chunks(part_rows(user, part), EXPORT_CHUNK_SIZE):
+        yield ''.join(writer.writerow([csv_value(value) for value in row]) for row in chunk).encode('utf-8')
+
+
+def nested_tasks(user):
+    """Yield lists of task dicts, each carrying its ``subtasks`` and ``comments``"""
+    for chunk in chunks(part_rows(user, 'tasks'), EXPORT_CHUNK_SIZE):
+        ids = [row[0] for row in chunk]
+        subtasks = defaultdict(list)
+        for row in SubTask.objects.filter(parent_task_id__in=ids).order_by('id').values_list(*SUBTASK_FIELDS):
+            subtasks[row[1]].append(dict(zip(SUBTASK_FIELDS, row)))
+        comments = defaultdict(list)
+        for row in TaskComment.objects.filter(task_id__in=ids).order_by('id').values_list(*COMMENT_FIELDS):
+            comments[row[1]].append(dict(zip(COMMENT_FIELDS, row)))
+        tasks = []
+        for row in chunk:
+            task = dict(zip(TASK_COLUMNS, row))
+            task['subtasks'] = subtasks.get(row[0], [])
+            task['comments'] = comments.get(row[0], [])
+            tasks.append(task)
+        yield tasks
+
+
+def stream_ndjson(user):
+    for tasks in nested_tasks(user):
+        yield b''.join(_json.render(task) + b'\n' for task in tasks)
+
+
+def stream_json(user):
+    yield b'['
+    separator = b''
+    for tasks in nested_tasks(user):
+        yield separator + b','.join(_json.render(task) for task in tasks)
+        separator = b','
+    yield b']'
+
+
+async def aiter_chunks(chunks):
+    """Async iterator over the sync iterator ``chunks``, advanced with sync_to_async"""
+    iterator = iter(chunks)
+    done = object()
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await next_chunk(iterator, done)) is not done:
+        yield chunk
+
+
+def response_body(request, chunks):
+    """``chunks`` as StreamingHttpResponse content: async under ASGI so each chunk is sent as it is made"""
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return aiter_chunks(chunks)
+    return chunks
@@ -0,0 +1,51 @@
+import django_filters
+from rest_framework import filters
+
+from .models import OPEN_STATUSES, Task, TaskTag
+from .tagging import normalize_tag
+
+
+class TaskFilter(django_filters.FilterSet):
+    tag = django_filters.CharFilter(method='filter_tag', help_text='Comma-separated; tasks must carry every tag')
+    overdue = django_filters.BooleanFilter(method='filter_overdue', help_text='Open tasks past their due date')
+    open = django_filters.BooleanFilter(method='filter_open', help_text='To do or in progress')
+
+    class Meta:
+        model = Task
+        fields = ['priority', 'status', 'category', 'is_recurring', 'tag', 'overdue', 'open']
+
+    def filter_tag(self, queryset, name, value):
+        for tag in {normalize_tag(part) for part in value.split(',')} - {''}:
+            # Semi-join driven by the (user, name) tag index and TaskTag.tag_id
+            queryset = queryset.filter(
+                id__in=TaskTag.objects.filter(tag__user=self.request.user, tag__name=tag).values('task_id')
+            )
+        return queryset
+
+    def filter_overdue(self, queryset, name, value):
+        # Filter on the condition itself, not the annotation, so the partial index applies
+        return queryset.overdue() if value else queryset.not_overdue()
+
+    def filter_open(self, queryset, name, value):
+        return queryset.open_tasks() if value else queryset.exclude(status__in=OPEN_STATUSES)
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that sorts ``priority`` by rank (low < medium < high < urgent), not alphabetically"""
+    field_columns = {'priority': 'priority_rank'}
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view) or []
+        # The annotation is skipped when the response doesn't render is_overdue
+        if any(term.lstrip('-') == 'overdue' for term in ordering) and 'overdue' not in queryset.query.annotations:
+            queryset = queryset.with_overdue()
+        return super().filter_queryset(request, queryset, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [
+            ('-' if term.startswith('-') else '') + self.field_columns.get(term.lstrip('-'), term.lstrip('-'))
+            for term in ordering
+        ]
@@ -0,0 +1,463 @@
+"""
+Bulk task import for ``POST /api/tasks/import/`` and ``manage.py import_tasks``.
+
+Reads the export formats: CSV, one task per row (the subtask and comment side
+files are not imported), and NDJSON, one task per line with an optional
+``subtasks`` list. Input is parsed a line at a time. Django spools large
+uploads to a temporary file, so an upload never sits in memory as a whole.
+
+Rows are checked by the field parsers below rather than by
+TaskCreateUpdateSerializer, which costs more per row than the insert. Unlike
+the API they accept due dates in the past, and they keep ``created_at`` and
+``completed_at`` from the source. Reminders that are already due are marked
+sent, so importing history doesn't fire them all at once. Categories are
+shared by every user, so an import only matches existing ones, by name and
+case-insensitively against one in-memory map; rows naming any other category
+are reported as errors.
+
+Valid rows are written in batches of ``batch_size``. All batches share one
+transaction, and each has its own savepoint. Writes are multi-row
+``INSERT ... RETURNING id`` statements of already-converted values, because
+bulk_create's per-field preparation would dominate the import time (it cuts
+throughput to about a third). The column lists must name every non-nullable
+column, which the tests check against the models. If the database rejects a
+batch, it is rolled back to its savepoint and reported, and the other batches
+are kept. As in tasks.bulk, tag links and the user's data version are
+maintained explicitly.
+"""
+import csv
+import io
+from collections import Counter
+from datetime import datetime
+
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from . import search
+from .models import Category, Priority, RecurrencePattern, SubTask, Task, TaskStatus, TaskTag
+from .tagging import apply_count_deltas, ensure_tags, normalize_tags
+from .versions import bump_data_version
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    import json
+    loads = json.loads
+
+IMPORT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+CATEGORY_MAX_LENGTH = Category._meta.get_field('name').max_length
+MAX_INTEGER = 2147483647
+PRIORITIES = frozenset(Priority.values)
+STATUSES = frozenset(TaskStatus.values)
+PATTERNS = frozenset(RecurrencePattern.values)
+TRUE_VALUES = {'true', 't', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'f', 'no', 'n', '0', ''}
+
+# Columns written per task and per subtask, in INSERT order
+TASK_INSERT_COLUMNS = [
+    'user_id', 'title', 'description', 'category_id', 'priority', 'status', 'due_date',
+    'reminder_date', 'reminder_sent_at', 'created_at', 'updated_at', 'completed_at',
+    'estimated_duration', 'actual_duration', 'tags', 'is_recurring', 'recurring_pattern',
+    'recurrence_interval', 'recurrence_weekdays', 'recurrence_end',
+]
+SUBTASK_INSERT_COLUMNS = ['parent_task_id', 'title', 'is_completed', 'created_at', 'updated_at', 'completed_at']
+
+
+class ImportFormatError(ValueError):
+    """The file can't be read past this point; nothing is imported"""
+
+
+class RowError(ValueError):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def detect_format(filename):
+    return EXTENSIONS.get(filename[filename.rfind('.'):].lower()) if '.' in filename else None
+
+
+def open_upload(upload):
+    """Text stream over an UploadedFile, decoded as it is read"""
+    upload.seek(0)
+    return io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+
+
+def read_csv(stream):
+    """Yield (line number, row dict); export CSVs (``?format=csv``) read back as-is"""
+    reader = csv.DictReader(stream)
+    try:
+        if not reader.fieldnames or 'title' not in reader.fieldnames:
+            raise ImportFormatError('The CSV header row must include a title column')
+        for row in reader:
+            yield reader.line_num, row
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ImportFormatError(f'Line {reader.line_num + 1}: {exc}') from exc
+
+
+def read_ndjson(stream):
+    """Yield (line number, parsed object, or None for invalid JSON); blank lines are skipped"""
+    number = 0
+    try:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, loads(line)
+            except ValueError:
+                yield number, None
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError(f'Line {number + 1}: {exc}') from exc
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson}
+
+
+def insert_rows(model, columns, rows, returning=False):
+    """
+    INSERT ``rows`` (tuples of database-ready values for ``columns``) with
+    multi-row VALUES statements kept under the backend's parameter limit.
+    Returns the new primary keys in row order when ``returning`` is set.
+    """
+    if not rows:
+        return []
+    quote = connection.ops.quote_name
+    row_sql = f"({', '.join(['%s'] * len(columns))})"
+    prefix = f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(quote(column) for column in columns)}) VALUES "
+    suffix = f" RETURNING {quote(model._meta.pk.column)}" if returning else ''
+    max_params = connection.features.max_query_params
+    per_statement = max(1, max_params // len(columns)) if max_params else len(rows)
+    ids = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            cursor.execute(prefix + ', '.join([row_sql] * len(chunk)) + suffix, [value for row in chunk for value in row])
+            if returning:
+                ids.extend(row[0] for row in cursor.fetchall())
+    return ids
+
+
+def blank(value):
+    return value is None or value == ''
+
+
+def parse_text(value, max_length=None):
+    if blank(value):
+        return None
+    if not isinstance(value, str):
+        raise ValueError('Not a valid string.')
+    if max_length and len(value) > max_length:
+        raise ValueError(f'Ensure this field has no more than {max_length} characters.')
+    return value
+
+
+def parse_choice(value, choices):
+    if not isinstance(value, str) or value not in choices:
+        raise ValueError(f'"{value}" is not a valid choice.')
+    return value
+
+
+def parse_datetime_value(value):
+    if blank(value):
+        return None
+    if not isinstance(value, str):
+        raise ValueError('Datetime has wrong format. Use ISO 8601.')
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and (day := parse_date(value)) is not None:
+            parsed = datetime(day.year, day.month, day.day)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError('Datetime has wrong format. Use ISO 8601.')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def parse_integer(value, minimum=0, maximum=MAX_INTEGER):
+    if blank(value):
+        return None
+    if isinstance(value, str):
+        try:
+            value = int(value.strip())
+        except ValueError:
+            raise ValueError('A valid integer is required.') from None
+    elif isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError('A valid integer is required.')
+    if not minimum <= value <= maximum:
+        raise ValueError(f'Ensure this value is between {minimum} and {maximum}.')
+    return value
+
+
+def parse_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    if isinstance(value, str) and value.strip().lower() in TRUE_VALUES | FALSE_VALUES:
+        return value.strip().lower() in TRUE_VALUES
+    raise ValueError('Must be a valid boolean.')
+
+
+def parse_list(value):
+    """JSON list, or a comma-separated string as written by the CSV export"""
+    if blank(value):
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    if not isinstance(value, list):
+        raise ValueError('Expected a list or a comma-separated string.')
+    return value
+
+
+def parse_tags(value):
+    tags = parse_list(value)
+    if any(not isinstance(tag, (str, int, float)) or isinstance(tag, bool) for tag in tags):
+        raise ValueError('Tags must be strings.')
+    return tags
+
+
+def parse_weekdays(value):
+    days = [parse_integer(day, 0, 6) for day in parse_list(value)]
+    if None in days:
+        raise ValueError('Weekdays must be integers from 0 (Monday) to 6 (Sunday).')
+    return sorted(set(days))
+
+
+# field: (parser, value when missing or blank); parsers only see non-blank values
+FIELD_PARSERS = {
+    'title': (lambda value: parse_text(value, TITLE_MAX_LENGTH), None),
+    'description': (parse_text, None),
+    'category': (lambda value: parse_text(value.strip() if isinstance(value, str) else value, CATEGORY_MAX_LENGTH), None),
+    'priority': (lambda value: parse_choice(value, PRIORITIES), Priority.MEDIUM),
+    'status': (lambda value: parse_choice(value, STATUSES), TaskStatus.TODO),
+    'due_date': (parse_datetime_value, None),
+    'reminder_date': (parse_datetime_value, None),
+    'created_at': (parse_datetime_value, None),
+    'completed_at': (parse_datetime_value, None),
+    'estimated_duration': (parse_integer, None),
+    'actual_duration': (parse_integer, None),
+    'tags': (parse_tags, []),
+    'is_recurring': (parse_boolean, False),
+    'recurring_pattern': (lambda value: parse_choice(value, PATTERNS), None),
+    'recurrence_interval': (lambda value: parse_integer(value, 1, 32767), 1),
+    'recurrence_weekdays': (parse_weekdays, []),
+    'recurrence_end': (parse_datetime_value, None),
+}
+
+SUBTASK_PARSERS = {
+    'title': (lambda value: parse_text(value, TITLE_MAX_LENGTH), None),
+    'is_completed': (parse_boolean, False),
+    'created_at': (parse_datetime_value, None),
+    'completed_at': (parse_datetime_value, None),
+}
+
+
+def parse_fields(row, parsers):
+    """Return (values, errors) for ``row`` parsed with ``parsers``"""
+    values, errors = {}, {}
+    for field, (parser, default) in parsers.items():
+        value = row.get(field)
+        if value is None or value == '':
+            values[field] = default
+            continue
+        try:
+            values[field] = parser(value)
+        except ValueError as exc:
+            errors[field] = [str(exc)]
+    if values.get('title') is None and 'title' not in errors:
+        errors['title'] = ['This field is required.']
+    return values, errors
+
+
+class TaskImporter:
+    """Parses rows for one user and writes them in batches; see the module docstring"""
+
+    def __init__(self, user, batch_size=IMPORT_BATCH_SIZE):
+        self.user = user
+        self.batch_size = batch_size
+        self.now = timezone.now()
+        self.categories = None
+        self.pending = []
+        self.created = 0
+        self.subtasks_created = 0
+        self.failed = 0
+        self.errors = []
+        self.errors_truncated = False
+        self.index = None
+        # Bound once: every attribute read through the ``connection`` proxy is a thread-local lookup
+        self.ops = connection.ops
+        if connection.vendor == 'sqlite':
+            # adapt_datetimefield_value() minus its per-call checks; parsed values are always aware
+            db_timezone = connection.timezone
+            self.adapt_datetime = lambda value: str(value.astimezone(db_timezone).replace(tzinfo=None))
+        else:
+            self.adapt_datetime = self.ops.adapt_datetimefield_value
+        self.db_now = self.adapt_datetime(self.now)
+        self.db_empty_list = self.ops.adapt_json_value([], None)
+
+    def run(self, rows):
+        """Import every (line, row) pair and return the report"""
+        with transaction.atomic(), search.deferred_insert_index(connection) as index:
+            self.index = index
+            for line, row in rows:
+                try:
+                    self.pending.append((line, *self.parse(row)))
+                except RowError as exc:
+                    self.reject(line, exc.errors)
+                    continue
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+            self.flush()
+            if self.created:
+                bump_data_version(self.user.id)
+        return self.report()
+
+    def reject(self, line, errors, count=1):
+        self.failed += count
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+        else:
+            self.errors_truncated = True
+
+    def category_id(self, name):
+        """Id of the existing category called ``name`` (any case), or None"""
+        if self.categories is None:
+            self.categories = {}
+            for category_id, category_name in Category.objects.order_by('-id').values_list('id', 'name'):
+                self.categories[category_name.casefold()] = category_id
+        return self.categories.get(name.casefold())
+
+    def parse(self, row):
+        """Return (task column values, tag names, subtask column values) for one input row"""
+        if not isinstance(row, dict):
+            raise RowError({'non_field_errors': ['Expected a JSON object.']})
+        values, errors = parse_fields(row, FIELD_PARSERS)
+        subtasks = self.parse_subtasks(row.get('subtasks'), errors)
+        if values.get('is_recurring') and values.get('recurring_pattern') and not values.get('due_date') and 'due_date' not in errors:
+            errors['due_date'] = ['Recurring tasks need a due date for their first occurrence']
+        category_id = None
+        if values.get('category'):
+            category_id = self.category_id(values['category'])
+            if category_id is None:
+                errors['category'] = [f'No category named "{values["category"]}".']
+        if errors:
+            raise RowError(errors)
+
+        now = self.now
+        status = values['status']
+        completed_at = (values['completed_at'] or now) if status == TaskStatus.COMPLETED else None
+        reminder_date = values['reminder_date']
+        adapt = self.db_datetime
+        task = (
+            self.user.id,
+            values['title'],
+            values['description'],
+            category_id,
+            values['priority'],
+            status,
+            adapt(values['due_date']),
+            adapt(reminder_date),
+            self.db_now if reminder_date and reminder_date <= now else None,
+            adapt(values['created_at'] or now),
+            self.db_now,
+            adapt(completed_at),
+            values['estimated_duration'],
+            values['actual_duration'],
+            self.db_json(values['tags']),
+            values['is_recurring'],
+            values['recurring_pattern'],
+            values['recurrence_interval'],
+            self.db_json(values['recurrence_weekdays']),
+            adapt(values['recurrence_end']),
+        )
+        return task, normalize_tags(values['tags']), subtasks
+
+    def db_datetime(self, value):
+        if value is None:
+            return None
+        return self.db_now if value is self.now else self.adapt_datetime(value)
+
+    def db_json(self, value):
+        return self.ops.adapt_json_value(value, None) if value else self.db_empty_list
+
+    def parse_subtasks(self, items, errors):
+        if blank(items):
+            return []
+        if not isinstance(items, list):
+            errors['subtasks'] = ['Expected a list of subtasks.']
+            return []
+        subtasks = []
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors['subtasks'] = [f'Subtask {position}: expected an object.']
+                return []
+            values, item_errors = parse_fields(item, SUBTASK_PARSERS)
+            if item_errors:
+                errors['subtasks'] = [{'index': position, 'errors': item_errors}]
+                return []
+            completed_at = (values['completed_at'] or self.now) if values['is_completed'] else None
+            subtasks.append((
+                values['title'],
+                values['is_completed'],
+                self.db_datetime(values['created_at'] or self.now),
+                self.db_now,
+                self.db_datetime(completed_at),
+            ))
+        return subtasks
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        try:
+            with transaction.atomic():
+                task_ids = insert_rows(Task, TASK_INSERT_COLUMNS, [task for _, task, _, _ in batch], returning=True)
+                self.index(min(task_ids), max(task_ids))
+                self.link_tags(task_ids, [names for _, _, names, _ in batch])
+                subtasks = [
+                    (task_id, *subtask)
+                    for task_id, (_, _, _, task_subtasks) in zip(task_ids, batch)
+                    for subtask in task_subtasks
+                ]
+                insert_rows(SubTask, SUBTASK_INSERT_COLUMNS, subtasks)
+        except DatabaseError as exc:
+            self.reject(batch[0][0], {'non_field_errors': [f'Lines {batch[0][0]}-{batch[-1][0]} were not imported: {exc}']}, len(batch))
+            return
+        self.created += len(task_ids)
+        self.subtasks_created += len(subtasks)
+
+    def link_tags(self, task_ids, tag_names):
+        """Tag rows and links for freshly inserted tasks, which have none yet"""
+        wanted = {task_id: names for task_id, names in zip(task_ids, tag_names) if names}
+        if not wanted:
+            return
+        tag_ids = ensure_tags({self.user.id: set().union(*wanted.values())})
+        deltas = Counter()
+        links = []
+        for task_id, names in wanted.items():
+            for name in names:
+                tag_id = tag_ids[self.user.id, name]
+                links.append((task_id, tag_id))
+                deltas[tag_id] += 1
+        insert_rows(TaskTag, ['task_id', 'tag_id'], links)
+        apply_count_deltas(deltas)
+
+    def report(self):
+        return {
+            'created': self.created,
+            'subtasks_created': self.subtasks_created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.errors_truncated,
+        }
+
+
+def import_tasks(user, stream, import_format, batch_size=IMPORT_BATCH_SIZE):
+    """Import a CSV or NDJSON text stream for ``user``; raises ImportFormatError"""
+    return TaskImporter(user, batch_size).run(READERS[import_format](stream))
@@ -0,0 +1,30 @@
+"""
+Custom field lookups.
+
+SQLite only uses a partial index when the query repeats the index's WHERE
+condition, and it never looks through bound parameters to do so. The
+``inline_in`` lookup writes its values into the SQL as literals, so a filter
+such as ``status__inline_in=OPEN_STATUSES`` matches the ``status IN (...)``
+condition of tasks_task_overdue_idx. PostgreSQL plans with the actual values
+either way. Only use it with constant, code-defined values.
+"""
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db.models import CharField
+from django.db.models.lookups import In
+
+_LITERAL_RE = re.compile(r'[\w-]+')
+
+
+@CharField.register_lookup
+class InlineIn(In):
+    lookup_name = 'inline_in'
+
+    def process_rhs(self, compiler, connection):
+        values = list(dict.fromkeys(str(value) for value in self.rhs))
+        if not values:
+            raise EmptyResultSet
+        if not all(_LITERAL_RE.fullmatch(value) for value in values):
+            raise ValueError('inline_in only accepts word characters and hyphens')
+        return '(' + ', '.join(f"'{value}'" for value in values) + ')', []
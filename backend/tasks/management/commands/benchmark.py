@@ -0,0 +1,50 @@
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from tasks.benchmarks import SCENARIOS, remote_database_host
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Run a performance benchmark scenario and print the timings as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(SCENARIOS))
+        parser.add_argument(
+            '--tasks', type=int, nargs='+', default=[10000],
+            help='Task counts to benchmark at (one benchmark user per count)'
+        )
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement')
+        parser.add_argument('--output', help='Also write the JSON to this file, e.g. to compare commits')
+        parser.add_argument('--force', action='store_true', help='Allow a database other than SQLite or a local server')
+
+    def handle(self, *args, **options):
+        # Scenarios seed benchmark users and write to the database
+        host = remote_database_host(connection)
+        if host is not None and not options['force']:
+            raise CommandError(
+                f'Refusing to benchmark against the {connection.vendor} database on {host}; '
+                'point DATABASE_URL at a local database or pass --force'
+            )
+        results = SCENARIOS[options['scenario']](
+            task_counts=options['tasks'], repeat=options['repeat']
+        )
+        output = json.dumps(
+            {'scenario': options['scenario'], 'commit': current_commit(), **results}, indent=2, default=str
+        )
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
@@ -0,0 +1,39 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import IMPORT_BATCH_SIZE, READERS, ImportFormatError, detect_format, import_tasks
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Import tasks for a user from a CSV or NDJSON file (the export formats) and print the report as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument('--user', required=True, help='Email address of the user who will own the tasks')
+        parser.add_argument('--format', choices=sorted(READERS), help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Tasks inserted per savepoint')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+        path = options['path']
+        import_format = options['format'] or (None if path == '-' else detect_format(path))
+        if import_format is None:
+            raise CommandError('Pass --format; it cannot be told from the file name')
+
+        try:
+            if path == '-':
+                report = import_tasks(user, sys.stdin, import_format, options['batch_size'])
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = import_tasks(user, stream, import_format, options['batch_size'])
+        except ImportFormatError as exc:
+            raise CommandError(f'Nothing was imported. {exc}')
+        self.stdout.write(json.dumps(report, indent=2))
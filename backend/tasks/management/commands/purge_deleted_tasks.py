@@ -0,0 +1,75 @@
+import time
+from datetime import timedelta
+
+from django.db import models, router, transaction
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+
+from tasks.models import SyncTombstone, Task
+from tasks.sync import TOMBSTONE_RETENTION
+
+
+def purge_tasks(ids):
+    """
+    Hard-delete tasks and everything that references them.
+
+    Dependent rows are removed per relation with one DELETE (or UPDATE for
+    SET_NULL) each rather than through the ORM collector, which would load
+    every row and send signals for it.
+    """
+    for relation in Task._meta.related_objects:
+        related = relation.related_model
+        if relation.many_to_many:
+            through = relation.through
+            column = relation.field.m2m_reverse_field_name()
+            through._base_manager.filter(**{f'{column}__in': ids}).delete()
+        elif relation.on_delete is models.CASCADE:
+            rows = related._base_manager.filter(**{f'{relation.field.name}__in': ids})
+            if related._meta.related_objects:
+                rows.delete()  # Has cascades of its own
+            else:
+                # Skip per-row signals: the tasks were soft-deleted, and their
+                # owners' data versions bumped, when they were tombstoned
+                rows._raw_delete(router.db_for_write(related))
+        elif relation.on_delete is models.SET_NULL:
+            related._base_manager.filter(**{f'{relation.field.name}__in': ids}).update(**{relation.field.name: None})
+    queryset = Task.all_objects.filter(id__in=ids)
+    return queryset._raw_delete(router.db_for_write(Task))
+
+
+class Command(BaseCommand):
+    help = 'Hard-delete soft-deleted tasks in bounded chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=float, default=7,
+            help='Only purge tasks deleted at least this many days ago'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500, help='Tasks deleted per transaction')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between chunks')
+        parser.add_argument('--loop', action='store_true', help='Keep running, checking again every --interval seconds')
+        parser.add_argument('--interval', type=float, default=300, help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            purged = self.purge(options)
+            pruned, _ = SyncTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+            self.stdout.write(self.style.SUCCESS(f'Purged {purged} deleted tasks, pruned {pruned} sync tombstones'))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def purge(self, options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        pending = Task.all_objects.filter(deleted_at__lt=cutoff).order_by('id')
+        purged = 0
+        last_id = 0
+        while True:
+            ids = list(pending.filter(id__gt=last_id).values_list('id', flat=True)[:options['chunk_size']])
+            if not ids:
+                return purged
+            with transaction.atomic():
+                purged += purge_tasks(ids)
+            last_id = ids[-1]
+            if options['sleep']:
+                time.sleep(options['sleep'])
@@ -0,0 +1,20 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from tasks.response_cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Print response cache hit/miss counters as JSON. With the locmem backend the '
+        'counters are per process, so this only reports on a file-based cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(cache_stats()))
+        if options['reset']:
+            reset_cache_stats()
@@ -0,0 +1,66 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.reminders import ReminderScheduler, get_backend
+
+logger = logging.getLogger('tasks.reminders')
+
+
+class Command(BaseCommand):
+    help = 'Fire task reminders as they come due and hand them to the REMINDER_BACKEND'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll', type=float, default=30, help='Seconds between scans for new or changed reminders')
+        parser.add_argument('--batch-size', type=int, default=500, help='Reminders claimed per UPDATE')
+        parser.add_argument('--max-queued', type=int, default=10000, help='Reminders held in memory at once')
+        parser.add_argument(
+            '--max-lateness', type=float, default=None,
+            help='Mark reminders overdue by more than this many minutes as fired without delivering them'
+        )
+        parser.add_argument('--backend', default=None, help='Delivery backend path; overrides REMINDER_BACKEND')
+        parser.add_argument('--once', action='store_true', help='Fire the reminders due now and exit')
+
+    def handle(self, *args, **options):
+        poll = timedelta(seconds=options['poll'])
+        scheduler = ReminderScheduler(
+            get_backend(options['backend']),
+            batch_size=options['batch_size'],
+            # Queue a little past the next scan so nothing falls between two of them
+            lookahead=poll * 2,
+            max_queued=options['max_queued'],
+            max_lateness=timedelta(minutes=options['max_lateness']) if options['max_lateness'] is not None else None,
+        )
+        if options['once']:
+            scheduler.drain()
+            self.report(scheduler)
+            return
+
+        next_refill = timezone.now()
+        try:
+            while True:
+                now = timezone.now()
+                if now >= next_refill:
+                    scheduler.refill(now)
+                    next_refill = now + poll
+                try:
+                    if scheduler.fire_due(now):
+                        self.report(scheduler)
+                except Exception:
+                    # The failed batch was rolled back; the next scan queues it again
+                    logger.exception('Reminder delivery failed')
+                if scheduler.backlogged and not scheduler.heap:
+                    next_refill = timezone.now()
+                wake = min(filter(None, [next_refill, scheduler.next_due()]))
+                time.sleep(max((wake - timezone.now()).total_seconds(), 0))
+        except KeyboardInterrupt:
+            self.report(scheduler)
+
+    def report(self, scheduler):
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {scheduler.delivered} reminders, skipped {scheduler.late} late ones '
+            f'and {scheduler.closed} for closed tasks'
+        ))
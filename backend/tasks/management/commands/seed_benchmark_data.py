@@ -0,0 +1,43 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from tasks.benchmarks import SEED_PASSWORD, remote_database_host, seed_users
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Create seed-<n>@example.com users with realistic tasks, subtasks, comments, tags, day plans, '
+        f'focus sessions and insights (password "{SEED_PASSWORD}"). Existing seed users are kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of users')
+        parser.add_argument('--tasks', type=int, default=500, help='Mean tasks per user')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--reset', action='store_true', help='Delete existing seed users first')
+        parser.add_argument('--force', action='store_true', help='Allow a database other than SQLite or a local server')
+
+    def handle(self, *args, **options):
+        host = remote_database_host(connection)
+        if host is not None and not options['force']:
+            raise CommandError(
+                f'Refusing to seed the {connection.vendor} database on {host}; '
+                'point DATABASE_URL at a local database or pass --force'
+            )
+        if options['reset']:
+            deleted = User.objects.filter(email__startswith='seed-', email__endswith='@example.com').delete()[0]
+            self.stderr.write(f'Deleted {deleted} rows belonging to seed users')
+        start = time.perf_counter()
+        users = seed_users(options['users'], options['tasks'], options['seed'])
+        self.stdout.write(json.dumps({
+            'users': users,
+            'created': sum(user['created'] for user in users),
+            'tasks': sum(user['tasks'] for user in users),
+            'seconds': round(time.perf_counter() - start, 2),
+        }, indent=2))
@@ -0,0 +1,167 @@
+"""
+Per-request SQL instrumentation, on in production and not only under DEBUG.
+
+Every connection gets one ``execute_wrapper`` when it is created. It reports
+each statement and the time spent in ``cursor.execute`` to the request being
+handled, without touching ``connection.queries``, which only fills under
+DEBUG. The current request lives in a context variable rather than on the
+connection: under ASGI, the thread that runs an async view's queries holds a
+different connection object from the one the middleware sees, but
+sync_to_async carries context variables across.
+
+QueryBudgetMiddleware gives every response a ``Server-Timing`` header with
+``db`` (query time, with the query count), ``serialize`` (rendering the DRF
+response body), ``app`` (everything else: middleware, the view and its
+serializers) and ``total``. Browsers show it in the network panel next to the
+request.
+
+Two checks run after the response is built:
+
+* Repeated query shapes. Statements that differ only in the length of an
+  ``IN (...)`` list or the number of ``VALUES`` rows count as one shape. A
+  shape that runs QUERY_REPEAT_THRESHOLD times or more in one request is
+  logged as a likely N+1.
+* Query budgets. QUERY_BUDGETS maps URL names to the most queries a request
+  may run, and other views get QUERY_BUDGET_DEFAULT. None turns both checks
+  off for a view (bulk import and export run as many statements as their
+  input needs). Going over budget logs a warning, or raises QueryBudgetExceeded
+  when QUERY_BUDGET_RAISE is set, so tests and development catch regressions
+  before production latency graphs do.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+current_queries = ContextVar('current_queries', default=None)
+
+_IN_LIST_RE = re.compile(r'IN \((?:%s, )+%s\)')
+_VALUES_ROWS_RE = re.compile(r'(\((?:%s, )*%s\))(?:, \1)+')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_shape(sql):
+    """``sql`` with variable-length placeholder lists folded, so batches of any size compare equal"""
+    return _IN_LIST_RE.sub('IN (%s, ...)', _VALUES_ROWS_RE.sub(r'\1, ...', sql))
+
+
+def record_query(execute, sql, params, many, context):
+    queries = current_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    return queries(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver; runs on every reconnect, so install once per connection object"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestQueries:
+    """Statements, by SQL, and time spent in the database for one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def repeated(self, threshold):
+        """(shape, times run) for shapes run at least ``threshold`` times, most frequent first"""
+        shapes = Counter()
+        for sql, times in self.statements.items():
+            shapes[query_shape(sql)] += times
+        return [(shape, times) for shape, times in shapes.most_common() if times >= threshold]
+
+
+class QueryBudgetMiddleware:
+    """Place first in MIDDLEWARE so ``total`` covers the whole stack"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # A sync hook would cost the request a thread switch under ASGI
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        return self.finish(request, response, queries, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        return self.finish(request, response, queries, start)
+
+    def process_template_response(self, request, response):
+        # Runs just before the Response is rendered; the callback right after
+        render_start = time.perf_counter()
+
+        def rendered(response):
+            request._serialize_duration = time.perf_counter() - render_start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return QueryBudgetMiddleware.process_template_response(self, request, response)
+
+    def finish(self, request, response, queries, start):
+        total = time.perf_counter() - start
+        serialize = getattr(request, '_serialize_duration', 0)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries"',
+            f'serialize;dur={serialize * 1000:.1f}',
+            f'app;dur={max(total - queries.duration - serialize, 0) * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+        self.check(request, queries)
+        return response
+
+    def check(self, request, queries):
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        budget = settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET_DEFAULT)
+        if budget is None:
+            return
+        for shape, times in queries.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning('Likely N+1 in %s %s: query ran %d times: %s', request.method, view_name, times, shape)
+        if queries.count > budget:
+            message = f'{request.method} {view_name} ran {queries.count} queries (budget {budget})'
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_tags(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Tag = apps.get_model('tasks', 'Tag')
+    TaskTag = apps.get_model('tasks', 'TaskTag')
+    max_length = Tag._meta.get_field('name').max_length
+
+    tag_ids = {}
+
+    def flush(rows):
+        # The tag table starts empty and its (user, name) unique index is only
+        # built when this migration finishes, so track created tags here
+        # rather than relying on ignore_conflicts.
+        missing = {(user_id, name) for user_id, _, name in rows} - tag_ids.keys()
+        created = Tag.objects.bulk_create([Tag(user_id=u, name=n) for u, n in missing])
+        if created and created[0].pk is None:
+            created = Tag.objects.filter(
+                user_id__in={tag.user_id for tag in created}, name__in={tag.name for tag in created}
+            )
+        for tag in created:
+            tag_ids[tag.user_id, tag.name] = tag.pk
+        TaskTag.objects.bulk_create(
+            [TaskTag(task_id=task_id, tag_id=tag_ids[user_id, name]) for user_id, task_id, name in rows]
+        )
+
+    rows = []
+    tasks = Task.objects.exclude(tags=[]).values_list('id', 'user_id', 'tags')
+    for task_id, user_id, tags in tasks.iterator(chunk_size=2000):
+        if isinstance(tags, str):
+            tags = [tags]
+        if not isinstance(tags, list):
+            continue
+        names = {str(tag).strip().lower()[:max_length] for tag in tags if isinstance(tag, (str, int, float))}
+        rows.extend((user_id, task_id, name) for name in names if name)
+        if len(rows) >= 5000:
+            flush(rows)
+            rows = []
+    if rows:
+        flush(rows)
+
+    counts = TaskTag.objects.filter(tag=OuterRef('pk')).order_by().values('tag').annotate(c=Count('pk')).values('c')
+    Tag.objects.update(task_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('task_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-task_count', 'name'],
+                'unique_together': {('user', 'name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_links', to='tasks.tag')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tags', to='tasks.task')),
+            ],
+            options={
+                'unique_together': {('task', 'tag')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('completed_at__isnull', True), ('deleted_at__isnull', True), ('reminder_date__isnull', False), ('reminder_sent_at__isnull', True)), fields=['reminder_date'], name='tasks_task_reminder_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_reminder_sent_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status__in', ['todo', 'in_progress'])), fields=['user', 'due_date'], name='tasks_task_overdue_idx'),
+        ),
+    ]
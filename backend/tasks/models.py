@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import BooleanField, Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from . import lookups  # noqa: F401  Registers __inline_in
+
 User = get_user_model()
 
 class Category(models.Model):
@@ -28,6 +32,135 @@ class TaskStatus(models.TextChoices):
     COMPLETED = 'completed', 'Completed'
     CANCELLED = 'cancelled', 'Cancelled'
 
+OPEN_STATUSES = [TaskStatus.TODO, TaskStatus.IN_PROGRESS]
+
+# Task.priority_rank values; the TextChoices values sort alphabetically
+PRIORITY_RANK = {Priority.LOW: 1, Priority.MEDIUM: 2, Priority.HIGH: 3, Priority.URGENT: 4}
+
+class RecurrencePattern(models.TextChoices):
+    DAILY = 'daily', 'Daily'
+    WEEKLY = 'weekly', 'Weekly'
+    MONTHLY = 'monthly', 'Monthly'
+
+# Columns needed by the list serializers; description and the other detail-only
+# fields stay deferred on list reads.
+TASK_LIST_FIELDS = [
+    'id', 'user', 'title', 'priority', 'priority_rank', 'status', 'due_date', 'created_at',
+    'updated_at', 'completed_at', 'tags', 'category', 'category__name',
+    'category__color',
+]
+
+# Extra columns tasks.recurrence reads when expanding a series
+RECURRENCE_FIELDS = [
+    'due_date', 'is_recurring', 'recurring_pattern', 'recurrence_interval',
+    'recurrence_weekdays', 'recurrence_end',
+]
+
+# Condition of the partial reminder index: unfired reminders of tasks that are
+# neither completed nor deleted. Only IS NULL tests, which SQLite can match
+# against a parameterised query; cancelled tasks and ones marked completed
+# without a completed_at are weeded out when run_reminders claims them.
+REMINDER_PENDING = Q(
+    reminder_date__isnull=False,
+    reminder_sent_at__isnull=True,
+    completed_at__isnull=True,
+    deleted_at__isnull=True,
+)
+
+def overdue_condition(now):
+    """Open and past due; the statuses are inlined so SQLite can use tasks_task_overdue_idx"""
+    return Q(status__inline_in=OPEN_STATUSES, due_date__lt=now)
+
+class TaskQuerySet(models.QuerySet):
+    def with_subtask_counts(self):
+        """Annotate subtask totals so serializers don't query per task"""
+        # Correlated subqueries rather than a join + GROUP BY: they are only
+        # evaluated for the rows of the page being returned.
+        subtasks = SubTask.objects.filter(parent_task=OuterRef('pk')).order_by().values('parent_task')
+        total = subtasks.annotate(count=Count('pk')).values('count')
+        completed = subtasks.annotate(count=Count('pk', filter=Q(is_completed=True))).values('count')
+        return self.annotate(
+            subtask_total=Coalesce(Subquery(total), 0),
+            subtask_completed=Coalesce(Subquery(completed), 0),
+        )
+    
+    def with_overdue(self, now=None):
+        """Annotate ``overdue``, read by Task.is_overdue, evaluated against one ``now``"""
+        condition = overdue_condition(now or timezone.now())
+        return self.annotate(overdue=Case(When(condition, then=Value(True)), default=Value(False), output_field=BooleanField()))
+    
+    def open_tasks(self):
+        """To do or in progress; inlined statuses match the partial indexes on open tasks"""
+        return self.filter(status__inline_in=OPEN_STATUSES)
+    
+    def overdue(self, now=None):
+        return self.filter(overdue_condition(now or timezone.now()))
+    
+    def not_overdue(self, now=None):
+        return self.exclude(overdue_condition(now or timezone.now()))
+    
+    def for_list(self, *extra_fields, fields=None):
+        """
+        Queryset shape shared by every task list endpoint.
+        
+        ``fields`` is the set of TaskListSerializer fields being rendered (all of
+        them by default); the category join, the subtask and overdue annotations
+        and the tags column are skipped when nothing rendered needs them.
+        """
+        def wanted(*names):
+            return fields is None or not fields.isdisjoint(names)
+        columns = [name for name in TASK_LIST_FIELDS if not name.startswith('category__')]
+        queryset = self
+        if wanted('category_name', 'category_color'):
+            queryset = queryset.select_related('category')
+            columns += ['category__name', 'category__color']
+        if not wanted('tags'):
+            columns.remove('tags')
+        queryset = queryset.only(*columns, *extra_fields)
+        if wanted('subtask_count', 'completion_percentage'):
+            queryset = queryset.with_subtask_counts()
+        if wanted('is_overdue'):
+            queryset = queryset.with_overdue()
+        return queryset
+    
+    def series(self):
+        """Recurring tasks, which tasks.recurrence expands into occurrences"""
+        return self.filter(is_recurring=True, recurring_pattern__in=RecurrencePattern.values)
+    
+    def one_off(self):
+        return self.exclude(is_recurring=True, recurring_pattern__in=RecurrencePattern.values)
+    
+    def pending_reminders(self):
+        """Unfired reminders; matches tasks_task_reminder_idx so scans can use it"""
+        return self.filter(REMINDER_PENDING)
+    
+    def soft_delete(self):
+        """
+        Tombstone the tasks with one UPDATE instead of collecting cascades in the
+        request; the purge_deleted_tasks command hard-deletes them later.
+        """
+        from .sync import record_deletions
+        from .tagging import release_task_tags
+        from .versions import bump_data_version
+        
+        rows = list(self.filter(deleted_at__isnull=True).order_by().values_list('id', 'user_id'))
+        if not rows:
+            return 0
+        ids = [task_id for task_id, _ in rows]
+        now = timezone.now()
+        with transaction.atomic():
+            release_task_tags(ids)
+            deleted = Task.all_objects.filter(id__in=ids).update(deleted_at=now)
+            record_deletions('task', rows, deleted_at=now)
+            bump_data_version(*{user_id for _, user_id in rows})
+        return deleted
+
+class TaskManager(models.Manager.from_queryset(TaskQuerySet)):
+    """Default manager; hides soft-deleted tasks"""
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 class Task(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
@@ -36,11 +169,21 @@ class Task(models.Model):
     
     # Task details
     priority = models.CharField(max_length=10, choices=Priority.choices, default=Priority.MEDIUM)
+    # Kept in step with priority by the database, including on bulk updates
+    priority_rank = models.GeneratedField(
+        expression=Case(
+            *[When(priority=priority, then=Value(rank)) for priority, rank in PRIORITY_RANK.items()],
+            default=Value(0),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     status = models.CharField(max_length=15, choices=TaskStatus.choices, default=TaskStatus.TODO)
     
     # Dates
     due_date = models.DateTimeField(null=True, blank=True)
     reminder_date = models.DateTimeField(null=True, blank=True)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)  # Set by run_reminders
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -52,26 +195,63 @@ class Task(models.Model):
     # Additional fields
     tags = models.JSONField(default=list, blank=True)  # List of tags
     is_recurring = models.BooleanField(default=False)
-    recurring_pattern = models.CharField(max_length=20, blank=True, null=True)  # daily, weekly, monthly
+    recurring_pattern = models.CharField(max_length=20, choices=RecurrencePattern.choices, blank=True, null=True)
+    # Rest of the rule; due_date is the first occurrence (see tasks.recurrence)
+    recurrence_interval = models.PositiveSmallIntegerField(default=1)  # Every N days/weeks/months
+    recurrence_weekdays = models.JSONField(default=list, blank=True)  # Weekly only; 0=Monday .. 6=Sunday
+    recurrence_end = models.DateTimeField(null=True, blank=True)  # Last possible occurrence, inclusive
+    
+    # Soft delete tombstone; rows are hard-deleted by purge_deleted_tasks
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    
+    objects = TaskManager()
+    all_objects = TaskQuerySet.as_manager()  # Includes soft-deleted tasks
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'status']),
+            models.Index(fields=['user', 'due_date']),
+            models.Index(fields=['user', 'updated_at']),  # Delta sync scans
             models.Index(fields=['due_date']),
             models.Index(fields=['priority']),
+            # ?status=...&ordering=-priority, and the open-task list below, read in index order
+            models.Index(fields=['user', 'status', '-priority_rank', 'due_date'], name='tasks_task_status_rank_idx'),
+            models.Index(
+                fields=['user', '-priority_rank', 'due_date'], condition=Q(status__in=OPEN_STATUSES, deleted_at__isnull=True),
+                name='tasks_task_open_rank_idx',
+            ),
+            models.Index(fields=['deleted_at'], condition=Q(deleted_at__isnull=False), name='tasks_task_deleted_idx'),
+            models.Index(fields=['user', 'due_date'], condition=Q(is_recurring=True), name='tasks_task_series_idx'),
+            models.Index(fields=['reminder_date'], condition=REMINDER_PENDING, name='tasks_task_reminder_idx'),
+            # Overdue lists; condition must match overdue_condition() plus the manager's filter
+            models.Index(
+                fields=['user', 'due_date'], condition=Q(status__in=OPEN_STATUSES, deleted_at__isnull=True),
+                name='tasks_task_overdue_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.user.full_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the owner as loaded so signal receivers can tell a move
+        if 'user_id' in instance.__dict__:
+            instance._loaded_owner = {'user_id': instance.user_id}
+        return instance
+    
     @property
     def is_completed(self):
         return self.status == TaskStatus.COMPLETED
     
     @property
     def is_overdue(self):
-        if self.due_date and not self.is_completed:
+        # Annotated by TaskQuerySet.with_overdue() on list and detail reads
+        if 'overdue' in self.__dict__:
+            return self.overdue
+        if self.due_date and self.status in OPEN_STATUSES:
             return timezone.now() > self.due_date
         return False
     
@@ -79,14 +259,21 @@ class Task(models.Model):
         self.status = TaskStatus.COMPLETED
         self.completed_at = timezone.now()
         self.save()
+        self.__dict__.pop('overdue', None)
 
 class SubTask(models.Model):
     parent_task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='subtasks')
     title = models.CharField(max_length=200)
     is_completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+    
     def __str__(self):
         return f"{self.parent_task.title} - {self.title}"
 
@@ -98,10 +285,97 @@ class TaskComment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"Comment on {self.task.title} by {self.user.full_name}"
 
+class TaskOccurrence(models.Model):
+    """Stored change to one occurrence of a recurring task; unchanged occurrences have no row"""
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='occurrences')
+    original_date = models.DateField()  # Owner's local date the rule puts the occurrence on
+    status = models.CharField(max_length=15, choices=TaskStatus.choices, null=True, blank=True)  # cancelled skips it
+    due_date = models.DateTimeField(null=True, blank=True)  # Set when the occurrence was moved
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['task', 'original_date']
+    
+    def __str__(self):
+        return f"{self.task.title} on {self.original_date}"
+
+class SyncTombstone(models.Model):
+    """Deletion log read by the delta-sync endpoint; pruned by purge_deleted_tasks"""
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('subtask', 'Subtask'),
+        ('comment', 'Comment'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_tombstones')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+class UserDataVersion(models.Model):
+    """Per-user counter bumped on every write to the user's data; keys ETags and caches"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+class Tag(models.Model):
+    """Normalized per-user tag, kept in sync with Task.tags by tasks.tagging"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tags')
+    name = models.CharField(max_length=50)  # Lowercased, stripped
+    task_count = models.PositiveIntegerField(default=0)  # Maintained counter
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['user', 'name']
+        ordering = ['-task_count', 'name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.task_count})"
+
+class TaskTag(models.Model):
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='task_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='task_links')
+    
+    class Meta:
+        unique_together = ['task', 'tag']
+    
+    def __str__(self):
+        return f"{self.task_id} - {self.tag.name}"
+
+class DayPlannerQuerySet(models.QuerySet):
+    def with_task_counts(self):
+        """Annotate planned/completed task totals (soft-deleted tasks excluded)"""
+        planned = (
+            DayPlanner.tasks.through.objects
+            .filter(dayplanner=OuterRef('pk'), task__deleted_at__isnull=True)
+            .order_by().values('dayplanner')
+        )
+        total = planned.annotate(count=Count('pk')).values('count')
+        completed = planned.annotate(count=Count('pk', filter=Q(task__status=TaskStatus.COMPLETED))).values('count')
+        return self.annotate(
+            planned_total=Coalesce(Subquery(total), 0),
+            planned_completed=Coalesce(Subquery(completed), 0),
+        )
+
 class DayPlanner(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='day_plans')
     date = models.DateField()
@@ -121,6 +395,8 @@ class DayPlanner(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = DayPlannerQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['user', 'date']
         ordering = ['-date']
@@ -0,0 +1,163 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework import filters
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(value, pk, reverse=False):
+    """Opaque cursor token positioned just after (value, pk)"""
+    payload = json.dumps({'k': value, 'id': pk, 'r': int(reverse)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Requests without a ``cursor`` parameter keep the regular page-number
+    behaviour. Passing ``?cursor=`` (empty for the first page) switches to keyset
+    pagination on (ordering field, id): no COUNT query and no OFFSET, so every
+    page costs the same no matter how deep the client has scrolled. The ordering
+    follows the filter backends (ranked search orders by ``search_rank``), else
+    the view's ``ordering_fields`` / ``ordering`` like OrderingFilter, and may
+    name an annotation such as ``overdue``. NULLs sort as the largest value, in
+    both directions and on every backend.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.key, self.descending = self.get_ordering(request, queryset, view)
+        self.key_field = self.get_key_field(queryset)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['r'])
+
+        if cursor is not None:
+            queryset = queryset.filter(self.after_position(cursor['k'], cursor['id'], reverse))
+
+        moving_desc = self.descending != reverse
+        if moving_desc:
+            order = [F(self.key).desc(nulls_first=True), F('pk').desc()]
+        else:
+            order = [F(self.key).asc(nulls_last=True), F('pk').asc()]
+
+        results = list(queryset.order_by(*order)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_ordering(self, request, queryset, view):
+        """Return the (field or annotation name, descending) pair the cursor is keyed on"""
+        # Follow the order the filter backends settled on (ranked search
+        # replaces the default ordering), else ordering_fields / ordering
+        ordering = [term for term in queryset.query.order_by if isinstance(term, str)][:1]
+        if not ordering:
+            # Use the view's own OrderingFilter subclass, which may map names to columns
+            backend = next(
+                (backend for backend in getattr(view, 'filter_backends', []) if issubclass(backend, filters.OrderingFilter)),
+                filters.OrderingFilter,
+            )
+            ordering = backend().get_ordering(request, queryset, view) or ['-pk']
+        field = ordering[0]
+        descending = field.startswith('-')
+        name = field.lstrip('-')
+        if name == 'pk':
+            name = queryset.model._meta.pk.name
+        return name, descending
+
+    def get_key_field(self, queryset):
+        """Model field or annotation output field used to parse and format cursor values"""
+        try:
+            return queryset.model._meta.get_field(self.key)
+        except FieldDoesNotExist:
+            pass
+        annotation = queryset.query.annotations.get(self.key)
+        if annotation is None:
+            raise ValidationError({self.cursor_query_param: [f"Cannot paginate by cursor on '{self.key}'."]})
+        # A named copy so value_to_string()/to_python() work as for a column;
+        # expressions can evaluate to NULL whatever the output field says
+        field = annotation.output_field.clone()
+        field.set_attributes_from_name(self.key)
+        field.null = True
+        return field
+
+    def after_position(self, value, pk, reverse):
+        """Filter selecting the rows that come after (value, pk) in walk order"""
+        moving_desc = self.descending != reverse
+        nullable = self.key_field.null
+        if moving_desc:
+            if value is None:
+                return Q(**{f'{self.key}__isnull': True, 'pk__lt': pk}) | Q(**{f'{self.key}__isnull': False})
+            return Q(**{f'{self.key}__lt': value}) | Q(**{self.key: value, 'pk__lt': pk})
+        if value is None:
+            return Q(**{f'{self.key}__isnull': True, 'pk__gt': pk})
+        condition = Q(**{f'{self.key}__gt': value}) | Q(**{self.key: value, 'pk__gt': pk})
+        if nullable:
+            condition |= Q(**{f'{self.key}__isnull': True})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            value = cursor['k']
+            if value is not None:
+                value = self.key_field.to_python(value)
+            return {'k': value, 'id': int(cursor['id']), 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def cursor_link(self, obj, reverse):
+        value = getattr(obj, self.key_field.attname)
+        if value is not None:
+            value = self.key_field.value_to_string(obj)
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(value, obj.pk, reverse))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.cursor_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,207 @@
+"""
+Recurring tasks expanded into virtual occurrences.
+
+A recurring task is a single row. Its ``due_date`` is the first occurrence,
+and ``recurring_pattern`` (daily / weekly / monthly), ``recurrence_interval``,
+``recurrence_weekdays`` and ``recurrence_end`` play the part of an RRULE's
+FREQ, INTERVAL, BYDAY and UNTIL; completing the series row itself ends it
+at ``completed_at`` too. Occurrences are never stored. They are computed only
+for the window a view asks for, jumping straight to the first period inside
+it. Stepping happens in the owner's timezone so occurrences keep
+their wall-clock time across DST changes; like RRULE, a monthly rule on the
+31st skips shorter months.
+
+Only per-occurrence changes are stored, as TaskOccurrence rows keyed on the
+occurrence's original local date: a status (``cancelled`` is an exception that
+removes the occurrence), a completion time, or a moved due date.
+"""
+import copy
+from datetime import date, datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .dates import user_timezone
+from .models import OPEN_STATUSES, RecurrencePattern, TaskOccurrence, TaskStatus
+
+
+def _first_multiple(offset, interval):
+    """Smallest multiple of ``interval`` that is >= ``offset`` (and >= 0)"""
+    if offset <= 0:
+        return 0
+    return -(-offset // interval) * interval
+
+
+def series_until(task):
+    """
+    Last moment ``task`` can have an occurrence, or None if it runs forever.
+
+    That is ``recurrence_end``, or when the series row itself was completed if
+    sooner (at its first occurrence when completed without a completed_at).
+    """
+    ends = [task.recurrence_end]
+    if task.status == TaskStatus.COMPLETED:
+        ends.append(task.completed_at or task.due_date)
+    ends = [end for end in ends if end is not None]
+    return min(ends) if ends else None
+
+
+def occurrence_dates(task, first, last, tz):
+    """Yield the local dates in [first, last] on which ``task``'s rule puts an occurrence"""
+    start = task.due_date.astimezone(tz)
+    start_date = start.date()
+    until = series_until(task)
+    if until is not None:
+        last = min(last, until.astimezone(tz).date())
+    first = max(first, start_date)
+    if first > last:
+        return
+    interval = max(task.recurrence_interval or 1, 1)
+    pattern = task.recurring_pattern
+
+    if pattern == RecurrencePattern.DAILY:
+        day = start_date + timedelta(days=_first_multiple((first - start_date).days, interval))
+        step = timedelta(days=interval)
+        while day <= last:
+            yield day
+            day += step
+
+    elif pattern == RecurrencePattern.WEEKLY:
+        weekdays = sorted({int(d) for d in task.recurrence_weekdays or [] if 0 <= int(d) <= 6}) or [start_date.weekday()]
+        week_zero = start_date - timedelta(days=start_date.weekday())
+        # Floor rather than ceil: the week containing ``first`` may still hold matches
+        week = ((first - week_zero).days // 7) // interval * interval
+        while True:
+            monday = week_zero + timedelta(weeks=week)
+            if monday > last:
+                return
+            for weekday in weekdays:
+                day = monday + timedelta(days=weekday)
+                if day > last:
+                    return
+                if day >= first:
+                    yield day
+            week += interval
+
+    elif pattern == RecurrencePattern.MONTHLY:
+        offset = (first.year - start_date.year) * 12 + first.month - start_date.month
+        month = _first_multiple(offset, interval)
+        while True:
+            year, index = divmod(start_date.month - 1 + month, 12)
+            year += start_date.year
+            if date(year, index + 1, 1) > last:
+                return
+            try:
+                day = date(year, index + 1, start_date.day)
+            except ValueError:
+                day = None  # No such day this month
+            if day is not None and first <= day <= last:
+                yield day
+            month += interval
+
+
+def occurs_on(task, day, tz=None):
+    """Whether ``task``'s rule has an occurrence on local date ``day``"""
+    tz = tz or user_timezone(task.user)
+    return any(True for _ in occurrence_dates(task, day, day, tz))
+
+
+def expand(task, tz, start, end):
+    """Yield (local date, due datetime) for each occurrence due in [start, end)"""
+    wall_time = task.due_date.astimezone(tz).timetz().replace(tzinfo=None)
+    first = start.astimezone(tz).date()
+    last = end.astimezone(tz).date()
+    until = series_until(task)
+    # Only days on the window's or the rule's edge can fall outside them by time of day
+    edges = {first, last}
+    if until is not None:
+        edges.add(until.astimezone(tz).date())
+    for day in occurrence_dates(task, first, last, tz):
+        due = datetime.combine(day, wall_time, tzinfo=tz)
+        if day in edges and not (start <= due < end and (until is None or due <= until)):
+            continue
+        yield day, due
+
+
+def make_occurrence(task, day, due, override=None):
+    """Copy of the series row standing in for its occurrence on ``day``"""
+    occurrence = copy.copy(task)
+    occurrence.due_date = due
+    occurrence.status = TaskStatus.TODO
+    occurrence.completed_at = None
+    if override is not None:
+        occurrence.due_date = override.due_date or due
+        occurrence.status = override.status or TaskStatus.TODO
+        occurrence.completed_at = override.completed_at
+    occurrence.occurrence_date = day
+    return occurrence
+
+
+def series_in_window(queryset, bounds):
+    """Recurring tasks in ``queryset`` that can have an occurrence in [start, end)"""
+    start, end = bounds
+    # A completed series stops at its completed_at, see series_until()
+    return (
+        queryset.series()
+        .filter(due_date__lt=end)
+        .filter(Q(recurrence_end__isnull=True) | Q(recurrence_end__gte=start))
+        .exclude(status=TaskStatus.CANCELLED)
+        .exclude(status=TaskStatus.COMPLETED, completed_at__lt=start)
+        .exclude(status=TaskStatus.COMPLETED, completed_at__isnull=True, due_date__lt=start)
+    )
+
+
+def expand_series(series, user, bounds):
+    """
+    Occurrences of every task in ``series`` due in [start, end), overrides applied.
+
+    Moved occurrences are placed by their new due date, and cancelled ones are
+    left out. Overrides for all series are loaded in one query.
+    """
+    series = list(series)
+    if not series:
+        return []
+    return expand_loaded(series, list(overrides_in_window(series, user, bounds)), user, bounds)
+
+
+async def aexpand_series(series, user, bounds):
+    """expand_series() for async views"""
+    series = [task async for task in series]
+    if not series:
+        return []
+    overrides = [override async for override in overrides_in_window(series, user, bounds)]
+    return expand_loaded(series, overrides, user, bounds)
+
+
+def overrides_in_window(series, user, bounds):
+    """TaskOccurrence rows that can affect ``series`` in [start, end)"""
+    start, end = bounds
+    tz = user_timezone(user)
+    return TaskOccurrence.objects.filter(task__in=series).filter(
+        Q(original_date__range=(start.astimezone(tz).date() - timedelta(days=1), end.astimezone(tz).date()))
+        | Q(due_date__gte=start, due_date__lt=end)
+    )
+
+
+def expand_loaded(series, overrides, user, bounds):
+    start, end = bounds
+    tz = user_timezone(user)
+    overrides = {(override.task_id, override.original_date): override for override in overrides}
+    by_id = {task.pk: task for task in series}
+    occurrences = []
+    for task in series:
+        for day, due in expand(task, tz, start, end):
+            occurrences.append(make_occurrence(task, day, due, overrides.pop((task.pk, day), None)))
+    # Overrides left over either moved an occurrence into the window or out of it
+    for (task_id, day), override in overrides.items():
+        task = by_id[task_id]
+        if override.due_date and start <= override.due_date < end and occurs_on(task, day, tz):
+            occurrences.append(make_occurrence(task, day, None, override))
+    now = timezone.now()
+    visible = []
+    for occurrence in occurrences:
+        if occurrence.status != TaskStatus.CANCELLED and start <= occurrence.due_date < end:
+            # The series row's ``overdue`` annotation describes the first occurrence only
+            occurrence.overdue = occurrence.status in OPEN_STATUSES and occurrence.due_date < now
+            visible.append(occurrence)
+    return visible
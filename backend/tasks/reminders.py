@@ -0,0 +1,176 @@
+"""
+Reminder dispatch for ``python manage.py run_reminders``.
+
+Pending reminders (``Task.objects.pending_reminders()``) are covered by the
+partial index tasks_task_reminder_idx on reminder_date. Fired reminders and
+completed or deleted tasks drop out of it, so the index only holds work still
+to do. The scheduler range-scans that index for reminders due within a short
+lookahead into an in-memory min-heap. It then sleeps until the heap's head is
+due or the next refill, so an idle database sees one small index scan per poll
+rather than a table scan per minute.
+
+Firing is a claim: ``UPDATE ... SET reminder_sent_at = <stamp> WHERE id IN
+(batch) AND <still pending>``, followed by delivery in the same transaction.
+A reminder that was completed, rescheduled or claimed by another worker after
+being queued no longer matches, so it is left alone. A delivery error rolls the
+claim back and the reminder is picked up again on a later refill
+(at-least-once delivery).
+
+Delivery backends are classes with a ``send(reminders)`` method, selected with
+the REMINDER_BACKEND setting the same way Django selects its email backends.
+"""
+import heapq
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OPEN_STATUSES, Task
+
+logger = logging.getLogger(__name__)
+
+REMINDER_FIELDS = ['id', 'user_id', 'title', 'status', 'due_date', 'reminder_date']
+
+
+class BaseReminderBackend:
+    def send(self, reminders):
+        """Deliver a batch of reminder dicts (REMINDER_FIELDS); raise to retry it later"""
+        raise NotImplementedError
+
+
+class LogReminderBackend(BaseReminderBackend):
+    """Writes each reminder to the ``tasks.reminders`` logger"""
+
+    def send(self, reminders):
+        for reminder in reminders:
+            logger.info(
+                'Reminder for task %s (user %s): %s', reminder['id'], reminder['user_id'], reminder['title']
+            )
+
+
+class FileReminderBackend(BaseReminderBackend):
+    """Appends reminders as JSON lines to REMINDER_FILE_PATH"""
+
+    def __init__(self, path=None):
+        self.path = path or settings.REMINDER_FILE_PATH
+
+    def send(self, reminders):
+        with open(self.path, 'a', encoding='utf-8') as output:
+            for reminder in reminders:
+                output.write(json.dumps(reminder, cls=DjangoJSONEncoder) + '\n')
+
+
+class MemoryReminderBackend(BaseReminderBackend):
+    """Keeps delivered reminders in ``sent``; for tests and benchmarks"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, reminders):
+        self.sent.extend(reminders)
+
+
+def get_backend(path=None):
+    return import_string(path or settings.REMINDER_BACKEND)()
+
+
+class ReminderScheduler:
+    """
+    Min-heap of (reminder_date, task id) fed from the pending-reminder index.
+
+    Reminders of cancelled or completed tasks, and with ``max_lateness`` set
+    those overdue by more than that (after downtime, say), are marked fired
+    without being delivered. They are counted in ``closed`` and ``late``.
+    """
+
+    def __init__(self, backend, batch_size=500, lookahead=timedelta(minutes=1), max_queued=10000, max_lateness=None):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.lookahead = lookahead
+        self.max_queued = max_queued
+        self.max_lateness = max_lateness
+        self.heap = []
+        self.queued = set()
+        self.backlogged = False
+        self.delivered = 0
+        self.closed = 0
+        self.late = 0
+
+    def refill(self, now):
+        """Queue pending reminders due by now + lookahead; returns how many were new"""
+        rows = (
+            Task.objects.pending_reminders()
+            .filter(reminder_date__lte=now + self.lookahead)
+            .order_by('reminder_date')
+            .values_list('reminder_date', 'id')[:self.max_queued]
+        )
+        added = 0
+        loaded = 0
+        for entry in rows:
+            loaded += 1
+            if entry not in self.queued:
+                self.queued.add(entry)
+                heapq.heappush(self.heap, entry)
+                added += 1
+        # A full scan means more may be waiting beyond it; refill again after firing
+        self.backlogged = loaded >= self.max_queued
+        return added
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def fire_due(self, now):
+        """Fire every queued reminder due at ``now`` in batches; returns how many were claimed"""
+        claimed = 0
+        while self.heap and self.heap[0][0] <= now:
+            batch = []
+            while self.heap and self.heap[0][0] <= now and len(batch) < self.batch_size:
+                entry = heapq.heappop(self.heap)
+                self.queued.discard(entry)
+                batch.append(entry[1])
+            claimed += self.fire(batch, now)
+        return claimed
+
+    def fire(self, task_ids, now):
+        stamp = timezone.now()
+        with transaction.atomic():
+            claimed = (
+                Task.objects.pending_reminders()
+                .filter(id__in=task_ids, reminder_date__lte=now)
+                .update(reminder_sent_at=stamp)
+            )
+            if not claimed:
+                return 0
+            claimed_rows = Task.objects.filter(id__in=task_ids, reminder_sent_at=stamp).order_by('reminder_date')
+            reminders = list(claimed_rows.values(*REMINDER_FIELDS))
+            # Claimed either way so they leave the index, but only open tasks are reminded
+            cutoff = now - self.max_lateness if self.max_lateness is not None else None
+            deliver = []
+            for reminder in reminders:
+                if reminder['status'] not in OPEN_STATUSES:
+                    self.closed += 1
+                elif cutoff is not None and reminder['reminder_date'] < cutoff:
+                    self.late += 1
+                else:
+                    deliver.append(reminder)
+            reminders = deliver
+            if reminders:
+                self.backend.send(reminders)
+        self.delivered += len(reminders)
+        return claimed
+
+    def drain(self, now=None):
+        """Fire everything due at ``now``, refilling until nothing due is left; returns the claim count"""
+        now = now or timezone.now()
+        claimed = 0
+        while True:
+            self.refill(now)
+            fired = self.fire_due(now)
+            claimed += fired
+            if not fired:
+                return claimed
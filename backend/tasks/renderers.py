@@ -0,0 +1,67 @@
+"""
+Response renderers that encode faster than the stdlib ``json`` module.
+
+FastJSONRenderer uses orjson when it is installed and produces the same
+output as DRF's JSONRenderer: UTC datetimes end in ``Z``, and types orjson
+doesn't know (Decimal, timedelta, lazy strings...) go through DRF's encoder.
+Without orjson, or when the client asks for an indented response, it is
+DRF's JSONRenderer. MessagePackRenderer serves ``application/msgpack``; the
+settings only register it when msgpack is installed.
+
+CSVRenderer and NDJSONRenderer exist for content negotiation on streaming
+views (``?format=csv``), which build their own response body. Anything else
+they are asked to render, such as an error, is encoded as JSON.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_encoder.default, option=self.options)
+        # Like JSONRenderer: keep the output valid JavaScript as well as JSON
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if msgpack is None:
+            raise RuntimeError('MessagePackRenderer requires the msgpack package')
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
+
+
+class CSVRenderer(FastJSONRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
@@ -0,0 +1,127 @@
+"""
+Per-user response cache for expensive read endpoints.
+
+Entries are keyed on (user, endpoint, normalized query parameters, the user's
+data version, the user's local date). Writes bump the data version through the
+signal receivers in tasks.signals and analytics.signals, so stale entries are
+never read again and simply age out of the bounded, LRU-evicting ``responses``
+cache (see CACHES in settings). Hit and miss counts are kept in the same cache,
+so with the file backend they add up across worker processes;
+``python manage.py response_cache_stats`` prints them.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from .dates import local_today
+from .versions import arequest_data_version, request_data_version
+
+CACHE_ALIAS = 'responses'
+KEY_PREFIX = 'resp'
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def response_cache():
+    return caches[CACHE_ALIAS]
+
+
+def cache_key(request, scope):
+    user = request.user
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    digest = hashlib.sha1(f'{local_today(user)}\x1f{params!r}'.encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:{user.pk}:{scope}:{request_data_version(request)}:{digest}'
+
+
+def count(key):
+    cache = response_cache()
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)  # Evicted between add() and incr()
+
+
+async def acount(key):
+    cache = response_cache()
+    if not await cache.aadd(key, 1, timeout=None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, timeout=None)
+
+
+def cache_stats():
+    cache = response_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def reset_cache_stats():
+    response_cache().delete_many([HITS_KEY, MISSES_KEY])
+
+
+def cached_response(request, scope, render):
+    """Serve ``render()``'s data from the cache when the user's data hasn't changed"""
+    if request.method != 'GET':
+        return render()
+    cache = response_cache()
+    key = cache_key(request, scope)
+    data = cache.get(key)
+    if data is not None:
+        count(HITS_KEY)
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+    count(MISSES_KEY)
+    response = render()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+async def acached_response(request, scope, render):
+    """cached_response() for async views; ``render()`` returns an awaitable"""
+    if request.method != 'GET':
+        return await render()
+    cache = response_cache()
+    await arequest_data_version(request)  # cache_key() then reads it off the request
+    key = cache_key(request, scope)
+    data = await cache.aget(key)
+    if data is not None:
+        await acount(HITS_KEY)
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+    await acount(MISSES_KEY)
+    response = await render()
+    if response.status_code == status.HTTP_200_OK:
+        await cache.aset(key, response.data)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_get(scope):
+    """Decorator for function views, sync or async (and APIView methods via method_decorator)"""
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapped(request, *args, **kwargs):
+                return await acached_response(request, scope, lambda: view(request, *args, **kwargs))
+        else:
+            @wraps(view)
+            def wrapped(request, *args, **kwargs):
+                return cached_response(request, scope, lambda: view(request, *args, **kwargs))
+        return wrapped
+    return decorator
@@ -0,0 +1,300 @@
+"""
+Full-text search for tasks.
+
+PostgreSQL keeps a generated ``search_vector`` tsvector column on the task table
+behind a GIN index. SQLite keeps an FTS5 shadow table (``tasks_task_fts``) in
+sync through triggers. Both are created by migration 0002; on any other
+backend, or a SQLite build without FTS5, search falls back to ``icontains``.
+"""
+import re
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+TASK_TABLE = 'tasks_task'
+FTS_TABLE = 'tasks_task_fts'
+SEARCH_CONFIG = 'english'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# (alias, database name) -> search_backend(); install() and uninstall() reset it
+_backends = {}
+
+POSTGRES_INSTALL = [
+    f"""
+    ALTER TABLE {TASK_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(tags::text, '')), 'C')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS tasks_task_search_gin ON {TASK_TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS tasks_task_search_gin",
+    f"ALTER TABLE {TASK_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, tags,
+        content='{TASK_TABLE}', content_rowid='id', tokenize='porter unicode61'
+    )
+"""
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description, tags ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def sqlite_has_fts5(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        # Some builds ship FTS5 as a loadable module without the compile flag
+        cursor.execute("SELECT 1 FROM pragma_module_list WHERE name = 'fts5'")
+        return cursor.fetchone() is not None
+
+
+def install(conn, rebuild=True):
+    """Create the search index for the connection's backend (idempotent)"""
+    _backends.pop((conn.alias, conn.settings_dict['NAME']), None)
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif conn.vendor == 'sqlite' and sqlite_has_fts5(conn):
+            cursor.execute(SQLITE_TABLE)
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            if rebuild:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall(conn):
+    _backends.pop((conn.alias, conn.settings_dict['NAME']), None)
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            statements = POSTGRES_UNINSTALL
+        elif conn.vendor == 'sqlite':
+            statements = SQLITE_UNINSTALL
+        else:
+            statements = []
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def ensure_sqlite_triggers(conn):
+    """
+    Reinstall the FTS5 triggers if a table rebuild dropped them.
+
+    SQLite migrations that alter ``tasks_task`` recreate the table, which drops
+    its triggers; this runs after every ``migrate`` and rebuilds the shadow
+    table only when something was actually missing.
+    """
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+        )
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s AND name LIKE %s",
+            [TASK_TABLE, f'{FTS_TABLE}_%'],
+        )
+        if cursor.fetchone()[0] < len(SQLITE_TRIGGERS):
+            install(conn, rebuild=True)
+
+
+@contextmanager
+def deferred_insert_index(conn):
+    """
+    Suspend the FTS5 insert trigger for a bulk load.
+
+    Indexing one row per trigger firing costs several times the insert itself;
+    one ``INSERT ... SELECT`` per batch is far cheaper. Yields
+    ``index(first_id, last_id)`` to call after each batch. Must run inside a
+    transaction: SQLite has a single writer, so no other rows land in the id
+    range, and the trigger's DROP and CREATE commit or roll back with the load.
+    Elsewhere the yielded function does nothing.
+    """
+    if conn.vendor != 'sqlite' or search_backend(conn) != 'sqlite':
+        yield lambda first_id, last_id: None
+        return
+    if not conn.in_atomic_block:
+        raise RuntimeError('deferred_insert_index() must be used inside a transaction')
+
+    def index(first_id, last_id):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, description, tags) "
+                f"SELECT id, title, description, tags FROM {TASK_TABLE} WHERE id BETWEEN %s AND %s",
+                [first_id, last_id],
+            )
+
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai")
+    try:
+        yield index
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute(SQLITE_TRIGGERS[0])
+
+
+def search_backend(conn=None):
+    """Name of the search implementation available on the connection, looked up once per database"""
+    conn = conn or connection
+    key = (conn.alias, conn.settings_dict['NAME'])
+    if key not in _backends:
+        _backends[key] = detect_search_backend(conn)
+    return _backends[key]
+
+
+def detect_search_backend(conn):
+    if conn.vendor == 'postgresql':
+        return 'postgresql'
+    if conn.vendor == 'sqlite':
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+            if cursor.fetchone()[0]:
+                return 'sqlite'
+    return 'fallback'
+
+
+def parse_terms(query):
+    return _TOKEN_RE.findall(query.lower())[:16]
+
+
+def search_tasks(queryset, query, highlight=True):
+    """
+    Filter a task queryset to matches for ``query`` with prefix matching.
+
+    Rows are annotated with ``search_rank`` (higher is better) and, when
+    ``highlight`` is set, ``search_highlight`` holding the title with matches
+    wrapped in <mark> tags.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset.none()
+
+    backend = search_backend()
+    table = connection.ops.quote_name(TASK_TABLE)
+
+    if backend == 'postgresql':
+        tsquery = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+        prefix_query = ' & '.join(f'{term}:*' for term in terms)
+        queryset = queryset.filter(
+            RawSQL(f"{table}.search_vector @@ {tsquery}", [prefix_query], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank_cd({table}.search_vector, {tsquery})", [prefix_query], output_field=FloatField()
+            )
+        )
+        if highlight:
+            queryset = queryset.annotate(
+                search_highlight=RawSQL(
+                    f"ts_headline('{SEARCH_CONFIG}', {table}.title, {tsquery}, %s)",
+                    [prefix_query, f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, HighlightAll=true'],
+                    output_field=TextField(),
+                )
+            )
+        return queryset
+
+    if backend == 'sqlite':
+        # Join the FTS table so MATCH drives the scan and bm25()/highlight()
+        # run once per matched row instead of in a correlated subquery. The
+        # unary + stops the planner from starting at the user_id index and
+        # probing MATCH per task instead, which made the pagination COUNT
+        # take seconds for users with thousands of tasks.
+        match = ' '.join(f'"{term}"*' for term in terms)
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{table}.id = +{FTS_TABLE}.rowid", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        )
+        # Annotations rather than extra(select=...) so cursor pagination can
+        # filter on search_rank
+        queryset = queryset.annotate(
+            search_rank=RawSQL(f"-bm25({FTS_TABLE}, 10.0, 4.0, 2.0)", [], output_field=FloatField())
+        )
+        if highlight:
+            queryset = queryset.annotate(
+                search_highlight=RawSQL(
+                    f"highlight({FTS_TABLE}, 0, %s, %s)", [HIGHLIGHT_START, HIGHLIGHT_STOP], output_field=TextField()
+                )
+            )
+        return queryset
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description__icontains=term) | Q(tags__icontains=term)
+    queryset = queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+    if highlight:
+        queryset = queryset.annotate(search_highlight=Value(None, output_field=TextField()))
+    return queryset
+
+
+class TaskSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over title, description and tags.
+
+    Reads ``?q=`` (``?search=`` is kept as an alias for older clients). Results
+    are ordered by relevance unless the request sets ``ordering`` explicitly,
+    so this backend must come after OrderingFilter in ``filter_backends``.
+    """
+    search_param = 'q'
+    legacy_search_param = 'search'
+
+    def get_search_query(self, request):
+        return (
+            request.query_params.get(self.search_param)
+            or request.query_params.get(self.legacy_search_param)
+            or ''
+        ).strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+        if not parse_terms(query):
+            return queryset.none()
+        queryset = search_tasks(queryset, query)
+        if 'ordering' not in request.query_params:
+            queryset = queryset.order_by('-search_rank', '-id')
+        return queryset
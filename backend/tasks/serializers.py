@@ -1,10 +1,58 @@
 from rest_framework import serializers
-from .models import Category, Task, SubTask, TaskComment, DayPlanner
+from .models import Category, Task, SubTask, TaskComment, DayPlanner, Tag, TaskOccurrence
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
+from .cache import category_counts
+from .versions import request_data_version
+from .pagination import encode_cursor
 
 User = get_user_model()
 
+class SparseFieldsMixin:
+    """
+    Render only what the request asks for with ``?fields=`` and ``?expand=``.
+    
+    ``?fields=id,title`` limits the top-level fields (``id`` is always kept).
+    Nested collections in ``Meta.expandable`` ({name: fields it renders}) are
+    rendered by default; ``?expand=subtasks`` keeps only the named ones and
+    ``?expand=`` drops them all. Views call selected_fields() too, so they can skip the joins,
+    annotations and prefetches of fields that won't be rendered.
+    """
+    fields_param = 'fields'
+    expand_param = 'expand'
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None:
+            selected = self.selected_fields(request)
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+    
+    @classmethod
+    def _param_names(cls, request, param, allowed):
+        names = {name.strip() for name in request.query_params.get(param, '').split(',')} - {''}
+        unknown = names - set(allowed)
+        if unknown:
+            raise serializers.ValidationError({param: f"Unknown field(s): {', '.join(sorted(unknown))}"})
+        return names
+    
+    @classmethod
+    def selected_fields(cls, request):
+        """Names of the fields rendered for ``request``"""
+        names = set(cls.Meta.fields)
+        expandable = getattr(cls.Meta, 'expandable', {})
+        params = getattr(request, 'query_params', {})
+        if cls.fields_param in params:
+            names = cls._param_names(request, cls.fields_param, cls.Meta.fields) | {'id'}
+        if cls.expand_param in params:
+            expand = cls._param_names(request, cls.expand_param, expandable)
+            for name, fields in expandable.items():
+                if name not in expand:
+                    names.difference_update(fields)
+        return names
+
 class CategorySerializer(serializers.ModelSerializer):
     task_count = serializers.SerializerMethodField()
     
@@ -14,10 +62,19 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_task_count(self, obj):
-        user = self.context['request'].user if 'request' in self.context else None
-        if user:
-            return obj.task_set.filter(user=user).count()
-        return 0
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return 0
+        # One cached grouped aggregate per request instead of a COUNT per category
+        if 'category_counts' not in self.context:
+            self.context['category_counts'] = category_counts(request.user.id, request_data_version(request))
+        return self.context['category_counts'].get(obj.id, 0)
+
+class TagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ['id', 'name', 'task_count']
+        read_only_fields = fields
 
 class SubTaskSerializer(serializers.ModelSerializer):
     class Meta:
@@ -33,7 +90,16 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'content', 'user', 'user_name', 'created_at']
         read_only_fields = ['id', 'user', 'created_at']
 
-class TaskListSerializer(serializers.ModelSerializer):
+class SubTaskChangeSerializer(SubTaskSerializer):
+    """Subtask row in the delta-sync feed; carries its parent so replicas can place it"""
+    class Meta(SubTaskSerializer.Meta):
+        fields = SubTaskSerializer.Meta.fields + ['parent_task', 'updated_at']
+
+class TaskCommentChangeSerializer(TaskCommentSerializer):
+    class Meta(TaskCommentSerializer.Meta):
+        fields = TaskCommentSerializer.Meta.fields + ['task']
+
+class TaskListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for task lists"""
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_color = serializers.CharField(source='category.color', read_only=True)
@@ -48,20 +114,45 @@ class TaskListSerializer(serializers.ModelSerializer):
             'is_overdue', 'subtask_count', 'completion_percentage', 'tags'
         ]
     
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Present only on results of a ?q= search
+        if hasattr(instance, 'search_rank'):
+            data['search_rank'] = instance.search_rank
+            data['search_highlight'] = getattr(instance, 'search_highlight', None)
+        # Virtual occurrences of a recurring task (tasks.recurrence); id is the series id
+        if hasattr(instance, 'occurrence_date'):
+            data['occurrence_date'] = instance.occurrence_date.isoformat()
+        return data
+    
+    def _subtask_counts(self, obj):
+        # Querysets built with Task.objects.for_list() carry the counts as annotations
+        if hasattr(obj, 'subtask_total'):
+            return obj.subtask_total, obj.subtask_completed
+        return obj.subtasks.count(), obj.subtasks.filter(is_completed=True).count()
+    
     def get_subtask_count(self, obj):
-        return obj.subtasks.count()
+        return self._subtask_counts(obj)[0]
     
     def get_completion_percentage(self, obj):
-        subtasks = obj.subtasks.all()
-        if not subtasks:
+        total, completed = self._subtask_counts(obj)
+        if not total:
             return 100 if obj.is_completed else 0
-        completed = subtasks.filter(is_completed=True).count()
-        return int((completed / subtasks.count()) * 100)
+        return int((completed / total) * 100)
 
-class TaskDetailSerializer(serializers.ModelSerializer):
-    """Detailed serializer for individual tasks"""
+class TaskDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Detailed serializer for individual tasks.
+    
+    Only the newest INLINE_COMMENT_LIMIT comments are embedded; ``comments_next``
+    links to the cursor-paginated comment list for the rest.
+    """
+    INLINE_COMMENT_LIMIT = 20
+    
     subtasks = SubTaskSerializer(many=True, read_only=True)
-    comments = TaskCommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
+    comments_next = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
     user_name = serializers.CharField(source='user.full_name', read_only=True)
     
@@ -71,26 +162,96 @@ class TaskDetailSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'user', 'user_name', 'category', 'category_name',
             'priority', 'status', 'due_date', 'reminder_date', 'created_at', 'updated_at',
             'completed_at', 'estimated_duration', 'actual_duration', 'tags',
-            'is_recurring', 'recurring_pattern', 'is_completed', 'is_overdue',
-            'subtasks', 'comments'
+            'is_recurring', 'recurring_pattern', 'recurrence_interval', 'recurrence_weekdays',
+            'recurrence_end', 'is_completed', 'is_overdue',
+            'subtasks', 'comments', 'comment_count', 'comments_next'
         ]
+        expandable = {'subtasks': ['subtasks'], 'comments': ['comments', 'comments_next']}
         read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'completed_at', 'is_completed', 'is_overdue']
+    
+    def _recent_comments(self, obj):
+        # Prefetched by TaskDetailView as a sliced Prefetch(to_attr='recent_comments')
+        if not hasattr(obj, 'recent_comments'):
+            obj.recent_comments = list(
+                obj.comments.select_related('user').order_by('-created_at', '-id')[:self.INLINE_COMMENT_LIMIT]
+            )
+        return obj.recent_comments
+    
+    def get_comments(self, obj):
+        return TaskCommentSerializer(self._recent_comments(obj), many=True, context=self.context).data
+    
+    def get_comment_count(self, obj):
+        if hasattr(obj, 'comment_total'):
+            return obj.comment_total
+        return obj.comments.count()
+    
+    def get_comments_next(self, obj):
+        recent = self._recent_comments(obj)
+        if self.get_comment_count(obj) <= len(recent):
+            return None
+        last = recent[-1]
+        url = reverse('comment_list_create', kwargs={'task_id': obj.pk})
+        url = f"{url}?cursor={encode_cursor(last.created_at.isoformat(), last.pk)}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+class CachedCategoryField(serializers.PrimaryKeyRelatedField):
+    """Resolves categories from context['category_cache'] when a batch preloaded them"""
+    
+    def to_internal_value(self, data):
+        categories = self.context.get('category_cache')
+        if categories is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return categories[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
 
 class TaskCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating tasks"""
+    category = CachedCategoryField(queryset=Category.objects.all(), required=False, allow_null=True)
     
     class Meta:
         model = Task
         fields = [
             'title', 'description', 'category', 'priority', 'status',
             'due_date', 'reminder_date', 'estimated_duration', 'tags',
-            'is_recurring', 'recurring_pattern'
+            'is_recurring', 'recurring_pattern', 'recurrence_interval',
+            'recurrence_weekdays', 'recurrence_end'
         ]
     
     def validate_due_date(self, value):
         if value and value < timezone.now():
             raise serializers.ValidationError("Due date cannot be in the past")
         return value
+    
+    def validate_recurrence_interval(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Interval must be at least 1")
+        return value
+    
+    def validate_recurrence_weekdays(self, value):
+        if not isinstance(value, list) or any(not isinstance(day, int) or isinstance(day, bool) or not 0 <= day <= 6 for day in value):
+            raise serializers.ValidationError("Weekdays must be a list of integers from 0 (Monday) to 6 (Sunday)")
+        return sorted(set(value))
+    
+    def validate(self, attrs):
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None)
+        if current('is_recurring') and current('recurring_pattern') and not current('due_date'):
+            raise serializers.ValidationError({'due_date': 'Recurring tasks need a due date for their first occurrence'})
+        return attrs
+    
+    def update(self, instance, validated_data):
+        if 'reminder_date' in validated_data and validated_data['reminder_date'] != instance.reminder_date:
+            instance.reminder_sent_at = None  # Rescheduled; run_reminders fires it again
+        return super().update(instance, validated_data)
 
 class SubTaskCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -121,9 +282,14 @@ class DayPlannerSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
     
     def get_completed_tasks_count(self, obj):
+        # Annotated by DayPlanner.objects.with_task_counts()
+        if hasattr(obj, 'planned_completed'):
+            return obj.planned_completed
         return obj.tasks.filter(status='completed').count()
     
     def get_total_tasks_count(self, obj):
+        if hasattr(obj, 'planned_total'):
+            return obj.planned_total
         return obj.tasks.count()
     
     def create(self, validated_data):
@@ -148,6 +314,9 @@ class DayPlannerSerializer(serializers.ModelSerializer):
             user = self.context['request'].user
             tasks = Task.objects.filter(id__in=task_ids, user=user)
             instance.tasks.set(tasks)
+            # Drop the counts annotated at fetch time so they are recomputed
+            instance.__dict__.pop('planned_total', None)
+            instance.__dict__.pop('planned_completed', None)
         
         return instance
 
@@ -162,7 +331,7 @@ class TaskStatsSerializer(serializers.Serializer):
     tasks_by_category = serializers.DictField()
     recent_activity = serializers.ListField()
 
-class CalendarTaskSerializer(serializers.ModelSerializer):
+class CalendarTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for calendar view"""
     
     class Meta:
@@ -171,3 +340,22 @@ class CalendarTaskSerializer(serializers.ModelSerializer):
             'id', 'title', 'priority', 'status', 'due_date', 'category',
             'is_completed', 'is_overdue'
         ]
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'occurrence_date'):
+            data['occurrence_date'] = instance.occurrence_date.isoformat()
+        return data
+
+class TaskOccurrenceSerializer(serializers.ModelSerializer):
+    """Override for one occurrence of a recurring task"""
+    
+    class Meta:
+        model = TaskOccurrence
+        fields = ['original_date', 'status', 'due_date', 'completed_at', 'updated_at']
+        read_only_fields = ['original_date', 'completed_at', 'updated_at']
+    
+    def update(self, instance, validated_data):
+        if 'status' in validated_data and validated_data['status'] != instance.status:
+            instance.completed_at = timezone.now() if validated_data['status'] == 'completed' else None
+        return super().update(instance, validated_data)
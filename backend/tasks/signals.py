@@ -0,0 +1,83 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Category, DayPlanner, SubTask, Task, TaskComment, TaskOccurrence
+from .tagging import release_task_tags, sync_task_tags
+from .versions import bump_data_version, deleting_user
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is None or 'tags' in update_fields:
+        sync_task_tags([instance])
+    loaded = getattr(instance, '_loaded_owner', {})
+    bump_data_version(instance.user_id, loaded.get('user_id'))
+    instance._loaded_owner = {'user_id': instance.user_id}
+
+
+@receiver(pre_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    release_task_tags([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def task_removed(sender, instance, origin=None, **kwargs):
+    if not deleting_user(origin):
+        bump_data_version(instance.user_id)
+
+
+@receiver(post_save, sender=SubTask)
+@receiver(post_delete, sender=SubTask)
+def subtask_changed(sender, instance, origin=None, **kwargs):
+    if not deleting_user(origin):
+        bump_data_version(instance.parent_task.user_id)
+
+
+@receiver(post_save, sender=TaskComment)
+@receiver(post_delete, sender=TaskComment)
+def comment_changed(sender, instance, origin=None, **kwargs):
+    if not deleting_user(origin):
+        bump_data_version(instance.task.user_id)
+
+
+@receiver(post_save, sender=TaskOccurrence)
+@receiver(post_delete, sender=TaskOccurrence)
+def occurrence_changed(sender, instance, origin=None, **kwargs):
+    if not deleting_user(origin):
+        bump_data_version(instance.task.user_id)
+
+
+@receiver(post_save, sender=DayPlanner)
+@receiver(post_delete, sender=DayPlanner)
+def day_plan_changed(sender, instance, origin=None, **kwargs):
+    if not deleting_user(origin):
+        bump_data_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=DayPlanner.tasks.through)
+def day_plan_tasks_changed(sender, instance, action, **kwargs):
+    # instance is the DayPlanner, or the Task when changed via task.planned_days
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_data_version(instance.user_id)
+
+
+def category_users(category):
+    return set(Task.objects.filter(category=category).order_by().values_list('user_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    # Categories are shared, and task responses embed their name and color
+    if not created:
+        bump_data_version(*category_users(instance))
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    # Read before SET_NULL detaches the tasks, which sends no task signals
+    instance._task_users = category_users(instance)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    bump_data_version(*getattr(instance, '_task_users', ()))
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import OPEN_STATUSES, Category, TaskStatus
+
+
+def stats_queries(tasks, now):
+    """(unordered tasks, totals aggregate kwargs, breakdown queryset, recent-activity queryset) for compute_task_stats"""
+    tasks = tasks.order_by()
+    totals = dict(
+        total_tasks=Count('id'),
+        completed_tasks=Count('id', filter=Q(status=TaskStatus.COMPLETED)),
+        pending_tasks=Count('id', filter=Q(status__in=OPEN_STATUSES)),
+        overdue_tasks=Count('id', filter=Q(status__in=OPEN_STATUSES, due_date__lt=now)),
+    )
+    breakdown = tasks.values_list('priority', 'category_id').annotate(count=Count('id'))
+    recent = tasks.filter(updated_at__gte=now - timedelta(days=7)).order_by('-updated_at')[:10].values(
+        'id', 'title', 'status', 'updated_at'
+    )
+    return tasks, totals, breakdown, recent
+
+
+def category_ids(breakdown):
+    return {category_id for _, category_id, _ in breakdown if category_id is not None}
+
+
+def build_stats(totals, breakdown, category_names, recent_activity):
+    tasks_by_priority = {}
+    tasks_by_category = {}
+    for priority, category_id, count in breakdown:
+        tasks_by_priority[priority] = tasks_by_priority.get(priority, 0) + count
+        if category_id in category_names:
+            name = category_names[category_id]
+            tasks_by_category[name] = tasks_by_category.get(name, 0) + count
+
+    total = totals['total_tasks']
+    completion_rate = (totals['completed_tasks'] / total * 100) if total > 0 else 0
+    return {
+        **totals,
+        'completion_rate': round(completion_rate, 2),
+        'tasks_by_priority': tasks_by_priority,
+        'tasks_by_category': tasks_by_category,
+        'recent_activity': recent_activity,
+    }
+
+
+def compute_task_stats(tasks, now=None):
+    """
+    Build the TaskStatsSerializer payload for a task queryset.
+
+    One conditional aggregate computes the counters and one GROUP BY
+    (priority, category_id) feeds both breakdowns. Category names come from a
+    primary-key lookup on the small category table, which is cheaper than
+    joining it into the grouped scan. The last query is the recent-activity slice.
+    """
+    tasks, totals, breakdown, recent = stats_queries(tasks, now or timezone.now())
+    totals = tasks.aggregate(**totals)
+    breakdown = list(breakdown)
+    ids = category_ids(breakdown)
+    names = dict(Category.objects.filter(id__in=ids).values_list('id', 'name')) if ids else {}
+    return build_stats(totals, breakdown, names, list(recent))
+
+
+async def acompute_task_stats(tasks, now=None):
+    """compute_task_stats() for async views"""
+    tasks, totals, breakdown, recent = stats_queries(tasks, now or timezone.now())
+    totals = await tasks.aaggregate(**totals)
+    breakdown = [row async for row in breakdown]
+    ids = category_ids(breakdown)
+    names = {}
+    if ids:
+        names = {category_id: name async for category_id, name in Category.objects.filter(id__in=ids).values_list('id', 'name')}
+    return build_stats(totals, breakdown, names, [row async for row in recent])
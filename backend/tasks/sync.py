@@ -0,0 +1,106 @@
+"""
+Delta sync for ``GET /api/tasks/changes/``.
+
+A sync token is an opaque, base64-encoded timestamp. Changes are read with
+range scans on (user, updated_at) for tasks, updated_at for subtasks,
+created_at for comments and (user, deleted_at) for the SyncTombstone log.
+Each response covers a window [since, until). When one kind has more than
+CHANGES_LIMIT rows pending, ``until`` is pulled back so the response stays
+bounded and ``has_more`` tells the client to call again with the new token.
+Once a client has caught up, its next window starts SYNC_OVERLAP early to
+catch writes that committed late; clients apply rows as upserts, so the
+duplicates are harmless. Pages of a backlog don't overlap, so paging through
+a burst of writes can't return the same rows over and over.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import SubTask, SyncTombstone, Task, TaskComment
+
+CHANGES_LIMIT = 500
+SYNC_OVERLAP = timedelta(seconds=2)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class SyncTokenExpired(Exception):
+    """The token predates the tombstone retention window; the client must resync"""
+
+
+def encode_token(moment, caught_up=True):
+    payload = json.dumps({'t': moment.isoformat(), 'o': int(caught_up)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_token(token, now=None):
+    """
+    Return the lower bound to read from for ``token``, overlap included.
+
+    Raises ValueError for a malformed token and SyncTokenExpired for one older
+    than the tombstone retention.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        moment = parse_datetime(payload['t'])
+        caught_up = bool(payload.get('o', 1))
+    except (TypeError, ValueError, KeyError, AttributeError, UnicodeEncodeError, binascii.Error) as exc:
+        raise ValueError('Invalid sync token') from exc
+    if moment is None or timezone.is_naive(moment):
+        raise ValueError('Invalid sync token')
+    if moment < (now or timezone.now()) - TOMBSTONE_RETENTION:
+        raise SyncTokenExpired()
+    return moment - SYNC_OVERLAP if caught_up else moment
+
+
+def record_deletions(kind, rows, deleted_at=None):
+    """Log (object_id, user_id) pairs of deleted rows for delta sync"""
+    deleted_at = deleted_at or timezone.now()
+    SyncTombstone.objects.bulk_create(
+        [SyncTombstone(user_id=user_id, kind=kind, object_id=object_id, deleted_at=deleted_at) for object_id, user_id in rows],
+        batch_size=1000,
+    )
+
+
+def change_sources(user):
+    """{name: (queryset, timestamp field)} for everything a replica mirrors"""
+    return {
+        'tasks': (Task.objects.filter(user=user), 'updated_at'),
+        'subtasks': (SubTask.objects.filter(parent_task__user=user, parent_task__deleted_at__isnull=True), 'updated_at'),
+        'comments': (TaskComment.objects.filter(task__user=user, task__deleted_at__isnull=True), 'created_at'),
+        'deleted': (SyncTombstone.objects.filter(user=user), 'deleted_at'),
+    }
+
+
+def collect_changes(user, since=None, now=None):
+    """
+    Return ({name: queryset}, until, has_more) for the rows changed since ``since``.
+
+    ``since=None`` is an initial sync: every live row, no tombstones. ``until``
+    becomes the next sync token.
+    """
+    until = now or timezone.now()
+    has_more = False
+    sources = change_sources(user)
+    if since is None:
+        sources.pop('deleted')
+
+    # Shrink the window so no kind returns more than CHANGES_LIMIT new rows
+    for queryset, field in sources.values():
+        pending = queryset if since is None else queryset.filter(**{f'{field}__gte': since})
+        cutoff = pending.order_by(field).values_list(field, flat=True)[CHANGES_LIMIT:CHANGES_LIMIT + 1]
+        cutoff = next(iter(cutoff), None)
+        if cutoff is not None and cutoff < until:
+            # Rows sharing one timestamp can't be split; take them all rather than stall
+            until = cutoff if since is None or cutoff > since else cutoff + timedelta(microseconds=1)
+            has_more = True
+
+    changes = {}
+    for name, (queryset, field) in sources.items():
+        if since is not None:
+            queryset = queryset.filter(**{f'{field}__gte': since})
+        changes[name] = queryset.filter(**{f'{field}__lt': until}).order_by(field, 'pk')
+    return changes, until, has_more
@@ -0,0 +1,113 @@
+"""
+Keeps the normalized Tag/TaskTag tables and Tag.task_count in step with the
+free-form ``Task.tags`` JSON list that the API reads and writes.
+
+Single saves and deletes are handled by the signal receivers in
+``tasks.signals``. Code that bypasses signals (``bulk_create``, ``update()``)
+must call ``sync_task_tags`` / ``release_task_tags`` itself.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Tag, TaskTag
+
+MAX_TAG_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def normalize_tag(value):
+    return str(value).strip().lower()[:MAX_TAG_LENGTH]
+
+
+def normalize_tags(tags):
+    """Return the set of normalized tag names in a Task.tags payload"""
+    if isinstance(tags, str):
+        tags = [tags]
+    if not isinstance(tags, (list, tuple)):
+        return set()
+    return {
+        name for name in (normalize_tag(tag) for tag in tags if isinstance(tag, (str, int, float)))
+        if name
+    }
+
+
+def apply_count_deltas(deltas):
+    """Apply {tag_id: delta} to Tag.task_count with one UPDATE per distinct delta"""
+    by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        Tag.objects.filter(id__in=tag_ids).update(task_count=F('task_count') + delta)
+
+
+def ensure_tags(names_by_user):
+    """Create any missing Tag rows for {user_id: names}; returns {(user_id, name): tag_id}"""
+    Tag.objects.bulk_create(
+        [Tag(user_id=user_id, name=name) for user_id, names in names_by_user.items() for name in names],
+        ignore_conflicts=True,
+    )
+    tag_ids = {}
+    for user_id, names in names_by_user.items():
+        for tag_id, name in Tag.objects.filter(user_id=user_id, name__in=names).order_by().values_list('id', 'name'):
+            tag_ids[user_id, name] = tag_id
+    return tag_ids
+
+
+def sync_task_tags(tasks):
+    """Bring the TaskTag links of saved ``tasks`` in line with their ``tags``"""
+    tasks = [task for task in tasks if task.pk and 'tags' not in task.get_deferred_fields()]
+    if not tasks:
+        return
+    wanted = {task.pk: normalize_tags(task.tags) for task in tasks}
+    owners = {task.pk: task.user_id for task in tasks}
+
+    current = defaultdict(dict)
+    links = TaskTag.objects.filter(task_id__in=wanted).values_list('id', 'task_id', 'tag_id', 'tag__name')
+    for link_id, task_id, tag_id, name in links:
+        current[task_id][name] = (link_id, tag_id)
+
+    deltas = Counter()
+    stale_links = []
+    missing = defaultdict(set)
+    for task_id, names in wanted.items():
+        for name, (link_id, tag_id) in current[task_id].items():
+            if name not in names:
+                stale_links.append(link_id)
+                deltas[tag_id] -= 1
+        for name in names - current[task_id].keys():
+            missing[task_id].add(name)
+
+    if not stale_links and not missing:
+        return
+
+    with transaction.atomic():
+        if stale_links:
+            TaskTag.objects.filter(id__in=stale_links).delete()
+        if missing:
+            names_by_user = defaultdict(set)
+            for task_id, names in missing.items():
+                names_by_user[owners[task_id]] |= names
+            tag_ids = ensure_tags(names_by_user)
+            new_links = []
+            for task_id, names in missing.items():
+                for name in names:
+                    tag_id = tag_ids[owners[task_id], name]
+                    new_links.append(TaskTag(task_id=task_id, tag_id=tag_id))
+                    deltas[tag_id] += 1
+            TaskTag.objects.bulk_create(new_links)
+        apply_count_deltas(deltas)
+
+
+def release_task_tags(task_ids):
+    """Drop the tag links of tasks that are going away and decrement counters"""
+    links = TaskTag.objects.filter(task_id__in=task_ids)
+    deltas = Counter()
+    for tag_id in links.values_list('tag_id', flat=True):
+        deltas[tag_id] -= 1
+    if not deltas:
+        return
+    with transaction.atomic():
+        links.delete()
+        apply_count_deltas(deltas)
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import Category, SubTask, Task
+
+User = get_user_model()
+
+
+class TaskAPITestCase(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user(email='owner@example.com', username='owner', password='pw')
+        self.other = User.objects.create_user(email='other@example.com', username='other', password='pw')
+        self.category = Category.objects.create(name='Work', color='#3B82F6')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_tasks(self, count, user=None, **fields):
+        """``count`` tasks due over the next hours, each with three subtasks (one completed)"""
+        now = timezone.now()
+        tasks = []
+        for i in range(count):
+            task = Task.objects.create(**{
+                'user': user or self.user,
+                'title': f'task {i}',
+                'category': self.category,
+                'priority': ['low', 'medium', 'high', 'urgent'][i % 4],
+                'due_date': now + timedelta(hours=i + 1),
+                'tags': ['work'],
+                **fields,
+            })
+            for j in range(3):
+                SubTask.objects.create(parent_task=task, title=f'step {j}', is_completed=j == 0)
+            tasks.append(task)
+        return tasks
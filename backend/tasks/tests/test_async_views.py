@@ -0,0 +1,92 @@
+import importlib
+from contextlib import contextmanager
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.test import AsyncClient, override_settings
+from django.urls import clear_url_caches, resolve
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+from .base import TaskAPITestCase
+
+URLS = [
+    '/api/tasks/stats/', '/api/tasks/stats/?period=week', '/api/tasks/calendar/',
+    '/api/tasks/today/', '/api/tasks/today/?fields=id,title', '/api/tasks/upcoming/',
+    '/api/analytics/overview/',
+]
+
+
+def reload_urls():
+    # The root urlconf last: its include()s cache the app patterns they load
+    for module in ('tasks.urls', 'analytics.urls', settings.ROOT_URLCONF):
+        importlib.reload(importlib.import_module(module))
+    clear_url_caches()
+
+
+@contextmanager
+def async_views():
+    """Route URLS as asgi.py does (settings.ASYNC_VIEWS)"""
+    try:
+        with override_settings(ASYNC_VIEWS=True):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
+class AsyncViewTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.make_tasks(5)
+        now = timezone.now()
+        daily = Task.objects.create(user=self.user, title='daily', is_recurring=True, recurring_pattern='daily')
+        Task.objects.filter(pk=daily.pk).update(due_date=now - timedelta(days=3))
+        Task.objects.create(user=self.user, title='done', status='completed', completed_at=now, due_date=now + timedelta(hours=2))
+
+    def test_routing(self):
+        for url in URLS:
+            with self.subTest(url=url):
+                self.assertFalse(iscoroutinefunction(resolve(url.split('?')[0]).func))
+                with async_views():
+                    self.assertTrue(iscoroutinefunction(resolve(url.split('?')[0]).func))
+
+    def test_sync_client(self):
+        for url in URLS:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get('/api/tasks/stats/').data['total_tasks'], 7)
+        self.assertTrue(any(task['title'] == 'daily' for task in self.client.get('/api/tasks/calendar/').json()))
+        self.assertEqual(self.client.post('/api/tasks/stats/').status_code, 405)
+
+    def test_unauthenticated(self):
+        client = self.client_class()
+        for url in URLS:
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, 401)
+
+    def test_async_client(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+        async def fetch_all():
+            client = AsyncClient()
+            responses = [(url, await client.get(url, headers=headers)) for url in URLS]
+            return responses, await AsyncClient().get('/api/tasks/today/')
+
+        expected = {url: self.client.get(url) for url in URLS}
+        for cache in caches.all():
+            cache.clear()  # So the async views render rather than hit the sync views' entries
+        with async_views():
+            responses, anonymous = async_to_sync(fetch_all)()
+            invalid = [self.client.get(url) for url in ('/api/tasks/stats/?since=soon', '/api/tasks/calendar/?start_date=x&end_date=y')]
+        for url, response in responses:
+            with self.subTest(url=url):
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected[url].json())
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertEqual([response.status_code for response in invalid], [400, 400])
@@ -0,0 +1,99 @@
+import io
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from ..benchmarks import endpoints_scenario, remote_database_host, seed_users
+from ..models import Category, SubTask, Task
+from .base import TaskAPITestCase, User
+
+
+class SeedDataTests(TaskAPITestCase):
+    def test_seeding_is_reproducible_and_kept(self):
+        first = seed_users(2, 20, seed=3)
+        self.assertTrue(all(user['created'] for user in first))
+        counts = {user['email']: Task.objects.filter(user__email=user['email']).count() for user in first}
+        titles = list(Task.objects.filter(user__email='seed-0@example.com').order_by('id').values_list('title', flat=True))
+
+        again = seed_users(2, 20, seed=3)
+        self.assertFalse(any(user['created'] for user in again))
+        self.assertEqual([user['tasks'] for user in again], [user['tasks'] for user in first])
+
+        User.objects.filter(email__startswith='seed-').delete()
+        seed_users(2, 20, seed=3)
+        self.assertEqual(
+            list(Task.objects.filter(user__email='seed-0@example.com').order_by('id').values_list('title', flat=True)),
+            titles,
+        )
+        for email, count in counts.items():
+            self.assertEqual(Task.objects.filter(user__email=email).count(), count)
+
+    def test_existing_users_report_their_own_tasks(self):
+        first = seed_users(1, 20, seed=3)
+        Task.objects.filter(user__email='seed-0@example.com').first().delete()
+        again = seed_users(1, 20, seed=3)
+        self.assertEqual(again[0]['tasks'], first[0]['tasks'] - 1)
+
+    def test_timestamps_are_kept(self):
+        seed_users(1, 30, seed=1)
+        hour_ago = timezone.now() - timedelta(hours=1)
+        self.assertTrue(Task.objects.filter(user__email='seed-0@example.com', created_at__lt=hour_ago).exists())
+        self.assertTrue(SubTask.objects.filter(parent_task__user__email='seed-0@example.com', created_at__lt=hour_ago).exists())
+
+    def test_fresh_database_gets_categories(self):
+        Category.objects.all().delete()
+        seed_users(1, 20)
+        self.assertTrue(Category.objects.exists())
+        self.assertTrue(Task.objects.filter(user__email='seed-0@example.com', category__isnull=False).exists())
+
+    def test_command_refuses_remote_databases(self):
+        remote = SimpleNamespace(vendor='postgresql', settings_dict={'HOST': 'db.example.com'})
+        with mock.patch('tasks.management.commands.seed_benchmark_data.connection', remote):
+            with self.assertRaisesMessage(CommandError, 'db.example.com'):
+                call_command('seed_benchmark_data', users=1, tasks=5, stdout=io.StringIO())
+            self.assertFalse(User.objects.filter(email__startswith='seed-').exists())
+            call_command('seed_benchmark_data', users=1, tasks=5, force=True, stdout=io.StringIO())
+        self.assertTrue(User.objects.filter(email__startswith='seed-').exists())
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('seed_benchmark_data', users=2, tasks=10, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(len(report['users']), 2)
+        self.assertEqual(Task.all_objects.filter(user__email__startswith='seed-').count(), report['tasks'])
+
+
+class BenchmarkCommandTests(TaskAPITestCase):
+    def test_remote_database_host(self):
+        for vendor, host, expected in [
+            ('sqlite', '', None),
+            ('postgresql', '', None),
+            ('postgresql', 'localhost', None),
+            ('postgresql', '127.0.0.1', None),
+            ('postgresql', 'db.example.com', 'db.example.com'),
+        ]:
+            with self.subTest(vendor=vendor, host=host):
+                conn = SimpleNamespace(vendor=vendor, settings_dict={'HOST': host})
+                self.assertEqual(remote_database_host(conn), expected)
+
+    def test_refuses_remote_databases(self):
+        remote = SimpleNamespace(vendor='postgresql', settings_dict={'HOST': 'db.example.com'})
+        with mock.patch('tasks.management.commands.benchmark.connection', remote):
+            with self.assertRaisesMessage(CommandError, 'db.example.com'):
+                call_command('benchmark', 'stats', tasks=[20], repeat=1, stdout=io.StringIO())
+            self.assertFalse(User.objects.filter(email__startswith='bench-').exists())
+            out = io.StringIO()
+            call_command('benchmark', 'stats', tasks=[20], repeat=1, force=True, stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['scenario'], 'stats')
+
+
+class EndpointBenchmarkTests(TaskAPITestCase):
+    def test_every_endpoint_succeeds(self):
+        results = endpoints_scenario([40], repeat=1)['sizes'][40]
+        self.assertEqual(results['not_covered'], [])
+        failed = {url: result['status'] for url, result in results['endpoints'].items() if result['status'] >= 400}
+        self.assertEqual(failed, {})
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Category, Tag, Task
+from .base import TaskAPITestCase
+
+
+class BulkTests(TaskAPITestCase):
+    url = '/api/tasks/bulk/'
+
+    def post(self, data):
+        return self.client.post(self.url, data, format='json')
+
+    def test_create_update_and_move(self):
+        tasks = self.make_tasks(2)
+        response = self.post({
+            'create': [{'title': 'new'}],
+            'update': [{'id': tasks[0].id, 'status': 'completed'}],
+            'move': {'task_ids': [tasks[0].id, tasks[1].id], 'priority': 'urgent'},
+        })
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((len(response.data['created']), response.data['moved_count']), (1, 2))
+        tasks[0].refresh_from_db()
+        self.assertEqual((tasks[0].status, tasks[0].priority), ('completed', 'urgent'))
+        self.assertIsNotNone(tasks[0].completed_at)
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        def queries(count):
+            existing = self.make_tasks(count)
+            items = [{'title': f'new {i}', 'category': self.category.id, 'tags': ['bulk']} for i in range(count)]
+            update = [{'id': task.id, 'title': 'renamed', 'tags': ['z']} for task in existing]
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(self.post({'create': items, 'update': update}).status_code, 201)
+            return len(context.captured_queries)
+
+        # Both sizes fit in one INSERT batch on SQLite
+        self.assertEqual(queries(5), queries(20))
+
+    def test_keeps_tag_and_category_counts(self):
+        existing = self.make_tasks(3)
+        home = Category.objects.create(name='Home')
+        self.client.get('/api/tasks/categories/')
+        items = [{'title': f'new {i}', 'category': self.category.id, 'tags': ['bulk']} for i in range(5)]
+        self.post({'create': items, 'update': [{'id': existing[0].id, 'tags': ['z']}]})
+        self.assertEqual(dict(Tag.objects.filter(user=self.user).values_list('name', 'task_count')), {'bulk': 5, 'z': 1, 'work': 2})
+        self.post({'move': {'task_ids': [task.id for task in existing], 'category': home.id}})
+        counts = {row['name']: row['task_count'] for row in self.client.get('/api/tasks/categories/').data['results']}
+        self.assertEqual((counts['Work'], counts['Home']), (5, 3))
+
+    def test_other_users_tasks_are_not_found(self):
+        theirs = Task.objects.create(user=self.other, title='theirs')
+        response = self.post({'update': [{'id': theirs.id, 'title': 'x'}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors']['update'][0]['errors'], {'id': ['Task not found']})
+        self.assertEqual(self.post({'move': {'task_ids': [theirs.id], 'priority': 'low'}}).data['moved_count'], 0)
+
+    def test_one_bad_item_writes_nothing(self):
+        task = self.make_tasks(1)[0]
+        response = self.post({'create': [{'title': 'new'}, {'priority': 'low'}], 'update': [{'id': task.id, 'title': 'x'}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors']['create'][0]['index'], 1)
+        self.assertFalse(Task.objects.filter(title='new').exists())
+        task.refresh_from_db()
+        self.assertEqual(task.title, 'task 0')
+
+    def test_request_shape(self):
+        self.assertEqual(self.post({}).status_code, 400)
+        self.assertEqual(self.post({'create': 'x'}).status_code, 400)
+        self.assertEqual(self.post({'create': [{'title': 'x'}] * 501}).status_code, 400)
+        self.assertEqual(self.post({'move': {'task_ids': [1]}}).status_code, 400)
+
+    def test_invalid_move_ids(self):
+        for task_ids in [['abc'], [], 'x', None, list(range(501))]:
+            with self.subTest(task_ids=task_ids):
+                response = self.post({'move': {'task_ids': task_ids, 'priority': 'low'}})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('task_ids', response.data['errors']['move'])
+        response = self.post({'move': {'priority': 'huge'}})
+        self.assertEqual(set(response.data['errors']['move']), {'task_ids', 'priority'})
+
+    def test_invalid_update_items(self):
+        task = self.make_tasks(1)[0]
+        for pk in [[task.id], 'abc', True, None]:
+            with self.subTest(pk=pk):
+                response = self.post({'update': [{'id': pk, 'title': 'x'}]})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['errors']['update'][0]['errors'], {'id': ['A valid integer is required.']})
+        task.refresh_from_db()
+        self.assertEqual(task.title, 'task 0')
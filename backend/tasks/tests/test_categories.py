@@ -0,0 +1,55 @@
+from ..cache import category_counts
+from ..models import Category, Task
+from ..versions import bump_data_version, data_version
+from .base import TaskAPITestCase
+
+
+class CategoryCountTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.home = Category.objects.create(name='Home')
+        for i in range(3):
+            Category.objects.create(name=f'Empty {i}')
+
+    def counts(self):
+        response = self.client.get('/api/tasks/categories/')
+        return {row['name']: row['task_count'] for row in response.data['results']}
+
+    def test_one_grouped_query_then_cache(self):
+        self.make_tasks(3)
+        self.make_tasks(2, user=self.other)
+        with self.assertNumQueries(4):
+            counts = self.counts()
+        self.assertEqual((counts['Work'], counts['Home'], counts['Empty 0']), (3, 0, 0))
+        with self.assertNumQueries(3):
+            self.counts()
+
+    def test_writes_refresh_the_counts(self):
+        task = self.make_tasks(3)[0]
+        self.counts()
+        self.client.patch(f'/api/tasks/{task.id}/', {'category': self.home.id}, format='json')
+        self.assertEqual((self.counts()['Work'], self.counts()['Home']), (2, 1))
+        Task.objects.get(pk=task.pk).delete()
+        self.assertEqual(self.counts()['Home'], 0)
+        self.client.post('/api/tasks/', {'title': 'new', 'category': self.home.id}, format='json')
+        self.assertEqual(self.client.get(f'/api/tasks/categories/{self.home.id}/').data['task_count'], 1)
+        ids = list(Task.objects.filter(user=self.user).values_list('id', flat=True))
+        self.client.post('/api/tasks/bulk/', {'move': {'task_ids': ids, 'category': self.home.id}}, format='json')
+        self.assertEqual((self.counts()['Work'], self.counts()['Home']), (0, 3))
+
+    def test_other_users_writes_keep_the_cache(self):
+        self.make_tasks(1)
+        self.counts()
+        self.make_tasks(1, user=self.other)
+        with self.assertNumQueries(3):
+            self.counts()
+
+    def test_entries_are_keyed_on_the_data_version(self):
+        self.make_tasks(2)
+        version = data_version(self.user.pk)
+        self.assertEqual(category_counts(self.user.pk, version), {self.category.pk: 2})
+        # A write no worker's cache saw, e.g. one made in another process
+        Task.objects.filter(user=self.user).update(category=self.home)
+        self.assertEqual(category_counts(self.user.pk, version), {self.category.pk: 2})
+        bump_data_version(self.user.pk)
+        self.assertEqual(category_counts(self.user.pk, data_version(self.user.pk)), {self.home.pk: 2})
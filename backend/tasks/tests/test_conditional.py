@@ -0,0 +1,74 @@
+from ..models import Category
+from ..versions import data_version
+from .base import TaskAPITestCase
+
+
+class ConditionalGetTests(TaskAPITestCase):
+    def test_matching_etag_is_answered_with_one_query(self):
+        self.make_tasks(3)
+        for url in ['/api/tasks/', '/api/tasks/today/', '/api/tasks/upcoming/', '/api/tasks/calendar/', '/api/tasks/stats/']:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_query_parameters_change_the_etag(self):
+        self.assertNotEqual(self.client.get('/api/tasks/')['ETag'], self.client.get('/api/tasks/?priority=low')['ETag'])
+
+    def test_writes_bump_the_version(self):
+        tasks = self.make_tasks(3)
+        writes = [
+            lambda: self.client.patch(f'/api/tasks/{tasks[0].id}/', {'title': 'renamed'}, format='json'),
+            lambda: self.client.patch(f'/api/tasks/subtasks/{tasks[0].subtasks.first().id}/', {'is_completed': True}, format='json'),
+            lambda: self.client.post(f'/api/tasks/{tasks[0].id}/comments/', {'content': 'hi'}, format='json'),
+            lambda: self.client.post('/api/tasks/day-planner/', {'date': '2025-01-01', 'task_ids': [tasks[0].id]}, format='json'),
+            lambda: self.client.post('/api/tasks/bulk-action/', {'task_ids': [tasks[1].id], 'action': 'mark_completed'}, format='json'),
+            lambda: self.client.post('/api/tasks/bulk/', {'create': [{'title': 'new'}]}, format='json'),
+            lambda: self.client.delete(f'/api/tasks/subtasks/{tasks[0].subtasks.first().id}/'),
+            lambda: self.client.delete(f'/api/tasks/{tasks[2].id}/'),
+            lambda: self.client.patch(f'/api/tasks/categories/{self.category.id}/', {'color': '#000000'}, format='json'),
+        ]
+        etag = self.client.get('/api/tasks/')['ETag']
+        for index, write in enumerate(writes):
+            with self.subTest(write=index):
+                version = data_version(self.user.pk)
+                self.assertLess(write().status_code, 300)
+                self.assertGreater(data_version(self.user.pk), version)
+                response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                etag = response['ETag']
+
+    def test_category_rename_refreshes_embedded_name(self):
+        self.make_tasks(2)
+        Category.objects.create(name='Unused')
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.client.patch(f'/api/tasks/categories/{self.category.id}/', {'name': 'Job'}, format='json')
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row['category_name'] for row in response.data['results']}, {'Job'})
+        # Users with no task in the category keep their version
+        version = data_version(self.other.pk)
+        self.client.patch(f'/api/tasks/categories/{self.category.id}/', {'name': 'Work'}, format='json')
+        self.assertEqual(data_version(self.other.pk), version)
+
+    def test_category_delete_refreshes_tasks(self):
+        self.make_tasks(2)
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.assertEqual(self.client.delete(f'/api/tasks/categories/{self.category.id}/').status_code, 204)
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row['category'] for row in response.data['results']}, {None})
+
+    def test_other_users_writes_keep_the_etag(self):
+        self.make_tasks(1)
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.make_tasks(1, user=self.other)
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_deleting_users(self):
+        self.make_tasks(1)
+        self.make_tasks(1, user=self.other)
+        self.other.delete()
+        self.user.delete()
@@ -0,0 +1,67 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from ..dates import day_range, local_today, month_range, user_timezone
+from ..models import Task
+from .base import TaskAPITestCase
+
+LA = ZoneInfo('America/Los_Angeles')
+# 21:00 on 14 January in Los Angeles, already 15 January in UTC
+NOW = datetime(2025, 1, 15, 5, tzinfo=dt_timezone.utc)
+
+
+class LocalDayTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user.timezone = 'America/Los_Angeles'
+        self.user.save()
+        patcher = mock.patch('django.utils.timezone.now', return_value=NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for title, due in [
+            ('yesterday', datetime(2025, 1, 13, 23, 30, tzinfo=LA)),
+            ('early', datetime(2025, 1, 14, 0, 30, tzinfo=LA)),
+            ('late', datetime(2025, 1, 14, 23, 30, tzinfo=LA)),
+            ('tomorrow', datetime(2025, 1, 15, 0, 30, tzinfo=LA)),
+            ('next week', datetime(2025, 1, 21, 23, 30, tzinfo=LA)),
+            ('too far', datetime(2025, 1, 22, 0, 30, tzinfo=LA)),
+        ]:
+            Task.objects.create(user=self.user, title=title, due_date=due)
+
+    def titles(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return {row['title'] for row in response.data}
+
+    def test_today_uses_the_local_day(self):
+        self.assertEqual(local_today(self.user), date(2025, 1, 14))
+        self.assertEqual(self.titles('/api/tasks/today/'), {'early', 'late'})
+
+    def test_upcoming_covers_today_and_the_next_seven_days(self):
+        self.assertEqual(self.titles('/api/tasks/upcoming/'), {'early', 'late', 'tomorrow', 'next week'})
+
+    def test_calendar_range(self):
+        self.assertEqual(self.titles('/api/tasks/calendar/', start_date='2025-01-14', end_date='2025-01-15'), {'early', 'late', 'tomorrow'})
+        self.assertEqual(len(self.titles('/api/tasks/calendar/')), 6)
+        response = self.client.get('/api/tasks/calendar/', {'start_date': 'x', 'end_date': 'y'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_utc_users_keep_utc_days(self):
+        self.user.timezone = 'UTC'
+        self.user.save()
+        self.assertEqual(self.titles('/api/tasks/today/'), {'late', 'tomorrow'})
+
+
+class DayRangeTests(TaskAPITestCase):
+    def test_ranges_follow_dst(self):
+        self.user.timezone = 'America/Los_Angeles'
+        start, end = (bound.astimezone(dt_timezone.utc) for bound in day_range(self.user, date(2025, 3, 9)))
+        self.assertEqual(start, datetime(2025, 3, 9, 8, tzinfo=dt_timezone.utc))
+        self.assertEqual(end - start, timedelta(hours=23))
+        start, end = month_range(self.user, date(2025, 2, 14))
+        self.assertEqual((start.date(), end.date()), (date(2025, 2, 1), date(2025, 3, 1)))
+
+    def test_unknown_timezone_falls_back_to_utc(self):
+        self.user.timezone = 'Mars/Olympus'
+        self.assertEqual(user_timezone(self.user), ZoneInfo('UTC'))
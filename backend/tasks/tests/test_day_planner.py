@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+from ..models import DayPlanner, Task
+from .base import TaskAPITestCase
+
+
+class DayPlannerTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = self.make_tasks(6)
+        Task.objects.filter(pk=self.tasks[0].pk).update(status='completed')
+        for i in range(30):
+            plan = DayPlanner.objects.create(user=self.user, date=date(2025, 1, 1) + timedelta(days=i))
+            plan.tasks.set(self.tasks[:i % 6 + 1])
+
+    def plans(self, **params):
+        response = self.client.get('/api/tasks/day-planner/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['date']: row for row in response.data}
+
+    def test_range_read_with_annotated_counts(self):
+        with self.assertNumQueries(2):
+            plans = self.plans(start='2025-01-01', end='2025-01-31')
+        self.assertEqual(len(plans), 30)
+        plan = plans['2025-01-06']
+        self.assertEqual((plan['total_tasks_count'], plan['completed_tasks_count']), (6, 1))
+        self.assertEqual(plan['tasks'][0]['subtask_count'], 3)
+
+    def test_deleted_tasks_leave_the_counts(self):
+        Task.objects.filter(pk=self.tasks[5].pk).soft_delete()
+        plan = self.plans(start='2025-01-06', end='2025-01-06')['2025-01-06']
+        self.assertEqual((plan['total_tasks_count'], len(plan['tasks'])), (5, 5))
+
+    def test_bad_ranges(self):
+        self.assertEqual(self.client.get('/api/tasks/day-planner/', {'start': '2025-01-01'}).status_code, 400)
+        response = self.client.get('/api/tasks/day-planner/', {'start': '2025-01-01', 'end': '2025-12-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_writes_return_counts(self):
+        response = self.client.post('/api/tasks/day-planner/', {'date': '2025-03-01', 'task_ids': [self.tasks[0].id]}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['total_tasks_count'], 1)
+        ids = [self.tasks[0].id, self.tasks[1].id]
+        response = self.client.patch(f"/api/tasks/day-planner/{response.data['id']}/", {'task_ids': ids}, format='json')
+        self.assertEqual((response.data['total_tasks_count'], len(response.data['tasks'])), (2, 2))
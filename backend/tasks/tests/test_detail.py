@@ -0,0 +1,47 @@
+from ..models import TaskComment
+from .base import TaskAPITestCase, User
+
+
+class TaskDetailTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_tasks(1)[0]
+        authors = [User.objects.create_user(email=f'c{i}@example.com', username=f'c{i}', password='pw') for i in range(5)]
+        for i in range(45):
+            TaskComment.objects.create(task=self.task, user=authors[i % 5], content=f'comment {i}')
+
+    def test_inline_comments_are_capped(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/tasks/{self.task.id}/')
+        self.assertEqual(response.data['comment_count'], 45)
+        self.assertEqual(len(response.data['comments']), 20)
+        self.assertEqual(response.data['comments'][0]['content'], 'comment 44')
+        self.assertEqual(len(response.data['subtasks']), 3)
+
+    def test_comments_next_pages_through_the_rest(self):
+        response = self.client.get(f'/api/tasks/{self.task.id}/')
+        seen = [comment['id'] for comment in response.data['comments']]
+        url = response.data['comments_next']
+        while url:
+            with self.assertNumQueries(1):
+                page = self.client.get(url)
+            seen += [comment['id'] for comment in page.data['results']]
+            url = page.data['next']
+        self.assertEqual(len(seen), 45)
+        self.assertEqual(len(set(seen)), 45)
+
+    def test_sub_resources(self):
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task.id}/comments/').data['count'], 45)
+        response = self.client.get(f'/api/tasks/{self.task.id}/subtasks/', {'cursor': ''})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_write_responses_use_the_detail_shape(self):
+        response = self.client.post(f'/api/tasks/{self.task.id}/complete/')
+        self.assertEqual(response.data['task']['status'], 'completed')
+        self.assertTrue(response.data['task']['comments_next'].startswith('http'))
+
+    def test_task_without_comments(self):
+        task = self.make_tasks(1)[0]
+        response = self.client.get(f'/api/tasks/{task.id}/')
+        self.assertEqual((response.data['comment_count'], response.data['comments_next']), (0, None))
+        self.assertEqual(self.client.patch(f'/api/tasks/{task.id}/', {'title': 'renamed'}, format='json').status_code, 200)
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import warnings
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task, TaskComment
+from .base import TaskAPITestCase
+
+
+class ExportTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.make_tasks(3, category=self.category)
+        first = Task.objects.filter(user=self.user).order_by('id').first()
+        TaskComment.objects.create(task=first, user=self.user, content='hello, "world"')
+        Task.objects.create(user=self.other, title='not mine')
+
+    def export(self, **params):
+        response = self.client.get('/api/tasks/export/', params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_nests_subtasks_and_comments(self):
+        response, body = self.export(format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="tasks.ndjson"')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(len(rows[0]['subtasks']), 3)
+        self.assertEqual(rows[0]['comments'][0]['content'], 'hello, "world"')
+        self.assertEqual(rows[0]['category'], 'Work')
+
+    def test_json_is_default(self):
+        for params in [{'format': 'json'}, {}]:
+            with self.subTest(params=params):
+                rows = json.loads(self.export(**params)[1])
+                self.assertEqual(len(rows), 3)
+                self.assertEqual(len(rows[1]['subtasks']), 3)
+
+    def test_empty_export(self):
+        Task.all_objects.filter(user=self.user).delete()
+        self.assertEqual(json.loads(self.export(format='json')[1]), [])
+        self.assertEqual(self.export(format='ndjson')[1], '')
+
+    def test_csv_parts(self):
+        response, body = self.export(format='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0][:2], ['id', 'title'])
+        self.assertIn('category', rows[0])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(list(csv.reader(io.StringIO(self.export(format='csv', part='comments')[1])))[1][3], 'hello, "world"')
+        self.assertEqual(len(list(csv.reader(io.StringIO(self.export(format='csv', part='subtasks')[1])))), 10)
+
+    def test_invalid_part_and_format(self):
+        self.assertEqual(self.client.get('/api/tasks/export/', {'format': 'csv', 'part': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/export/', {'format': 'xml'}).status_code, 404)
+
+    def test_queries_per_chunk(self):
+        self.make_tasks(20)
+        with CaptureQueriesContext(connection) as context:
+            self.export(format='ndjson')
+        # Tasks, subtasks and comments: one query each for a single chunk
+        self.assertEqual(sum('FROM "tasks_' in query['sql'] for query in context.captured_queries), 3)
+
+    def test_asgi_streams_an_async_iterator(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+        async def export():
+            response = await AsyncClient().get('/api/tasks/export/', {'format': 'ndjson'}, headers=headers)
+            return response, b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+        with warnings.catch_warnings():
+            # Django warns when it has to read a sync iterator whole to serve it over ASGI
+            warnings.filterwarnings('error', message='StreamingHttpResponse must consume synchronous iterators')
+            response, body = async_to_sync(export)()
+        self.assertTrue(response.is_async)
+        self.assertEqual(body, self.export(format='ndjson')[1])
+        self.assertEqual(len(body.splitlines()), 3)
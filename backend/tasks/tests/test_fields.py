@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import TaskComment
+from .base import TaskAPITestCase
+
+
+class SparseFieldsetTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_tasks(3)[0]
+        TaskComment.objects.create(task=self.task, user=self.user, content='hi')
+
+    def get(self, path, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, params)
+        return response, ' '.join(query['sql'] for query in context.captured_queries)
+
+    def test_list_selects_only_requested_columns(self):
+        response, sql = self.get('/api/tasks/', fields='title,due_date')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'due_date'})
+        for skipped in ['tasks_subtask', 'tasks_category', 'CASE', '"description"', '"tags"']:
+            self.assertNotIn(skipped, sql)
+
+    def test_default_shape_unchanged(self):
+        row = self.client.get('/api/tasks/').data['results'][0]
+        self.assertTrue({'subtask_count', 'completion_percentage', 'category_name', 'is_overdue'} <= set(row))
+
+    def test_ordering_and_other_endpoints(self):
+        self.assertEqual(self.client.get('/api/tasks/', {'fields': 'title', 'ordering': '-overdue'}).status_code, 200)
+        for path in ['/api/tasks/today/', '/api/tasks/upcoming/', '/api/tasks/calendar/']:
+            with self.subTest(path=path):
+                response = self.client.get(path, {'fields': 'title,is_overdue'})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(all(set(row) <= {'id', 'title', 'is_overdue', 'occurrence_date'} for row in response.data))
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/tasks/', {'fields': 'title,bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.data)
+
+    def test_detail_expand(self):
+        response, sql = self.get(f'/api/tasks/{self.task.id}/', expand='')
+        self.assertTrue({'subtasks', 'comments', 'comments_next'}.isdisjoint(response.data))
+        self.assertEqual(response.data['comment_count'], 1)
+        self.assertNotIn('FROM "tasks_subtask"', sql)
+        self.assertNotIn('FROM "tasks_taskcomment"', sql)
+
+        response, _ = self.get(f'/api/tasks/{self.task.id}/', expand='subtasks', fields='title,subtasks')
+        self.assertEqual(set(response.data), {'id', 'title', 'subtasks'})
+        self.assertEqual(len(response.data['subtasks']), 3)
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task.id}/', {'expand': 'nope'}).status_code, 400)
+        self.assertEqual(len(self.client.get(f'/api/tasks/{self.task.id}/').data['comments']), 1)
@@ -0,0 +1,151 @@
+import io
+import json
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..imports import SUBTASK_INSERT_COLUMNS, TASK_INSERT_COLUMNS
+from ..models import Category, SubTask, Tag, Task, TaskTag
+from ..search import search_tasks
+from .base import TaskAPITestCase
+
+
+class ImportTests(TaskAPITestCase):
+    def export(self, export_format):
+        response = self.client.get('/api/tasks/export/', {'format': export_format})
+        return b''.join(response.streaming_content)
+
+    def upload(self, name, data, **extra):
+        return self.client.post('/api/tasks/import/', {'file': SimpleUploadedFile(name, data), **extra}, format='multipart')
+
+    def test_ndjson_round_trip_and_row_errors(self):
+        self.make_tasks(3)
+        data = self.export('ndjson') + (
+            b'{"title": ""}\n'
+            b'not json\n'
+            b'{"title": "x", "priority": "huge", "due_date": "nope"}\n'
+            b'{"title": "old", "reminder_date": "2020-01-01", "status": "completed", "category": "work", "tags": ["Home", "x"]}\n'
+        )
+        response = self.upload('tasks.ndjson', data)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 4)
+        self.assertEqual(response.data['subtasks_created'], 9)
+        self.assertEqual(response.data['failed'], 3)
+        self.assertEqual([error['line'] for error in response.data['errors']], [4, 5, 6])
+        self.assertEqual(set(response.data['errors'][2]['errors']), {'priority', 'due_date'})
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 7)
+
+        old = Task.objects.get(title='old')
+        self.assertEqual(old.category, self.category)
+        self.assertIsNotNone(old.reminder_sent_at)  # Already due: not fired again
+        self.assertIsNotNone(old.completed_at)
+        self.assertTrue(TaskTag.objects.filter(task=old, tag__name='home').exists())
+        self.assertEqual(Tag.objects.get(user=self.user, name='work').task_count, 6)
+
+    def test_imported_tasks_are_searchable(self):
+        self.upload('tasks.ndjson', b'{"title": "quarterly report"}\n')
+        self.assertEqual(search_tasks(Task.objects.filter(user=self.user), 'quarterly').count(), 1)
+        self.assertEqual(len(self.client.get('/api/tasks/', {'search': 'quarterly'}).data['results']), 1)
+        # A normal create is still indexed afterwards
+        Task.objects.create(user=self.user, title='zebra')
+        self.assertEqual(search_tasks(Task.objects.filter(user=self.user), 'zebra').count(), 1)
+
+    def test_csv_round_trip(self):
+        self.make_tasks(2)
+        response = self.upload('tasks.csv', self.export('csv'))
+        self.assertEqual(response.data['created'], 2, response.data)
+        task = Task.objects.filter(user=self.user).order_by('-id').first()
+        self.assertEqual(task.tags, ['work'])
+        self.assertEqual(task.category, self.category)
+
+    def test_unreadable_files_are_rejected(self):
+        self.assertEqual(self.upload('tasks.csv', b'name\nfoo\n').status_code, 400)
+        self.assertEqual(self.upload('tasks.txt', b'x').status_code, 400)
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+
+    def test_unknown_categories_are_row_errors(self):
+        response = self.upload('tasks.txt', b'title,category\nA,New Cat\nB,WORK\n', format='csv')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'], [{'line': 2, 'errors': {'category': ['No category named "New Cat".']}}])
+        self.assertFalse(Category.objects.filter(name='New Cat').exists())
+        self.assertEqual(Task.objects.get(title='B').category, self.category)
+
+    def test_keeps_source_timestamps(self):
+        data = (
+            b'{"title": "old", "created_at": "2020-05-01T10:00:00Z", "status": "completed",'
+            b' "completed_at": "2020-05-02T10:00:00Z", "subtasks": [{"title": "s", "created_at": "2020-05-01T11:00:00Z"}]}\n'
+            b'{"title": "new"}\n'
+        )
+        self.upload('tasks.ndjson', data)
+        old = Task.objects.get(title='old')
+        self.assertEqual(old.created_at.isoformat(), '2020-05-01T10:00:00+00:00')
+        self.assertEqual(old.completed_at.isoformat(), '2020-05-02T10:00:00+00:00')
+        self.assertEqual(old.subtasks.get().created_at.isoformat(), '2020-05-01T11:00:00+00:00')
+        self.assertGreater(old.updated_at, old.created_at)
+        self.assertGreater(Task.objects.get(title='new').created_at, old.created_at)
+
+    def test_command_in_batches(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as stream:
+            for i in range(25):
+                stream.write(json.dumps({'title': f'c{i}', 'subtasks': [{'title': 's', 'is_completed': True}]}) + '\n')
+            stream.flush()
+            out = io.StringIO()
+            call_command('import_tasks', stream.name, user=self.user.email, batch_size=10, stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['created'], 25)
+        completed = SubTask.objects.filter(parent_task__user=self.user, is_completed=True)
+        self.assertEqual(completed.exclude(completed_at=None).count(), 25)
+
+    def test_rows_match_tasks_saved_through_the_orm(self):
+        row = {
+            'title': 'full', 'description': 'd', 'category': 'Work', 'priority': 'urgent', 'status': 'in_progress',
+            'due_date': '2030-01-02T03:04:05Z', 'reminder_date': '2030-01-01T00:00:00Z',
+            'estimated_duration': 30, 'actual_duration': 5, 'tags': ['a', 'b'], 'is_recurring': True,
+            'recurring_pattern': 'weekly', 'recurrence_interval': 2, 'recurrence_weekdays': [4, 0],
+            'recurrence_end': '2031-01-01T00:00:00Z',
+        }
+        self.upload('tasks.ndjson', json.dumps(row).encode())
+        imported = Task.objects.get(title='full')
+        saved = Task.objects.create(
+            user=self.user, title='full', description='d', category=self.category, priority='urgent',
+            status='in_progress', due_date=imported.due_date, reminder_date=imported.reminder_date,
+            estimated_duration=30, actual_duration=5, tags=['a', 'b'], is_recurring=True,
+            recurring_pattern='weekly', recurrence_interval=2, recurrence_weekdays=[0, 4],
+            recurrence_end=imported.recurrence_end,
+        )
+        skip = {'id', 'created_at', 'updated_at'}
+        fields = [field.attname for field in Task._meta.concrete_fields if field.attname not in skip]
+        self.assertEqual(
+            Task.objects.filter(pk=imported.pk).values(*fields).get(),
+            Task.objects.filter(pk=saved.pk).values(*fields).get(),
+        )
+
+    def test_inserts_stay_under_the_parameter_limit(self):
+        data = b''.join(json.dumps({'title': f't{i}', 'subtasks': [{'title': 's'}]}).encode() + b'\n' for i in range(120))
+        with CaptureQueriesContext(connection) as context:
+            response = self.upload('tasks.ndjson', data)
+        self.assertEqual(response.data['created'], 120)
+        inserts = [query['sql'] for query in context.captured_queries if query['sql'].startswith('INSERT INTO "tasks_task" ')]
+        max_params = connection.features.max_query_params
+        if max_params:
+            self.assertEqual(len(inserts), -(-120 * len(TASK_INSERT_COLUMNS) // max_params))
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 120)
+        self.assertEqual(SubTask.objects.filter(parent_task__user=self.user).count(), 120)
+
+
+class InsertColumnTests(SimpleTestCase):
+    """The raw INSERTs must write every column the database can't fill in itself"""
+
+    def test_columns_cover_the_models(self):
+        for model, columns in [(Task, TASK_INSERT_COLUMNS), (SubTask, SUBTASK_INSERT_COLUMNS)]:
+            with self.subTest(model=model.__name__):
+                concrete = {field.column for field in model._meta.concrete_fields}
+                self.assertLessEqual(set(columns), concrete)
+                required = {
+                    field.column for field in model._meta.concrete_fields
+                    if not field.null and not field.primary_key and not field.generated
+                }
+                self.assertEqual(required - set(columns), set())
@@ -0,0 +1,42 @@
+from datetime import date
+
+from ..models import DayPlanner
+from .base import TaskAPITestCase
+
+
+class ListQueryCountTests(TaskAPITestCase):
+    """List endpoints run a fixed number of queries, whatever the page holds"""
+
+    def assert_constant_queries(self, path, queries):
+        self.make_tasks(2)
+        with self.assertNumQueries(queries):
+            self.assertEqual(self.client.get(path).status_code, 200)
+        self.make_tasks(15)
+        with self.assertNumQueries(queries):
+            self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_task_list(self):
+        self.assert_constant_queries('/api/tasks/', 3)
+
+    def test_today(self):
+        self.assert_constant_queries('/api/tasks/today/', 3)
+
+    def test_upcoming(self):
+        self.assert_constant_queries('/api/tasks/upcoming/', 3)
+
+    def test_day_planner_list(self):
+        plan = DayPlanner.objects.create(user=self.user, date=date.today())
+        plan.tasks.set(self.make_tasks(3))
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/tasks/day-planner/')
+        nested = response.data['results'][0]['tasks']
+        self.assertEqual(len(nested), 3)
+        self.assertEqual(nested[0]['subtask_count'], 3)
+        plan.tasks.add(*self.make_tasks(10))
+        with self.assertNumQueries(3):
+            self.client.get('/api/tasks/day-planner/')
+
+    def test_subtask_counts_are_annotated(self):
+        self.make_tasks(1)
+        row = self.client.get('/api/tasks/').data['results'][0]
+        self.assertEqual((row['subtask_count'], row['completion_percentage']), (3, 33))
@@ -0,0 +1,88 @@
+import re
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, SimpleTestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..middleware import QueryBudgetExceeded, RequestQueries, current_queries, query_shape
+from ..models import Task
+from .base import TaskAPITestCase
+
+GETS = [
+    '/api/tasks/', '/api/tasks/categories/', '/api/tasks/today/', '/api/tasks/upcoming/',
+    '/api/tasks/calendar/', '/api/tasks/stats/', '/api/tasks/tags/', '/api/tasks/changes/',
+    '/api/tasks/day-planner/', '/api/analytics/overview/', '/api/analytics/insights/',
+    '/api/analytics/focus-sessions/', '/api/auth/profile/',
+]
+
+
+def server_timing(response):
+    """{metric: (milliseconds, query count or None)}"""
+    return {
+        match.group(1): (float(match.group(2)), match.group(3) and int(match.group(3)))
+        for match in re.finditer(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?', response['Server-Timing'])
+    }
+
+
+class QueryBudgetMiddlewareTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = self.make_tasks(12)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_reads_have_timing_and_stay_in_budget(self):
+        for url in GETS + [f'/api/tasks/{self.tasks[0].id}/']:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(set(server_timing(response)), {'db', 'serialize', 'app', 'total'})
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_day_plan_writes_stay_in_budget(self):
+        ids = [task.id for task in self.tasks]
+        response = self.client.post('/api/tasks/day-planner/', {'date': '2025-03-01', 'task_ids': ids}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['tasks']), 12)
+        self.assertEqual(response.data['total_tasks_count'], 12)
+
+    def test_counts_queries(self):
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(server_timing(response)['db'][1], 5)
+
+    def test_counts_async_queries(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        response = async_to_sync(AsyncClient().get)('/api/tasks/today/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(server_timing(response)['db'][1], 3)
+
+    def test_budget(self):
+        with override_settings(QUERY_BUDGETS={'task_stats': 0}):
+            with self.assertLogs('tasks.middleware', 'WARNING') as logs:
+                self.client.get('/api/tasks/stats/')
+            self.assertIn('budget 0', logs.output[0])
+            with override_settings(QUERY_BUDGET_RAISE=True), self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/tasks/stats/')
+
+    def test_repeated_shapes(self):
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        try:
+            for task in self.tasks:
+                Task.objects.get(pk=task.pk)
+            list(Task.objects.filter(pk__in=[1, 2]))
+            list(Task.objects.filter(pk__in=[1, 2, 3]))
+        finally:
+            current_queries.reset(token)
+        self.assertEqual(queries.count, 14)
+        self.assertEqual([times for _, times in queries.repeated(5)], [12])
+        self.assertEqual(len(queries.repeated(2)), 2)
+
+
+class QueryShapeTests(SimpleTestCase):
+    def test_folds_variable_lists(self):
+        self.assertEqual(query_shape('SELECT 1 WHERE id IN (%s, %s, %s)'), query_shape('SELECT 1 WHERE id IN (%s, %s)'))
+        self.assertEqual(
+            query_shape('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO t (a, b) VALUES (%s, %s), ...',
+        )
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import Task
+from .base import TaskAPITestCase
+
+
+class OverdueTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        yesterday, tomorrow = now - timedelta(days=1), now + timedelta(days=1)
+        self.late = Task.objects.create(user=self.user, title='late', due_date=yesterday)
+        self.on_time = [
+            Task.objects.create(user=self.user, title='late but done', status='completed', due_date=yesterday),
+            Task.objects.create(user=self.user, title='late but cancelled', status='cancelled', due_date=yesterday),
+            Task.objects.create(user=self.user, title='future', due_date=tomorrow),
+            Task.objects.create(user=self.user, title='no due date'),
+        ]
+
+    def ids(self, **params):
+        return [row['id'] for row in self.client.get('/api/tasks/', params).data['results']]
+
+    def test_filter(self):
+        self.assertEqual(self.ids(overdue='true'), [self.late.id])
+        self.assertEqual(sorted(self.ids(overdue='false')), sorted(task.id for task in self.on_time))
+
+    def test_ordering(self):
+        self.assertEqual(self.ids(ordering='-overdue')[0], self.late.id)
+
+    def test_cursor_ordering(self):
+        first = self.client.get('/api/tasks/', {'cursor': '', 'ordering': '-overdue'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([row['id'] for row in first.data['results']][0], self.late.id)
+        self.assertEqual(len(first.data['results']), 5)
+        self.assertEqual(self.ids(ordering='overdue')[-1], self.late.id)
+
+    def test_flag_in_responses(self):
+        rows = {row['id']: row['is_overdue'] for row in self.client.get('/api/tasks/').data['results']}
+        self.assertEqual(rows, {self.late.id: True, **{task.id: False for task in self.on_time}})
+        self.assertTrue(self.client.get(f'/api/tasks/{self.late.id}/').data['is_overdue'])
+        response = self.client.post(f'/api/tasks/{self.late.id}/complete/')
+        self.assertFalse(response.data['task']['is_overdue'])
+
+    def test_queryset_helpers(self):
+        self.assertEqual(list(Task.objects.overdue()), [self.late])
+        self.assertEqual(Task.objects.not_overdue().count(), 4)
+        flags = dict(Task.objects.with_overdue().values_list('title', 'overdue'))
+        self.assertEqual(sum(flags.values()), 1)
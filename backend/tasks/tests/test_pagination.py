@@ -0,0 +1,76 @@
+import base64
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import Task
+from ..pagination import encode_cursor
+from .base import TaskAPITestCase
+
+
+class KeysetPaginationTests(TaskAPITestCase):
+    def walk(self, url):
+        """Follow ``next`` to the end, then ``previous`` back; return (forward ids, backward ids)"""
+        forward, last = [], None
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            last = response.data
+            forward += [row['id'] for row in last['results']]
+            url = last['next']
+        backward = [row['id'] for row in reversed(last['results'])]
+        url = last['previous']
+        while url:
+            response = self.client.get(url)
+            backward += [row['id'] for row in reversed(response.data['results'])]
+            url = response.data['previous']
+        return forward, backward[::-1]
+
+    def test_walks_every_ordering_both_ways(self):
+        tasks = self.make_tasks(45)
+        # NULL sort keys and runs of equal keys across page boundaries
+        Task.objects.filter(pk__in=[task.pk for task in tasks[:5]]).update(due_date=None)
+        Task.objects.filter(pk__in=[task.pk for task in tasks[5:30]]).update(due_date=tasks[30].due_date)
+        Task.objects.filter(pk__in=[task.pk for task in tasks[35:]]).update(due_date=timezone.now() - timedelta(days=1))
+        orderings = ['-created_at', 'due_date', '-due_date', 'priority', '-priority', 'updated_at', 'overdue', '-overdue']
+        for ordering in orderings:
+            with self.subTest(ordering=ordering):
+                forward, backward = self.walk(f'/api/tasks/?cursor=&ordering={ordering}')
+                self.assertEqual(len(forward), 45)
+                self.assertEqual(len(set(forward)), 45)
+                self.assertEqual(backward, forward)
+
+    def test_nulls_sort_last_ascending_and_first_descending(self):
+        tasks = self.make_tasks(25)
+        Task.objects.filter(pk__in=[task.pk for task in tasks[:3]]).update(due_date=None)
+        nulls = {task.pk for task in tasks[:3]}
+        ascending, _ = self.walk('/api/tasks/?cursor=&ordering=due_date')
+        self.assertEqual(set(ascending[-3:]), nulls)
+        descending, _ = self.walk('/api/tasks/?cursor=&ordering=-due_date')
+        self.assertEqual(set(descending[:3]), nulls)
+        self.assertEqual(descending[3:], ascending[:-3][::-1])
+
+    def test_cursor_mode_skips_count(self):
+        self.make_tasks(2)
+        with self.assertNumQueries(2):
+            self.client.get('/api/tasks/?cursor=')
+        self.make_tasks(15)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tasks/?cursor=')
+        self.assertNotIn('count', response.data)
+
+    def test_tampered_cursor(self):
+        self.make_tasks(3)
+        for cursor in ['garbage', base64.urlsafe_b64encode(b'{"k": "2025-01-01"}').decode(), encode_cursor('not a date', 1)]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/tasks/', {'cursor': cursor}).status_code, 404)
+
+    def test_other_users_rows_stay_hidden(self):
+        self.make_tasks(3, user=self.other)
+        cursor = encode_cursor(timezone.now().isoformat(), 10 ** 6)
+        response = self.client.get('/api/tasks/', {'cursor': cursor})
+        self.assertEqual(response.data['results'], [])
+
+    def test_page_number_mode_unchanged(self):
+        self.make_tasks(3)
+        self.assertEqual(self.client.get('/api/tasks/').data['count'], 3)
@@ -0,0 +1,40 @@
+from django.utils import timezone
+
+from ..models import Task
+from ..pagination import encode_cursor
+from .base import TaskAPITestCase
+
+
+class PriorityRankTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        due = timezone.now().replace(hour=12, minute=0)
+        for priority in ['low', 'urgent', 'medium', 'high']:
+            Task.objects.create(user=self.user, title=priority, priority=priority, due_date=due)
+
+    def priorities(self, **params):
+        return [row['priority'] for row in self.client.get('/api/tasks/', params).data['results']]
+
+    def test_ordering_by_rank(self):
+        self.assertEqual(self.priorities(ordering='-priority'), ['urgent', 'high', 'medium', 'low'])
+        self.assertEqual(self.priorities(ordering='priority', cursor=''), ['low', 'medium', 'high', 'urgent'])
+        medium = Task.objects.get(user=self.user, title='medium')
+        self.assertEqual(self.priorities(ordering='priority', cursor=encode_cursor(2, medium.pk)), ['high', 'urgent'])
+
+    def test_today_puts_urgent_first(self):
+        self.assertEqual([row['priority'] for row in self.client.get('/api/tasks/today/').data], ['urgent', 'high', 'medium', 'low'])
+
+    def test_open_filter(self):
+        Task.objects.filter(user=self.user, title='low').update(status='completed')
+        self.assertEqual(self.priorities(open='true', ordering='-priority'), ['urgent', 'high', 'medium'])
+
+    def test_rank_follows_every_write_path(self):
+        Task.objects.filter(user=self.user, title='low').update(priority='urgent')
+        self.assertEqual(Task.objects.get(user=self.user, title='low').priority_rank, 4)
+        task = Task.objects.create(user=self.user, title='new', priority='high')
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, 3)
+        task.priority = 'low'
+        Task.objects.bulk_update([task], ['priority'])
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, 1)
@@ -0,0 +1,209 @@
+import random
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Task, TaskOccurrence, TaskStatus
+from ..recurrence import expand, occurrence_dates, series_in_window
+from .base import TaskAPITestCase, User
+
+UTC = dt_timezone.utc
+
+
+def series(pattern, start, interval=1, weekdays=(), end=None, **fields):
+    return Task(
+        title='series', is_recurring=True, recurring_pattern=pattern, due_date=start,
+        recurrence_interval=interval, recurrence_weekdays=list(weekdays), recurrence_end=end, **fields,
+    )
+
+
+def walk_dates(task, first, last):
+    """Reference implementation: test every day from the series start"""
+    start = task.due_date.date()
+    days = []
+    day = start
+    while day <= last:
+        if task.recurring_pattern == 'daily':
+            matches = (day - start).days % task.recurrence_interval == 0
+        elif task.recurring_pattern == 'weekly':
+            weeks = ((day - timedelta(days=day.weekday())) - (start - timedelta(days=start.weekday()))).days // 7
+            matches = day.weekday() in (task.recurrence_weekdays or [start.weekday()]) and weeks % task.recurrence_interval == 0
+        else:
+            months = (day.year - start.year) * 12 + day.month - start.month
+            matches = day.day == start.day and months % task.recurrence_interval == 0
+        if matches and day >= first and (task.recurrence_end is None or day <= task.recurrence_end.date()):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+class RecurrenceTests(TestCase):
+    def test_daily_interval(self):
+        task = series('daily', datetime(2025, 1, 1, 9, tzinfo=UTC), interval=3)
+        days = list(occurrence_dates(task, date(2025, 1, 5), date(2025, 1, 15), UTC))
+        self.assertEqual(days, [date(2025, 1, 7), date(2025, 1, 10), date(2025, 1, 13)])
+
+    def test_weekly_weekdays_every_other_week(self):
+        # 2025-01-06 is a Monday
+        task = series('weekly', datetime(2025, 1, 6, 9, tzinfo=UTC), interval=2, weekdays=[0, 3])
+        days = list(occurrence_dates(task, date(2025, 1, 1), date(2025, 1, 31), UTC))
+        self.assertEqual(days, [date(2025, 1, 6), date(2025, 1, 9), date(2025, 1, 20), date(2025, 1, 23)])
+
+    def test_monthly_on_31st_skips_short_months(self):
+        task = series('monthly', datetime(2025, 1, 31, 9, tzinfo=UTC))
+        days = list(occurrence_dates(task, date(2025, 1, 1), date(2025, 6, 30), UTC))
+        self.assertEqual(days, [date(2025, 1, 31), date(2025, 3, 31), date(2025, 5, 31)])
+
+    def test_matches_a_day_by_day_walk(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            pattern = rng.choice(['daily', 'weekly', 'monthly'])
+            if pattern == 'monthly' and rng.random() < .3:
+                start = datetime(2024, 1, 31, 9, tzinfo=UTC)
+            else:
+                start = datetime(2024, rng.randint(1, 12), rng.randint(1, 28), 9, tzinfo=UTC)
+            task = series(
+                pattern, start, interval=rng.randint(1, 4),
+                weekdays=rng.sample(range(7), rng.randint(0, 3)) if pattern == 'weekly' else (),
+                end=datetime(2025, rng.randint(1, 12), 1, tzinfo=UTC) if rng.random() < .3 else None,
+            )
+            first = date(2024, 1, 1) + timedelta(days=rng.randint(0, 600))
+            last = first + timedelta(days=rng.randint(0, 200))
+            with self.subTest(pattern=pattern, start=start, interval=task.recurrence_interval, first=first, last=last):
+                self.assertEqual(list(occurrence_dates(task, first, last, UTC)), walk_dates(task, first, last))
+
+    def test_nothing_before_the_first_occurrence(self):
+        task = series('daily', datetime(2025, 1, 10, 9, tzinfo=UTC))
+        self.assertEqual(list(occurrence_dates(task, date(2025, 1, 1), date(2025, 1, 9), UTC)), [])
+
+    def test_recurrence_end_is_inclusive(self):
+        task = series('daily', datetime(2025, 1, 1, 9, tzinfo=UTC), end=datetime(2025, 1, 3, 9, tzinfo=UTC))
+        days = [day for day, _ in expand(task, UTC, datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 2, 1, tzinfo=UTC))]
+        self.assertEqual(days, [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)])
+        # An end earlier in the day than the occurrence drops that day
+        task.recurrence_end = datetime(2025, 1, 3, 8, tzinfo=UTC)
+        days = [day for day, _ in expand(task, UTC, datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 2, 1, tzinfo=UTC))]
+        self.assertEqual(days[-1], date(2025, 1, 2))
+
+    def test_window_is_half_open(self):
+        task = series('daily', datetime(2025, 1, 1, 9, tzinfo=UTC))
+        window = (datetime(2025, 1, 5, 9, tzinfo=UTC), datetime(2025, 1, 7, 9, tzinfo=UTC))
+        dues = [due for _, due in expand(task, UTC, *window)]
+        self.assertEqual(dues, [datetime(2025, 1, 5, 9, tzinfo=UTC), datetime(2025, 1, 6, 9, tzinfo=UTC)])
+        # Window edges inside a day: 09:00 occurrences outside [10:00, next day 08:00) are left out
+        window = (datetime(2025, 1, 5, 10, tzinfo=UTC), datetime(2025, 1, 6, 8, tzinfo=UTC))
+        self.assertEqual(list(expand(task, UTC, *window)), [])
+
+    def test_wall_clock_time_kept_across_dst(self):
+        tz = ZoneInfo('America/New_York')
+        task = series('daily', datetime(2025, 3, 1, 9, tzinfo=tz))
+        dues = [due for _, due in expand(task, tz, datetime(2025, 3, 5, tzinfo=tz), datetime(2025, 3, 15, tzinfo=tz))]
+        self.assertEqual(len(dues), 10)
+        self.assertTrue(all(due.astimezone(tz).hour == 9 for due in dues))
+
+    def test_series_in_window(self):
+        user = User.objects.create_user(email='owner@example.com', username='owner', password='pw')
+        start = datetime(2025, 1, 1, 9, tzinfo=UTC)
+        kept = Task.objects.create(user=user, title='open', is_recurring=True, recurring_pattern='daily', due_date=start)
+        Task.objects.create(
+            user=user, title='cancelled', is_recurring=True, recurring_pattern='daily', due_date=start,
+            status=TaskStatus.CANCELLED,
+        )
+        Task.objects.create(
+            user=user, title='ended', is_recurring=True, recurring_pattern='daily', due_date=start,
+            recurrence_end=datetime(2025, 1, 20, tzinfo=UTC),
+        )
+        Task.objects.create(
+            user=user, title='later', is_recurring=True, recurring_pattern='daily', due_date=datetime(2025, 3, 1, tzinfo=UTC),
+        )
+        Task.objects.create(
+            user=user, title='completed before', is_recurring=True, recurring_pattern='daily', due_date=start,
+            status=TaskStatus.COMPLETED, completed_at=datetime(2025, 1, 15, tzinfo=UTC),
+        )
+        Task.objects.create(
+            user=user, title='completed without a time', is_recurring=True, recurring_pattern='daily', due_date=start,
+            status=TaskStatus.COMPLETED,
+        )
+        Task.objects.filter(title='completed without a time').update(completed_at=None)
+        completed_during = Task.objects.create(
+            user=user, title='completed during', is_recurring=True, recurring_pattern='daily', due_date=start,
+            status=TaskStatus.COMPLETED, completed_at=datetime(2025, 2, 10, tzinfo=UTC),
+        )
+        window = (datetime(2025, 2, 1, tzinfo=UTC), datetime(2025, 3, 1, tzinfo=UTC))
+        self.assertEqual(
+            set(series_in_window(Task.objects.filter(user=user), window)), {kept, completed_during},
+        )
+
+    def test_completed_series_stops_at_completion(self):
+        task = series(
+            'daily', datetime(2025, 1, 1, 9, tzinfo=UTC),
+            status=TaskStatus.COMPLETED, completed_at=datetime(2025, 1, 3, 12, tzinfo=UTC),
+        )
+        window = (datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 2, 1, tzinfo=UTC))
+        days = [day for day, _ in expand(task, UTC, *window)]
+        self.assertEqual(days, [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)])
+        task.completed_at = None
+        self.assertEqual([day for day, _ in expand(task, UTC, *window)], [date(2025, 1, 1)])
+
+
+class OccurrenceAPITests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.series = Task.objects.create(user=self.user, title='daily', is_recurring=True, recurring_pattern='daily')
+        Task.objects.filter(pk=self.series.pk).update(due_date=self.now - timedelta(days=10))
+
+    def occurrences(self, path, **params):
+        return [row for row in self.client.get(path, params).data if row['id'] == self.series.id]
+
+    def test_lists_include_virtual_occurrences(self):
+        today = self.occurrences('/api/tasks/today/')
+        self.assertEqual(len(today), 1)
+        self.assertEqual(today[0]['occurrence_date'], timezone.localdate(self.now).isoformat())
+        self.assertIn(len(self.occurrences('/api/tasks/upcoming/')), (7, 8))
+
+    def test_overrides(self):
+        days = [row['occurrence_date'] for row in self.occurrences('/api/tasks/upcoming/')]
+        url = f'/api/tasks/{self.series.id}/occurrences/'
+        response = self.client.patch(url + f'{days[0]}/', {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertIsNotNone(response.data['completed_at'])
+        self.client.put(url + f'{days[1]}/', {'status': 'cancelled'}, format='json')
+        moved = self.now + timedelta(days=30)
+        self.client.put(url + f'{days[2]}/', {'due_date': moved.isoformat()}, format='json')
+        upcoming = [row['occurrence_date'] for row in self.occurrences('/api/tasks/upcoming/')]
+        self.assertFalse(set(days[:3]) & set(upcoming))
+        self.assertEqual(TaskOccurrence.objects.count(), 3)
+
+        window = {'start_date': (moved - timedelta(days=5)).date().isoformat(), 'end_date': (moved + timedelta(days=5)).date().isoformat()}
+        with self.assertNumQueries(4):
+            calendar = self.occurrences('/api/tasks/calendar/', **window)
+        self.assertIn(days[2], [row['occurrence_date'] for row in calendar])
+
+        self.assertEqual(self.client.delete(url + f'{days[1]}/').status_code, 204)
+        self.assertEqual(TaskOccurrence.objects.count(), 2)
+
+    def test_completing_the_series_ends_it(self):
+        self.assertEqual(self.client.post(f'/api/tasks/{self.series.id}/complete/').status_code, 200)
+        # Nothing after the completion; today's occurrence was due before it
+        today = timezone.localdate(self.now).isoformat()
+        self.assertTrue(all(row['occurrence_date'] <= today for row in self.occurrences('/api/tasks/upcoming/')))
+        window = {
+            'start_date': (self.now - timedelta(days=10)).date().isoformat(),
+            'end_date': (self.now - timedelta(days=2)).date().isoformat(),
+        }
+        self.assertTrue(self.occurrences('/api/tasks/calendar/', **window))
+
+    def test_unknown_occurrences(self):
+        day = timezone.localdate(self.now).isoformat()
+        self.assertEqual(self.client.put(f'/api/tasks/{self.series.id}/occurrences/1999-01-01/', {}, format='json').status_code, 404)
+        one_off = self.make_tasks(1)[0]
+        self.assertEqual(self.client.put(f'/api/tasks/{one_off.id}/occurrences/{day}/', {}, format='json').status_code, 404)
+
+    def test_rule_validation(self):
+        for data in [{'recurring_pattern': 'weekly', 'recurrence_weekdays': [0, 9]}, {'recurring_pattern': 'yearly'}]:
+            with self.subTest(data=data):
+                response = self.client.post('/api/tasks/', {'title': 'series', 'is_recurring': True, **data}, format='json')
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ..models import Task
+from ..reminders import MemoryReminderBackend, ReminderScheduler
+from .base import TaskAPITestCase
+
+
+class FailingBackend:
+    def send(self, reminders):
+        raise RuntimeError('delivery failed')
+
+
+class ReminderSchedulerTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.backend = MemoryReminderBackend()
+
+    def remind(self, title, minutes, **fields):
+        return Task.objects.create(user=self.user, title=title, reminder_date=self.now + timedelta(minutes=minutes), **fields)
+
+    def test_fires_due_reminders_once(self):
+        due = self.remind('due', -1)
+        later = self.remind('later', 60)
+        scheduler = ReminderScheduler(self.backend)
+        self.assertEqual(scheduler.drain(self.now), 1)
+        self.assertEqual([reminder['id'] for reminder in self.backend.sent], [due.id])
+        self.assertEqual(scheduler.drain(self.now), 0)
+        self.assertEqual(scheduler.drain(self.now + timedelta(hours=2)), 1)
+        self.assertEqual([reminder['id'] for reminder in self.backend.sent], [due.id, later.id])
+        self.assertFalse(Task.objects.pending_reminders().exists())
+
+    def test_closed_and_late_reminders_are_claimed_but_not_sent(self):
+        due = self.remind('due', -1)
+        done = self.remind('done', 0, status='completed', completed_at=self.now)
+        self.remind('cancelled', 0, status='cancelled')
+        self.remind('three days late', -3 * 24 * 60)
+        scheduler = ReminderScheduler(self.backend, max_lateness=timedelta(days=1))
+        self.assertEqual(scheduler.drain(self.now), 3)
+        self.assertEqual([reminder['id'] for reminder in self.backend.sent], [due.id])
+        self.assertEqual((scheduler.delivered, scheduler.late, scheduler.closed), (1, 1, 1))
+        self.assertFalse(Task.objects.pending_reminders().exists())
+        # Completed tasks are outside the pending index and never claimed
+        done.refresh_from_db()
+        self.assertIsNone(done.reminder_sent_at)
+
+    def test_stale_queue_entries_are_not_claimed_twice(self):
+        self.remind('due', -1)
+        first, second = ReminderScheduler(self.backend), ReminderScheduler(self.backend)
+        first.refill(self.now)
+        second.refill(self.now)
+        self.assertEqual(first.fire_due(self.now), 1)
+        self.assertEqual(second.fire_due(self.now), 0)
+        self.assertEqual(len(self.backend.sent), 1)
+
+    def test_rescheduling_rearms_a_fired_reminder(self):
+        due = self.remind('due', -1)
+        scheduler = ReminderScheduler(self.backend)
+        scheduler.drain(self.now)
+        moved = (self.now + timedelta(minutes=30)).isoformat()
+        response = self.client.patch(f'/api/tasks/{due.id}/', {'reminder_date': moved}, format='json')
+        self.assertEqual(response.status_code, 200)
+        due.refresh_from_db()
+        self.assertIsNone(due.reminder_sent_at)
+        self.assertEqual(scheduler.drain(self.now + timedelta(hours=1)), 1)
+
+    def test_failed_delivery_releases_the_claim(self):
+        due = self.remind('due', 0)
+        scheduler = ReminderScheduler(FailingBackend())
+        scheduler.refill(self.now)
+        with self.assertRaises(RuntimeError):
+            scheduler.fire_due(self.now)
+        due.refresh_from_db()
+        self.assertIsNone(due.reminder_sent_at)
+        self.assertEqual(ReminderScheduler(self.backend).drain(self.now), 1)
+
+    def test_backlog_is_drained_in_batches(self):
+        for i in range(7):
+            self.remind(f'due {i}', -i)
+        scheduler = ReminderScheduler(self.backend, batch_size=2, max_queued=3)
+        self.assertEqual(scheduler.drain(self.now), 7)
+        self.assertEqual(len(self.backend.sent), 7)
+
+    def test_run_once_command(self):
+        self.remind('due', -1)
+        self.remind('cancelled', -1, status='cancelled')
+        self.remind('three days late', -3 * 24 * 60)
+        out = StringIO()
+        call_command(
+            'run_reminders', '--once', '--max-lateness', '1440',
+            '--backend', 'tasks.reminders.MemoryReminderBackend', stdout=out
+        )
+        self.assertIn('Delivered 1 reminders, skipped 1 late ones and 1 for closed tasks', out.getvalue())
+        self.assertFalse(Task.objects.pending_reminders().exists())
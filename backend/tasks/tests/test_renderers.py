@@ -0,0 +1,57 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ..renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from .base import TaskAPITestCase
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_output(self):
+        data = {
+            'when': timezone.now(),
+            'amount': Decimal('1.50'),
+            'took': timedelta(seconds=90),
+            'name': 'line\u2028break',
+            'nested': [{'a': None}],
+        }
+        fast = json.loads(FastJSONRenderer().render(data))
+        drf = json.loads(JSONRenderer().render(data))
+        self.assertEqual(fast, drf)
+        self.assertTrue(fast['when'].endswith('Z'))
+        self.assertNotIn(b'\xe2\x80\xa8', FastJSONRenderer().render(data))
+
+    def test_indent_falls_back_to_drf(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2', {})
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_uses_orjson(self):
+        self.assertEqual(FastJSONRenderer().render({'a': 1}), b'{"a":1}')
+
+
+class RendererAPITests(TaskAPITestCase):
+    def test_default_json(self):
+        self.make_tasks(2)
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(json.loads(response.content)['results']), 2)
+
+    @skipIf(msgpack is not None, 'msgpack is installed')
+    def test_msgpack_not_offered_without_package(self):
+        response = self.client.get('/api/tasks/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 406)
+        with self.assertRaises(RuntimeError):
+            MessagePackRenderer().render({'a': 1})
+
+    @skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack(self):
+        self.make_tasks(2)
+        response = self.client.get('/api/tasks/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(len(msgpack.unpackb(response.content)['results']), 2)
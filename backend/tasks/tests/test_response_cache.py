@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from analytics.models import FocusSession
+
+from ..cache_backends import LRUFileBasedCache
+from ..models import DayPlanner, SubTask
+from ..response_cache import cache_stats, reset_cache_stats
+from .base import TaskAPITestCase
+
+
+class ResponseCacheTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = self.make_tasks(3)
+        # The dashboard creates UserAnalytics on first read, which bumps the version
+        self.client.get('/api/analytics/dashboard/')
+        reset_cache_stats()
+
+    def test_hit_after_miss(self):
+        for url in ['/api/tasks/stats/', '/api/tasks/calendar/', '/api/analytics/overview/', '/api/analytics/dashboard/']:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first['X-Cache'], 'MISS')
+                with self.assertNumQueries(1):
+                    second = self.client.get(url)
+                self.assertEqual(second['X-Cache'], 'HIT')
+                self.assertEqual(second.json(), first.json())
+        self.assertEqual((cache_stats()['hits'], cache_stats()['misses']), (4, 4))
+
+    def test_query_parameters_and_users_get_their_own_entries(self):
+        self.client.get('/api/tasks/stats/')
+        self.assertEqual(self.client.get('/api/tasks/stats/', {'since': '2020-01-01'})['X-Cache'], 'MISS')
+        self.client.force_authenticate(self.other)
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual((response['X-Cache'], response.data['total_tasks']), ('MISS', 0))
+
+    def test_writes_miss_the_cache(self):
+        task = self.tasks[0]
+        writes = [
+            lambda: self.client.patch(f'/api/tasks/{task.id}/', {'status': 'completed'}, format='json'),
+            lambda: SubTask.objects.create(parent_task=task, title='new'),
+            lambda: DayPlanner.objects.create(user=self.user, date='2025-01-02'),
+            lambda: FocusSession.objects.create(user=self.user, start_time=timezone.now(), end_time=timezone.now(), duration=5),
+        ]
+        self.client.get('/api/tasks/stats/')
+        for index, write in enumerate(writes):
+            with self.subTest(write=index):
+                write()
+                self.assertEqual(self.client.get('/api/tasks/stats/')['X-Cache'], 'MISS')
+                self.assertEqual(self.client.get('/api/tasks/stats/')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/tasks/stats/').data['completed_tasks'], 1)
+
+
+class LRUFileBasedCacheTests(SimpleTestCase):
+    def test_evicts_the_least_recently_used_entry(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        cache = LRUFileBasedCache(location, {'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3}})
+        now = time.time()
+        for age, key in zip([30, 20, 10], 'abc'):
+            cache.set(key, key)
+            os.utime(cache._key_to_file(key), (now - age, now - age))
+        cache.get('a')
+        cache.set('d', 'd')
+        self.assertEqual([cache.get(key) for key in 'abcd'], ['a', None, 'c', 'd'])
@@ -0,0 +1,68 @@
+from ..models import Task
+from ..search import search_backend
+from .base import TaskAPITestCase
+
+
+class SearchTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.report = Task.objects.create(user=self.user, title='Quarterly report draft', description='numbers')
+        self.groceries = Task.objects.create(user=self.user, title='Groceries', description='buy milk for the report meeting')
+        self.tagged = Task.objects.create(user=self.user, title='unrelated', tags=['reporting'])
+        Task.objects.create(user=self.other, title='report for someone else')
+
+    def search(self, query, **params):
+        response = self.client.get('/api/tasks/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_prefix_match_ranks_title_hits_first(self):
+        results = self.search('repo')
+        self.assertEqual({row['id'] for row in results}, {self.report.id, self.groceries.id, self.tagged.id})
+        self.assertEqual(results[0]['id'], self.report.id)
+        self.assertIn('<mark>', results[0]['search_highlight'])
+
+    def test_search_parameter_alias(self):
+        results = self.client.get('/api/tasks/', {'search': 'milk'}).data['results']
+        self.assertEqual([row['id'] for row in results], [self.groceries.id])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.groceries.title, self.groceries.description = 'zebra', ''
+        self.groceries.save()
+        self.assertEqual(self.search('milk'), [])
+        self.assertEqual([row['id'] for row in self.search('zeb', cursor='')], [self.groceries.id])
+        self.groceries.delete()
+        self.assertEqual(self.search('zebra'), [])
+
+    def test_combines_with_filters(self):
+        Task.objects.filter(pk=self.tagged.pk).update(status='completed')
+        self.assertEqual(len(self.search('repo', status='todo')), 2)
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(self.search('"\''), [])
+        for query in ['report*', '-report', '(report)', '"report"']:
+            with self.subTest(query=query):
+                self.assertIn(self.report.id, [row['id'] for row in self.search(query)])
+        # Operators are plain terms, and every term must match
+        self.assertEqual(self.search('report OR'), [])
+
+    def test_search_pages_keep_relevance_order(self):
+        for i in range(15):
+            Task.objects.create(user=self.user, title=f'report {i}')
+            Task.objects.create(user=self.user, title=f'note {i}', description='see the report')
+        rows, url = [], '/api/tasks/?q=report&cursor='
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            rows += response.data['results']
+            url = response.data['next']
+        self.assertEqual(len({row['id'] for row in rows}), len(rows))
+        self.assertEqual(len(rows), 33)
+        ranks = [row['search_rank'] for row in rows]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        self.assertTrue(rows[0]['title'].startswith('report'))
+
+    def test_backend_is_looked_up_once(self):
+        search_backend()
+        with self.assertNumQueries(0):
+            search_backend()
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from analytics.models import FocusSession
+
+from ..models import DayPlanner, SubTask, Tag, Task, TaskComment
+from .base import TaskAPITestCase
+
+
+class SoftDeleteTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = self.make_tasks(4)
+        first = self.tasks[0]
+        TaskComment.objects.create(task=first, user=self.user, content='note')
+        FocusSession.objects.create(user=self.user, task=first, duration=5, start_time=timezone.now(), end_time=timezone.now())
+        self.plan = DayPlanner.objects.create(user=self.user, date=date.today())
+        self.plan.tasks.set(self.tasks)
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command('purge_deleted_tasks', *args, stdout=out)
+        return out.getvalue()
+
+    def test_delete_hides_the_task_everywhere(self):
+        task = self.tasks[0]
+        self.assertEqual(self.client.delete(f'/api/tasks/{task.id}/').status_code, 204)
+        self.assertEqual(self.client.get(f'/api/tasks/{task.id}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/tasks/{task.id}/subtasks/').data['count'], 0)
+        self.assertEqual(self.client.get('/api/tasks/').data['count'], 3)
+        self.assertEqual(len(self.client.get('/api/tasks/day-planner/').data['results'][0]['tasks']), 3)
+        # Nothing is cascaded yet
+        self.assertEqual((Task.all_objects.count(), SubTask.objects.count(), TaskComment.objects.count()), (4, 12, 1))
+        self.assertIsNotNone(Task.all_objects.get(pk=task.pk).deleted_at)
+
+    def test_delete_cost_does_not_depend_on_related_rows(self):
+        busy = self.tasks[1]
+        for i in range(20):
+            SubTask.objects.create(parent_task=busy, title=f'extra {i}')
+            TaskComment.objects.create(task=busy, user=self.user, content=f'comment {i}')
+        counts = []
+        for task in (self.tasks[2], busy):
+            with CaptureQueriesContext(connection) as context:
+                self.client.delete(f'/api/tasks/{task.id}/')
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_delete_skips_already_deleted(self):
+        self.client.delete(f'/api/tasks/{self.tasks[0].id}/')
+        ids = [task.id for task in self.tasks[:3]]
+        response = self.client.post('/api/tasks/bulk-action/', {'task_ids': ids, 'action': 'delete'}, format='json')
+        self.assertEqual(response.data['updated_count'], 2)
+        self.assertEqual(Tag.objects.get(user=self.user, name='work').task_count, 1)
+
+    def test_purge_removes_old_tombstones_and_their_rows(self):
+        Task.objects.filter(pk__in=[task.pk for task in self.tasks[:3]]).soft_delete()
+        self.assertIn('Purged 0', self.purge())
+        Task.all_objects.filter(deleted_at__isnull=False).update(deleted_at=timezone.now() - timedelta(days=8))
+        self.assertIn('Purged 3', self.purge('--chunk-size', '2'))
+        self.assertEqual(list(Task.all_objects.values_list('id', flat=True)), [self.tasks[3].id])
+        self.assertEqual((SubTask.objects.count(), TaskComment.objects.count(), FocusSession.objects.count()), (3, 0, 0))
+        self.assertEqual(list(self.plan.tasks.all()), [self.tasks[3]])
+
+    def test_purge_respects_older_than_days(self):
+        Task.objects.filter(pk=self.tasks[0].pk).soft_delete()
+        Task.all_objects.filter(pk=self.tasks[0].pk).update(deleted_at=timezone.now() - timedelta(days=2))
+        self.assertIn('Purged 0', self.purge())
+        self.assertIn('Purged 1', self.purge('--older-than-days', '1'))
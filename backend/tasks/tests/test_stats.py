@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..benchmarks import legacy_task_stats
+from ..models import Category, Task
+from .base import TaskAPITestCase
+
+LEGACY_KEYS = (
+    'total_tasks', 'completed_tasks', 'pending_tasks', 'overdue_tasks',
+    'tasks_by_priority', 'tasks_by_category', 'recent_activity',
+)
+
+
+class StatsTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        tasks = self.make_tasks(10)
+        home = Category.objects.create(name='Home')
+        Task.objects.filter(pk__in=[task.pk for task in tasks[:3]]).update(category=home)
+        Task.objects.filter(pk=tasks[3].pk).update(category=None, status='completed')
+        Task.objects.filter(pk=tasks[4].pk).update(status='cancelled', due_date=timezone.now() - timedelta(days=1))
+        Task.objects.filter(pk=tasks[5].pk).update(due_date=timezone.now() - timedelta(days=1))
+        Task.objects.filter(pk=tasks[6].pk).update(created_at=timezone.now() - timedelta(days=30))
+        Task.objects.create(user=self.user, title='no category', status='completed', priority='high')
+        self.make_tasks(2, user=self.other)
+
+    def test_matches_the_old_numbers(self):
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.status_code, 200)
+        expected = legacy_task_stats(Task.objects.filter(user=self.user))
+        self.assertEqual(tuple(response.data[key] for key in LEGACY_KEYS), expected)
+        self.assertEqual(response.data['completion_rate'], round(2 / 11 * 100, 2))
+
+    def test_query_count_does_not_grow(self):
+        with self.assertNumQueries(5):
+            self.client.get('/api/tasks/stats/')
+        self.make_tasks(10)
+        with self.assertNumQueries(5):
+            self.client.get('/api/tasks/stats/')
+
+    def test_since(self):
+        since = (timezone.now() - timedelta(days=2)).date().isoformat()
+        self.assertEqual(self.client.get('/api/tasks/stats/', {'since': since}).data['total_tasks'], 10)
+        self.assertEqual(self.client.get('/api/tasks/stats/', {'since': '2020-01-01T00:00:00Z'}).data['total_tasks'], 11)
+        self.assertEqual(self.client.get('/api/tasks/stats/', {'since': 'yesterday'}).status_code, 400)
+
+    def test_no_tasks(self):
+        Task.objects.filter(user=self.user).delete()
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual((response.data['total_tasks'], response.data['completion_rate']), (0, 0))
+        self.assertEqual(response.data['tasks_by_category'], {})
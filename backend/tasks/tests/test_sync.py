@@ -0,0 +1,70 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from .. import sync
+from ..models import Task
+from .base import TaskAPITestCase
+
+
+class ChangesTests(TaskAPITestCase):
+    def test_windowing(self):
+        tasks = self.make_tasks(3)
+        moment = timezone.now()
+        Task.objects.filter(pk=tasks[0].pk).update(updated_at=moment - timedelta(minutes=5))
+        Task.objects.filter(pk=tasks[1].pk).update(updated_at=moment - timedelta(minutes=1))
+        Task.objects.filter(pk=tasks[2].pk).update(updated_at=moment + timedelta(minutes=1))
+        changes, until, has_more = sync.collect_changes(self.user, since=moment - timedelta(minutes=2), now=moment)
+        self.assertEqual(list(changes['tasks']), [tasks[1]])
+        self.assertEqual((until, has_more), (moment, False))
+
+    def test_window_shrinks_to_the_limit(self):
+        tasks = self.make_tasks(5)
+        moment = timezone.now()
+        for minutes, task in enumerate(tasks):
+            Task.objects.filter(pk=task.pk).update(updated_at=moment - timedelta(minutes=10 - minutes))
+        with mock.patch.object(sync, 'CHANGES_LIMIT', 2):
+            changes, until, has_more = sync.collect_changes(self.user, since=moment - timedelta(hours=1), now=moment)
+        self.assertTrue(has_more)
+        self.assertEqual(list(changes['tasks']), tasks[:2])
+        self.assertEqual(until, moment - timedelta(minutes=8))
+
+    def test_paging_reaches_every_row(self):
+        self.make_tasks(7)
+        seen, subtasks, token = set(), set(), None
+        with mock.patch.object(sync, 'CHANGES_LIMIT', 4):
+            for _ in range(20):
+                response = self.client.get('/api/tasks/changes/', {'since': token} if token else {})
+                self.assertLessEqual(len(response.data['subtasks']), 4)
+                seen |= {row['id'] for row in response.data['tasks']}
+                subtasks |= {row['id'] for row in response.data['subtasks']}
+                token = response.data['next_token']
+                if not response.data['has_more']:
+                    break
+        self.assertEqual((len(seen), len(subtasks)), (7, 21))
+
+    def test_tombstones(self):
+        tasks = self.make_tasks(2)
+        token = sync.encode_token(timezone.now() - timedelta(minutes=1))
+        subtask = tasks[0].subtasks.first()
+        self.assertEqual(self.client.delete(f'/api/tasks/subtasks/{subtask.id}/').status_code, 204)
+        self.assertEqual(self.client.delete(f'/api/tasks/{tasks[1].id}/').status_code, 204)
+        response = self.client.get('/api/tasks/changes/', {'since': token})
+        self.assertEqual(response.data['deleted'], {'tasks': [tasks[1].id], 'subtasks': [subtask.id], 'comments': []})
+
+    def test_initial_sync_has_no_tombstones(self):
+        tasks = self.make_tasks(2)
+        self.client.delete(f'/api/tasks/{tasks[1].id}/')
+        response = self.client.get('/api/tasks/changes/')
+        self.assertEqual([row['id'] for row in response.data['tasks']], [tasks[0].id])
+        self.assertEqual(response.data['deleted'], {'tasks': [], 'subtasks': [], 'comments': []})
+
+    def test_other_users_changes_stay_hidden(self):
+        self.make_tasks(2, user=self.other)
+        self.assertEqual(self.client.get('/api/tasks/changes/').data['tasks'], [])
+
+    def test_bad_tokens(self):
+        self.assertEqual(self.client.get('/api/tasks/changes/', {'since': 'garbage'}).status_code, 400)
+        expired = sync.encode_token(timezone.now() - sync.TOMBSTONE_RETENTION - timedelta(days=1))
+        self.assertEqual(self.client.get('/api/tasks/changes/', {'since': expired}).status_code, 410)
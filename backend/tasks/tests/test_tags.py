@@ -0,0 +1,76 @@
+from importlib import import_module
+
+from django.apps import apps
+
+from ..models import Tag, Task, TaskTag
+from .base import TaskAPITestCase
+
+backfill_tags = import_module('tasks.migrations.0003_tags').backfill_tags
+
+
+class TagTests(TaskAPITestCase):
+    def counts(self, user=None):
+        return dict(Tag.objects.filter(user=user or self.user).values_list('name', 'task_count'))
+
+    def test_counts_follow_writes(self):
+        response = self.client.post('/api/tasks/', {'title': 'a', 'tags': ['Work', 'home ', 'work']}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        first = Task.objects.get(user=self.user, title='a')
+        second = Task.objects.create(user=self.user, title='b', tags=['work'])
+        Task.objects.create(user=self.other, title='c', tags=['work'])
+        self.assertEqual(self.counts(), {'work': 2, 'home': 1})
+        self.assertEqual(self.counts(self.other), {'work': 1})
+
+        self.client.patch(f'/api/tasks/{first.id}/', {'tags': ['errand']}, format='json')
+        self.assertEqual(self.counts(), {'work': 1, 'home': 0, 'errand': 1})
+        second.delete()
+        self.assertEqual(self.counts()['work'], 0)
+        self.client.post('/api/tasks/bulk-action/', {'task_ids': [first.id], 'action': 'delete'}, format='json')
+        self.assertEqual(self.counts()['errand'], 0)
+
+    def test_saves_without_tags_leave_links_alone(self):
+        task = Task.objects.create(user=self.user, title='a', tags=['x'])
+        task.title = 'b'
+        task.save(update_fields=['title'])
+        self.assertEqual(self.counts(), {'x': 1})
+        self.assertEqual(TaskTag.objects.filter(task=task).count(), 1)
+
+    def test_tag_filter(self):
+        both = Task.objects.create(user=self.user, title='a', tags=['Work', 'home'])
+        work = Task.objects.create(user=self.user, title='b', tags=['work'])
+        Task.objects.create(user=self.other, title='c', tags=['work'])
+        ids = lambda tag: {row['id'] for row in self.client.get('/api/tasks/', {'tag': tag}).data['results']}
+        self.assertEqual(ids('WORK'), {both.id, work.id})
+        self.assertEqual(ids('work,home'), {both.id})
+        self.assertEqual(ids('missing'), set())
+
+    def test_tag_list_hides_unused_tags(self):
+        task = Task.objects.create(user=self.user, title='a', tags=['work', 'home'])
+        Task.objects.create(user=self.user, title='b', tags=['work'])
+        task.tags = ['work']
+        task.save()
+        response = self.client.get('/api/tasks/tags/')
+        self.assertEqual([(row['name'], row['task_count']) for row in response.data['results']], [('work', 2)])
+
+
+class TagBackfillTests(TaskAPITestCase):
+    def test_backfill_rebuilds_links_and_counts(self):
+        Task.objects.create(user=self.user, title='a', tags=['Work', ' home', 'work'])
+        Task.objects.create(user=self.user, title='b', tags='work')
+        Task.objects.create(user=self.user, title='c', tags=[{'bad': 1}, 42])
+        Task.objects.create(user=self.other, title='d', tags=['work'])
+        Tag.objects.all().delete()
+
+        backfill_tags(apps, None)
+        self.assertEqual(
+            set(Tag.objects.values_list('user__username', 'name', 'task_count')),
+            {('owner', 'work', 2), ('owner', 'home', 1), ('owner', '42', 1), ('other', 'work', 1)},
+        )
+        self.assertEqual(TaskTag.objects.count(), 5)
+
+    def test_backfill_reuses_tags_across_batches(self):
+        # 2 tags x 2600 tasks is more than one 5000-row flush
+        Task.objects.bulk_create([Task(user=self.user, title=f'task {i}', tags=['work', f'n{i % 2}']) for i in range(2600)])
+        backfill_tags(apps, None)
+        self.assertEqual(dict(Tag.objects.values_list('name', 'task_count')), {'work': 2600, 'n0': 1300, 'n1': 1300})
+        self.assertEqual(TaskTag.objects.count(), 5200)
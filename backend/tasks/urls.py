@@ -1,11 +1,14 @@
 from django.urls import path
+from .async_views import server_view
 from .views import (
     CategoryListCreateView, CategoryDetailView,
-    TaskListCreateView, TaskDetailView, TaskMarkCompleteView,
+    TaskListCreateView, TaskDetailView, TagListView, TaskMarkCompleteView, TaskOccurrenceView,
     SubTaskListCreateView, SubTaskDetailView,
     TaskCommentListCreateView,
     DayPlannerListCreateView, DayPlannerDetailView,
-    task_stats, calendar_tasks, today_tasks, upcoming_tasks, bulk_task_action
+    task_stats, calendar_tasks, today_tasks, upcoming_tasks, bulk_task_action,
+    atask_stats, acalendar_tasks, atoday_tasks, aupcoming_tasks,
+    bulk_tasks, task_changes, export_tasks, import_tasks
 )
 
 urlpatterns = [
@@ -17,6 +20,10 @@ urlpatterns = [
     path('', TaskListCreateView.as_view(), name='task_list_create'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task_detail'),
     path('<int:pk>/complete/', TaskMarkCompleteView.as_view(), name='task_complete'),
+    path('<int:pk>/occurrences/<str:day>/', TaskOccurrenceView.as_view(), name='task_occurrence'),
+    
+    # Tags
+    path('tags/', TagListView.as_view(), name='tag_list'),
     
     # SubTasks
     path('<int:task_id>/subtasks/', SubTaskListCreateView.as_view(), name='subtask_list_create'),
@@ -30,9 +37,13 @@ urlpatterns = [
     path('day-planner/<int:pk>/', DayPlannerDetailView.as_view(), name='day_planner_detail'),
     
     # Analytics & Views
-    path('stats/', task_stats, name='task_stats'),
-    path('calendar/', calendar_tasks, name='calendar_tasks'),
-    path('today/', today_tasks, name='today_tasks'),
-    path('upcoming/', upcoming_tasks, name='upcoming_tasks'),
+    path('stats/', server_view(task_stats, atask_stats), name='task_stats'),
+    path('calendar/', server_view(calendar_tasks, acalendar_tasks), name='calendar_tasks'),
+    path('today/', server_view(today_tasks, atoday_tasks), name='today_tasks'),
+    path('upcoming/', server_view(upcoming_tasks, aupcoming_tasks), name='upcoming_tasks'),
+    path('changes/', task_changes, name='task_changes'),
+    path('export/', export_tasks, name='export_tasks'),
+    path('import/', import_tasks, name='import_tasks'),
     path('bulk-action/', bulk_task_action, name='bulk_task_action'),
+    path('bulk/', bulk_tasks, name='bulk_tasks'),
 ]
@@ -0,0 +1,58 @@
+"""
+Per-user data versions.
+
+Every write to a user's tasks, subtasks, comments, day plans or analytics, and
+to a category their tasks use, bumps UserDataVersion.version (signal receivers
+in tasks.signals and analytics.signals, plus explicit calls on the bulk paths
+that skip signals).
+Read endpoints key ETags on it. The counter lives in the database rather than
+the cache so every worker process agrees on it.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from .models import UserDataVersion
+
+User = get_user_model()
+
+
+def data_version(user_id):
+    """Current version for ``user_id``; 0 until the first write"""
+    version = UserDataVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first()
+    return version or 0
+
+
+def request_data_version(request):
+    """data_version() for request.user, looked up once per request"""
+    if not hasattr(request, '_data_version'):
+        request._data_version = data_version(request.user.pk)
+    return request._data_version
+
+
+async def arequest_data_version(request):
+    """request_data_version() for async views; later sync calls reuse the value"""
+    if not hasattr(request, '_data_version'):
+        version = await UserDataVersion.objects.filter(user_id=request.user.pk).values_list('version', flat=True).afirst()
+        request._data_version = version or 0
+    return request._data_version
+
+
+def bump_data_version(*user_ids):
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    versions = UserDataVersion.objects.filter(user_id__in=user_ids)
+    if versions.update(version=F('version') + 1, updated_at=timezone.now()) < len(user_ids):
+        existing = set(versions.values_list('user_id', flat=True))
+        UserDataVersion.objects.bulk_create(
+            [UserDataVersion(user_id=user_id, version=1) for user_id in user_ids - existing],
+            ignore_conflicts=True,
+        )
+
+
+def deleting_user(origin):
+    """Whether a post_delete ``origin`` is a user deletion, whose version row is going too"""
+    if isinstance(origin, QuerySet):
+        return origin.model is User
+    return isinstance(origin, User)
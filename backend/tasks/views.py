@@ -1,18 +1,34 @@
-from rest_framework import generics, status, permissions, filters, serializers
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import generics, status, permissions, serializers
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Q, Count
-from datetime import datetime, timedelta
-from .models import Category, Task, SubTask, TaskComment, DayPlanner
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+from .models import Category, Task, SubTask, TaskComment, DayPlanner, Tag, TaskOccurrence, PRIORITY_RANK, RECURRENCE_FIELDS
 from .serializers import (
     CategorySerializer, TaskListSerializer, TaskDetailSerializer,
     TaskCreateUpdateSerializer, SubTaskSerializer, SubTaskCreateSerializer,
     TaskCommentSerializer, TaskCommentCreateSerializer, DayPlannerSerializer,
-    TaskStatsSerializer, CalendarTaskSerializer
+    TaskStatsSerializer, CalendarTaskSerializer, TagSerializer,
+    SubTaskChangeSerializer, TaskCommentChangeSerializer, TaskOccurrenceSerializer
 )
+from . import bulk, export, imports, sync
+from .async_views import async_api_view
+from .conditional import ConditionalGetMixin, conditional_get
+from .dates import date_span, day_range, in_range, local_today, month_range, user_timezone
+from .filters import TaskFilter, TaskOrderingFilter
+from .pagination import KeysetPagination
+from .recurrence import aexpand_series, expand_series, occurs_on, series_in_window
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from .response_cache import cached_get
+from .search import TaskSearchFilter
+from .stats import acompute_task_stats, compute_task_stats
+from .versions import bump_data_version
 
 class CategoryListCreateView(generics.ListCreateAPIView):
     serializer_class = CategorySerializer
@@ -26,16 +42,18 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     queryset = Category.objects.all()
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['priority', 'status', 'category', 'is_recurring']
-    search_fields = ['title', 'description', 'tags']
-    ordering_fields = ['created_at', 'due_date', 'priority', 'updated_at']
+    filter_backends = [DjangoFilterBackend, TaskOrderingFilter, TaskSearchFilter]
+    filterset_class = TaskFilter
+    ordering_fields = ['created_at', 'due_date', 'priority', 'updated_at', 'overdue']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
+    etag_scope = 'task_list'
     
     def get_queryset(self):
-        return Task.objects.filter(user=self.request.user).select_related('category')
+        fields = TaskListSerializer.selected_fields(self.request) if self.request.method == 'GET' else None
+        return Task.objects.filter(user=self.request.user).for_list(fields=fields)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -45,37 +63,125 @@ class TaskListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+class TagListView(generics.ListAPIView):
+    """Per-user tag counts, read from the maintained Tag.task_count counters"""
+    serializer_class = TagSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = []
+    
+    def get_queryset(self):
+        return Tag.objects.filter(user=self.request.user, task_count__gt=0).order_by('-task_count', 'name')
+
+def task_detail_queryset(user, fields=None):
+    """
+    Tasks with everything TaskDetailSerializer reads loaded in a fixed number of queries.
+    
+    ``fields`` limits that to the serializer fields being rendered (see
+    SparseFieldsMixin); by default everything is loaded.
+    """
+    def wanted(*names):
+        return fields is None or not fields.isdisjoint(names)
+    queryset = Task.objects.filter(user=user)
+    related = [name for name, field in (('category', 'category_name'), ('user', 'user_name')) if wanted(field)]
+    if related:
+        queryset = queryset.select_related(*related)
+    if wanted('comment_count', 'comments_next'):
+        queryset = queryset.annotate(comment_total=Count('comments'))
+    if wanted('is_overdue'):
+        queryset = queryset.with_overdue()
+    if wanted('subtasks'):
+        queryset = queryset.prefetch_related('subtasks')
+    if wanted('comments', 'comments_next'):
+        recent_comments = (
+            TaskComment.objects.select_related('user')
+            .order_by('-created_at', '-id')[:TaskDetailSerializer.INLINE_COMMENT_LIMIT]
+        )
+        queryset = queryset.prefetch_related(Prefetch('comments', queryset=recent_comments, to_attr='recent_comments'))
+    return queryset
+
 class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
+        if self.request.method == 'GET':
+            return task_detail_queryset(self.request.user, TaskDetailSerializer.selected_fields(self.request))
         return Task.objects.filter(user=self.request.user)
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return TaskCreateUpdateSerializer
         return TaskDetailSerializer
+    
+    def perform_destroy(self, instance):
+        Task.objects.filter(pk=instance.pk).soft_delete()
 
 class TaskMarkCompleteView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request, pk):
         try:
-            task = Task.objects.get(pk=pk, user=request.user)
+            task = task_detail_queryset(request.user).get(pk=pk)
             task.mark_completed()
             return Response({
                 'message': 'Task marked as completed',
-                'task': TaskDetailSerializer(task).data
+                'task': TaskDetailSerializer(task, context={'request': request}).data
             })
         except Task.DoesNotExist:
             return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
 
+class TaskOccurrenceView(APIView):
+    """
+    Change one occurrence of a recurring task, identified by its original local date.
+    
+    PUT/PATCH store an override (status, moved due_date; status "cancelled" skips
+    the occurrence) and DELETE reverts the occurrence to what the rule says.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_occurrence(self, request, pk, day):
+        task = Task.objects.series().filter(pk=pk, user=request.user).first()
+        if task is None:
+            return None, Response({'error': 'Recurring task not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            day = parse_date(day)
+        except ValueError:
+            day = None
+        if day is None or not occurs_on(task, day, user_timezone(request.user)):
+            return None, Response({'error': 'The task has no occurrence on that date'}, status=status.HTTP_404_NOT_FOUND)
+        return TaskOccurrence(task=task, original_date=day), None
+    
+    def put(self, request, pk, day):
+        occurrence, error = self.get_occurrence(request, pk, day)
+        if error:
+            return error
+        occurrence = TaskOccurrence.objects.filter(
+            task=occurrence.task, original_date=occurrence.original_date
+        ).first() or occurrence
+        serializer = TaskOccurrenceSerializer(occurrence, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+    
+    patch = put
+    
+    def delete(self, request, pk, day):
+        occurrence, error = self.get_occurrence(request, pk, day)
+        if error:
+            return error
+        TaskOccurrence.objects.filter(task=occurrence.task, original_date=occurrence.original_date).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 class SubTaskListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['created_at']
+    ordering = ['created_at']
     
     def get_queryset(self):
         task_id = self.kwargs['task_id']
-        return SubTask.objects.filter(parent_task_id=task_id, parent_task__user=self.request.user)
+        return SubTask.objects.filter(
+            parent_task_id=task_id, parent_task__user=self.request.user, parent_task__deleted_at__isnull=True
+        )
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -95,14 +201,26 @@ class SubTaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return SubTask.objects.filter(parent_task__user=self.request.user)
+        return SubTask.objects.filter(
+            parent_task__user=self.request.user, parent_task__deleted_at__isnull=True
+        ).select_related('parent_task')
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            sync.record_deletions('subtask', [(instance.pk, self.request.user.id)])
+            instance.delete()
 
 class TaskCommentListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
     
     def get_queryset(self):
         task_id = self.kwargs['task_id']
-        return TaskComment.objects.filter(task_id=task_id, task__user=self.request.user)
+        return TaskComment.objects.filter(
+            task_id=task_id, task__user=self.request.user, task__deleted_at__isnull=True
+        ).select_related('user')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -117,74 +235,116 @@ class TaskCommentListCreateView(generics.ListCreateAPIView):
         except Task.DoesNotExist:
             raise serializers.ValidationError("Task not found")
 
+def planned_tasks_prefetch():
+    """Prefetch for the nested task list in DayPlannerSerializer"""
+    return Prefetch('tasks', queryset=Task.objects.for_list())
+
+def reload_day_plan(day_planner):
+    """Refetch a saved plan as GET serves it; tasks.set() leaves the nested list unprefetched"""
+    return DayPlanner.objects.with_task_counts().prefetch_related(planned_tasks_prefetch()).get(pk=day_planner.pk)
+
 class DayPlannerListCreateView(generics.ListCreateAPIView):
+    """
+    Day plans, newest first. With ?start=&end= (YYYY-MM-DD, inclusive, at most
+    MAX_RANGE_DAYS apart) the whole range is returned unpaginated.
+    """
     serializer_class = DayPlannerSerializer
     permission_classes = [permissions.IsAuthenticated]
+    MAX_RANGE_DAYS = 93
+    
+    def get_date_range(self):
+        start = self.request.query_params.get('start')
+        end = self.request.query_params.get('end')
+        if not start and not end:
+            return None
+        try:
+            start = datetime.strptime(start, '%Y-%m-%d').date()
+            end = datetime.strptime(end, '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'error': 'start and end are both required, as YYYY-MM-DD'})
+        if end < start or (end - start).days >= self.MAX_RANGE_DAYS:
+            raise serializers.ValidationError({'error': f'end must be on or after start and within {self.MAX_RANGE_DAYS} days'})
+        return start, end
     
     def get_queryset(self):
-        return DayPlanner.objects.filter(user=self.request.user).order_by('-date')
+        queryset = DayPlanner.objects.filter(user=self.request.user)
+        if self.request.method == 'GET':
+            date_range = self.get_date_range()
+            if date_range:
+                queryset = queryset.filter(date__range=date_range)
+            queryset = queryset.with_task_counts().prefetch_related(planned_tasks_prefetch())
+        return queryset.order_by('-date')
+    
+    def paginate_queryset(self, queryset):
+        if self.get_date_range():
+            return None
+        return super().paginate_queryset(queryset)
+    
+    def perform_create(self, serializer):
+        serializer.instance = reload_day_plan(serializer.save())
 
 class DayPlannerDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = DayPlannerSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return DayPlanner.objects.filter(user=self.request.user)
+        return (
+            DayPlanner.objects.filter(user=self.request.user)
+            .with_task_counts()
+            .prefetch_related(planned_tasks_prefetch())
+        )
+    
+    def perform_update(self, serializer):
+        serializer.instance = reload_day_plan(serializer.save())
+
+def stats_tasks(request):
+    """The user's tasks, limited to those created since ?since; ValueError for an invalid since"""
+    tasks = Task.objects.filter(user=request.user)
+    
+    # Optional window: only count tasks created since the given date/datetime
+    since = request.GET.get('since')
+    if since:
+        since_dt = parse_datetime(since)
+        if since_dt is None:
+            since_date = parse_date(since)
+            if since_date is None:
+                raise ValueError('Invalid since. Use YYYY-MM-DD or an ISO 8601 datetime')
+            since_dt = datetime.combine(since_date, time.min)
+        if timezone.is_naive(since_dt):
+            since_dt = timezone.make_aware(since_dt)
+        tasks = tasks.filter(created_at__gte=since_dt)
+    return tasks
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@conditional_get('task_stats')
+@cached_get('task_stats')
 def task_stats(request):
     """Get comprehensive task statistics for the user"""
-    user = request.user
-    tasks = Task.objects.filter(user=user)
-    
-    total_tasks = tasks.count()
-    completed_tasks = tasks.filter(status='completed').count()
-    pending_tasks = tasks.filter(status__in=['todo', 'in_progress']).count()
-    overdue_tasks = tasks.filter(
-        due_date__lt=timezone.now(),
-        status__in=['todo', 'in_progress']
-    ).count()
-    
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # Tasks by priority
-    tasks_by_priority = dict(tasks.values('priority').annotate(count=Count('priority')).values_list('priority', 'count'))
-    
-    # Tasks by category
-    tasks_by_category = dict(
-        tasks.filter(category__isnull=False)
-        .values('category__name')
-        .annotate(count=Count('category'))
-        .values_list('category__name', 'count')
-    )
-    
-    # Recent activity (last 7 days)
-    last_week = timezone.now() - timedelta(days=7)
-    recent_activity = list(
-        tasks.filter(updated_at__gte=last_week)
-        .order_by('-updated_at')[:10]
-        .values('id', 'title', 'status', 'updated_at')
-    )
-    
-    stats_data = {
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks,
-        'pending_tasks': pending_tasks,
-        'overdue_tasks': overdue_tasks,
-        'completion_rate': round(completion_rate, 2),
-        'tasks_by_priority': tasks_by_priority,
-        'tasks_by_category': tasks_by_category,
-        'recent_activity': recent_activity
-    }
-    
-    serializer = TaskStatsSerializer(stats_data)
+    try:
+        tasks = stats_tasks(request)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = TaskStatsSerializer(compute_task_stats(tasks))
     return Response(serializer.data)
 
-@api_view(['GET'])
+@async_api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def calendar_tasks(request):
-    """Get tasks for calendar view"""
+@conditional_get('task_stats')
+@cached_get('task_stats')
+async def atask_stats(request):
+    """task_stats for ASGI"""
+    try:
+        tasks = stats_tasks(request)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = TaskStatsSerializer(await acompute_task_stats(tasks))
+    return Response(serializer.data)
+
+def calendar_queries(request):
+    """(one-off tasks, recurring series, window) for the calendar; ValueError for invalid dates"""
     user = request.user
     
     # Get date range from query params
@@ -195,58 +355,188 @@ def calendar_tasks(request):
         try:
             start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
             end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-            
-            tasks = Task.objects.filter(
-                user=user,
-                due_date__date__range=[start_date, end_date]
-            ).select_related('category')
         except ValueError:
-            return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+            raise ValueError('Invalid date format. Use YYYY-MM-DD') from None
+        bounds = date_span(user, start_date, end_date)
     else:
         # Default to current month
-        today = timezone.now().date()
-        start_date = today.replace(day=1)
-        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        tasks = Task.objects.filter(
-            user=user,
-            due_date__date__range=[start_date, end_date]
-        ).select_related('category')
-    
-    serializer = CalendarTaskSerializer(tasks, many=True)
+        bounds = month_range(user, local_today(user))
+    
+    tasks = Task.objects.filter(user=user, **in_range('due_date', bounds)).one_off()
+    if 'is_overdue' in CalendarTaskSerializer.selected_fields(request):
+        tasks = tasks.with_overdue()
+    return tasks, series_in_window(Task.objects.filter(user=user), bounds), bounds
+
+def calendar_response(request, tasks, occurrences):
+    tasks += sorted(occurrences, key=lambda task: task.due_date)
+    serializer = CalendarTaskSerializer(tasks, many=True, context={'request': request})
     return Response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@conditional_get('calendar_tasks')
+@cached_get('calendar_tasks')
+def calendar_tasks(request):
+    """Get tasks for calendar view"""
+    try:
+        tasks, series, bounds = calendar_queries(request)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return calendar_response(request, list(tasks), expand_series(series, request.user, bounds))
+
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get('calendar_tasks')
+@cached_get('calendar_tasks')
+async def acalendar_tasks(request):
+    """calendar_tasks for ASGI"""
+    try:
+        tasks, series, bounds = calendar_queries(request)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    tasks = [task async for task in tasks]
+    return calendar_response(request, tasks, await aexpand_series(series, request.user, bounds))
+
+def today_queries(request):
+    """(one-off tasks, recurring series, window) for today's tasks"""
+    user = request.user
+    bounds = day_range(user, local_today(user))
+    fields = TaskListSerializer.selected_fields(request)
+    tasks = Task.objects.filter(user=user, **in_range('due_date', bounds)).one_off().for_list(fields=fields)
+    series = series_in_window(Task.objects.filter(user=user), bounds).for_list(*RECURRENCE_FIELDS, fields=fields)
+    return tasks, series, bounds
+
+def today_response(request, tasks, occurrences):
+    tasks += occurrences
+    tasks.sort(key=lambda task: (-PRIORITY_RANK.get(task.priority, 0), task.created_at))
+    serializer = TaskListSerializer(tasks, many=True, context={'request': request})
+    return Response(serializer.data)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get('today_tasks')
 def today_tasks(request):
     """Get today's tasks"""
+    tasks, series, bounds = today_queries(request)
+    return today_response(request, list(tasks), expand_series(series, request.user, bounds))
+
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get('today_tasks')
+async def atoday_tasks(request):
+    """today_tasks for ASGI"""
+    tasks, series, bounds = today_queries(request)
+    tasks = [task async for task in tasks]
+    return today_response(request, tasks, await aexpand_series(series, request.user, bounds))
+
+UPCOMING_STATUSES = ['todo', 'in_progress']
+
+def upcoming_queries(request):
+    """(open one-off tasks, recurring series, window) for the next 7 days"""
     user = request.user
-    today = timezone.now().date()
+    today = local_today(user)
+    next_week = today + timedelta(days=7)
     
+    bounds = date_span(user, today, next_week)
+    fields = TaskListSerializer.selected_fields(request)
     tasks = Task.objects.filter(
         user=user,
-        due_date__date=today
-    ).select_related('category').order_by('priority', 'created_at')
-    
+        status__in=UPCOMING_STATUSES,
+        **in_range('due_date', bounds)
+    ).one_off().for_list(fields=fields)
+    series = series_in_window(Task.objects.filter(user=user), bounds).for_list(*RECURRENCE_FIELDS, fields=fields)
+    return tasks, series, bounds
+
+def upcoming_response(request, tasks, occurrences):
+    tasks += [task for task in occurrences if task.status in UPCOMING_STATUSES]
+    tasks.sort(key=lambda task: (task.due_date, -PRIORITY_RANK.get(task.priority, 0)))
     serializer = TaskListSerializer(tasks, many=True, context={'request': request})
     return Response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@conditional_get('upcoming_tasks')
 def upcoming_tasks(request):
     """Get upcoming tasks (next 7 days)"""
-    user = request.user
-    today = timezone.now().date()
-    next_week = today + timedelta(days=7)
+    tasks, series, bounds = upcoming_queries(request)
+    return upcoming_response(request, list(tasks), expand_series(series, request.user, bounds))
+
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@conditional_get('upcoming_tasks')
+async def aupcoming_tasks(request):
+    """upcoming_tasks for ASGI"""
+    tasks, series, bounds = upcoming_queries(request)
+    tasks = [task async for task in tasks]
+    return upcoming_response(request, tasks, await aexpand_series(series, request.user, bounds))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def task_changes(request):
+    """Tasks, subtasks and comments changed or deleted since ?since=<token>"""
+    token = request.GET.get('since')
+    since = None
+    if token:
+        try:
+            since = sync.decode_token(token)
+        except ValueError:
+            return Response({'error': 'Invalid sync token'}, status=status.HTTP_400_BAD_REQUEST)
+        except sync.SyncTokenExpired:
+            return Response({'error': 'Sync token expired; resync without since'}, status=status.HTTP_410_GONE)
     
-    tasks = Task.objects.filter(
-        user=user,
-        due_date__date__range=[today, next_week],
-        status__in=['todo', 'in_progress']
-    ).select_related('category').order_by('due_date', 'priority')
+    changes, until, has_more = sync.collect_changes(request.user, since)
+    deleted = {'tasks': [], 'subtasks': [], 'comments': []}
+    if 'deleted' in changes:
+        for kind, object_id in changes['deleted'].values_list('kind', 'object_id'):
+            deleted[f'{kind}s'].append(object_id)
     
-    serializer = TaskListSerializer(tasks, many=True, context={'request': request})
-    return Response(serializer.data)
+    context = {'request': request}
+    return Response({
+        'tasks': TaskListSerializer(changes['tasks'].for_list(), many=True, context=context).data,
+        'subtasks': SubTaskChangeSerializer(changes['subtasks'], many=True, context=context).data,
+        'comments': TaskCommentChangeSerializer(changes['comments'].select_related('user'), many=True, context=context).data,
+        'deleted': deleted,
+        'next_token': sync.encode_token(until, caught_up=not has_more),
+        'has_more': has_more,
+    })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@renderer_classes([FastJSONRenderer, NDJSONRenderer, CSVRenderer])
+def export_tasks(request):
+    """Stream every task as ?format=json|ndjson (nested) or csv (?part=tasks|subtasks|comments)"""
+    user = request.user
+    export_format = request.accepted_renderer.format
+    if export_format == 'csv':
+        part = request.GET.get('part', 'tasks')
+        if part not in export.CSV_PARTS:
+            return Response({'error': f"part must be one of: {', '.join(export.CSV_PARTS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        body, filename = export.stream_csv(user, part), f'{part}.csv'
+    elif export_format == 'ndjson':
+        body, filename = export.stream_ndjson(user), 'tasks.ndjson'
+    else:
+        body, filename = export.stream_json(user), 'tasks.json'
+    
+    response = StreamingHttpResponse(export.response_body(request, body), content_type=request.accepted_renderer.media_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def import_tasks(request):
+    """Create tasks from an uploaded CSV or NDJSON file (the export formats)"""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'Upload the file as the multipart field "file"'}, status=status.HTTP_400_BAD_REQUEST)
+    import_format = request.data.get('format') or imports.detect_format(upload.name)
+    if import_format not in imports.READERS:
+        return Response({'error': f"format must be one of: {', '.join(imports.READERS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        report = imports.import_tasks(request.user, imports.open_upload(upload), import_format)
+    except imports.ImportFormatError as exc:
+        return Response({'error': f'Nothing was imported. {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST)
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -260,17 +550,56 @@ def bulk_task_action(request):
     
     tasks = Task.objects.filter(id__in=task_ids, user=request.user)
     
+    now = timezone.now()
     if action == 'mark_completed':
-        updated = tasks.update(status='completed', completed_at=timezone.now())
+        updated = tasks.update(status='completed', completed_at=now, updated_at=now)
     elif action == 'mark_todo':
-        updated = tasks.update(status='todo', completed_at=None)
+        updated = tasks.update(status='todo', completed_at=None, updated_at=now)
     elif action == 'delete':
-        updated = tasks.count()
-        tasks.delete()
+        updated = tasks.soft_delete()
     else:
         return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
+    if updated and action != 'delete':
+        bump_data_version(request.user.id)
     
     return Response({
         'message': f'{action} performed on {updated} tasks',
         'updated_count': updated
     })
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_tasks(request):
+    """Batch create, partially update and move tasks in one transaction"""
+    create_items = request.data.get('create', [])
+    update_items = request.data.get('update', [])
+    move = request.data.get('move')
+    
+    if not isinstance(create_items, list) or not isinstance(update_items, list) or (move is not None and not isinstance(move, dict)):
+        return Response({'error': 'create and update must be lists and move an object'}, status=status.HTTP_400_BAD_REQUEST)
+    if not create_items and not update_items and not move:
+        return Response({'error': 'Provide create, update or move'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(create_items) + len(update_items) > bulk.BULK_TASK_LIMIT:
+        return Response({'error': f'At most {bulk.BULK_TASK_LIMIT} items per request'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    context = bulk.bulk_context(request)
+    to_create, create_errors = bulk.validate_creates(create_items, context)
+    to_update, update_errors = bulk.validate_updates(request.user, update_items, context)
+    to_move, move_errors = bulk.validate_move(move, context) if move else (None, None)
+    
+    if create_errors or update_errors or move_errors:
+        errors = {'create': create_errors, 'update': update_errors}
+        if move_errors:
+            errors['move'] = move_errors
+        return Response({'error': 'Validation failed, nothing was written', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with transaction.atomic():
+        created = bulk.create_tasks(request.user, to_create)
+        updated = bulk.update_tasks(request.user, to_update) if to_update else []
+        moved = bulk.move_tasks(request.user, *to_move) if to_move else 0
+    
+    return Response({
+        'created': [task.id for task in created],
+        'updated': [task.id for task in updated],
+        'moved_count': moved
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)